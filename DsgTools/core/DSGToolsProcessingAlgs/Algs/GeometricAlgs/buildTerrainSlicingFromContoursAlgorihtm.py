@@ -29,11 +29,12 @@ from qgis.core import (QgsGeometry, QgsProcessing, QgsProcessingException, QgsPr
                        QgsProcessingParameterField, QgsProject, QgsField, QgsProcessingMultiStepFeedback,
                        QgsProcessingParameterNumber, QgsFeatureSink, QgsProcessingParameterRasterDestination,
                        QgsProcessingParameterVectorLayer, QgsWkbTypes, QgsProcessingAlgorithm, QgsFeature,
-                       QgsFields, QgsProcessingUtils)
+                       QgsFields, QgsProcessingUtils, QgsFeatureRequest)
 import numpy as np
-from osgeo import gdal
 
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
+from DsgTools.core.GeometricTools.rasterHistogram import RasterHistogram
+from DsgTools.core.GeometricTools.terrainSlicingPipeline import TerrainSlicingPipeline
 
 
 class BuildTerrainSlicingFromContoursAlgorihtm(QgsProcessingAlgorithm):
@@ -122,40 +123,14 @@ class BuildTerrainSlicingFromContoursAlgorihtm(QgsProcessingAlgorithm):
         outputRaster = self.parameterAsOutputLayer(parameters, self.OUTPUT_RASTER, context)
         outputFields = self.getOutputFields()
         (output_sink, output_sink_id) = self.getOutputSink(inputRaster, outputFields, parameters, context)
+        if inputRaster.providerType() != 'gdal':
+            raise QgsProcessingException(
+                self.tr('Input DEM must be a GDAL raster.')
+            )
 
-        multiStepFeedback = QgsProcessingMultiStepFeedback(11, feedback) #ajustar depois
+        multiStepFeedback = QgsProcessingMultiStepFeedback(10, feedback)
         currentStep = 0
         multiStepFeedback.setCurrentStep(currentStep)
-        
-
-        multiStepFeedback.setCurrentStep(currentStep)
-        clippedRaster = algRunner.runClipRasterLayer(
-            inputRaster,
-            mask=parameters[self.GEOGRAPHIC_BOUNDARY],
-            context=context,
-            feedback=multiStepFeedback
-        )
-        currentStep += 1
-
-        multiStepFeedback.setCurrentStep(currentStep)
-        slicedDEM = algRunner.runGrassMapCalcSimple(
-            inputA=clippedRaster,
-            expression=f'{threshold} * floor(A / {threshold})',
-            context=context,
-            feedback=multiStepFeedback
-        )
-        currentStep += 1
-
-        multiStepFeedback.setCurrentStep(currentStep)
-        slicingThresholdDict = self.findSlicingThresholdDict(slicedDEM)
-        expression = '\n'.join(
-            [
-                f"{a} thru {b} = {i}" for i, (a, b) in slicingThresholdDict.items()
-            ]
-        )
-        currentStep += 1
-
-        multiStepFeedback.setCurrentStep(currentStep)
         bufferedGeographicBounds = algRunner.runBuffer(
             parameters[self.GEOGRAPHIC_BOUNDARY],
             distance=10*smoothingThreshold,
@@ -163,29 +138,52 @@ class BuildTerrainSlicingFromContoursAlgorihtm(QgsProcessingAlgorithm):
             feedback=multiStepFeedback
         )
         currentStep += 1
-        clippedRaster = algRunner.runClipRasterLayer(
-            inputRaster,
-            mask=bufferedGeographicBounds,
-            context=context,
-            feedback=multiStepFeedback
-        )
-        currentStep += 1
 
         multiStepFeedback.setCurrentStep(currentStep)
-        classifiedRaster = algRunner.runGrassReclass(
-            clippedRaster, expression, context=context, feedback=multiStepFeedback
-        )
+        multiStepFeedback.setProgressText(self.tr('Rasterizing geographic bounds...'))
+        request = QgsFeatureRequest().setNoAttributes().setDestinationCrs(
+            inputRaster.crs(), context.transformContext())
+        try:
+            pipeline = TerrainSlicingPipeline(inputRaster.source(), threshold)
+            pipeline.setBounds(
+                boundsWkbList=self.getWkbList(geoBoundsSource, request),
+                bufferedWkbList=self.getWkbList(bufferedGeographicBounds, request),
+                maskPath=QgsProcessingUtils.generateTempFilename('slicing_mask.tif')
+            )
+        except Exception as e:
+            raise QgsProcessingException(str(e))
         currentStep += 1
 
         multiStepFeedback.setCurrentStep(currentStep)
-        sieveOutput = algRunner.runSieve(
-            classifiedRaster,
-            threshold=minPixelGroupSize,
-            context=context,
-            feedback=multiStepFeedback,
-        )
-        currentStep += 1
-        
+        multiStepFeedback.setProgressText(self.tr('Finding slicing thresholds...'))
+        try:
+            slicingThresholdDict = self.findSlicingThresholdDict(
+                pipeline,
+                threshold=threshold,
+                feedback=multiStepFeedback
+            )
+            currentStep += 1
+
+            multiStepFeedback.setCurrentStep(currentStep)
+            multiStepFeedback.setProgressText(self.tr('Classifying DEM...'))
+            classifiedRaster = QgsProcessingUtils.generateTempFilename('slicing.tif')
+            pipeline.classify(
+                slicingThresholdDict,
+                classifiedRaster,
+                feedback=multiStepFeedback
+            )
+            currentStep += 1
+
+            multiStepFeedback.setCurrentStep(currentStep)
+            multiStepFeedback.setProgressText(self.tr('Removing small pixel groups...'))
+            pipeline.sieve(classifiedRaster, minPixelGroupSize)
+            sieveOutput = classifiedRaster
+            currentStep += 1
+        finally:
+            pipeline.close()
+        if multiStepFeedback.isCanceled():
+            return {}
+
         multiStepFeedback.setCurrentStep(currentStep)
         finalRaster = algRunner.runClipRasterLayer(
             sieveOutput,
@@ -269,22 +267,38 @@ class BuildTerrainSlicingFromContoursAlgorihtm(QgsProcessingAlgorithm):
         lyr.setCrs(inputLyr.crs())
         return lyr
     
-    def findSlicingThresholdDict(self, inputRaster):
-        ds = gdal.Open(inputRaster)
-        npRaster = np.array(ds.GetRasterBand(1).ReadAsArray())
-        minValue = np.amin(npRaster)
-        maxValue = np.amax(npRaster)
+    def getWkbList(self, source, request):
+        """
+        :param source: (QgsFeatureSource) polygon source.
+        :param request: (QgsFeatureRequest) request used to read the source.
+        :return: (list-of-QByteArray) WKB of each geometry.
+        """
+        return [
+            feat.geometry().asWkb() for feat in source.getFeatures(request) \
+                if feat.hasGeometry()
+        ]
+
+    def findSlicingThresholdDict(self, pipeline, threshold=None, feedback=None):
+        """
+        Finds the class limits of the sliced DEM from the cumulative
+        distribution of its valid pixels inside the geographic bounds. The
+        histogram is accumulated block by block, hence the DEM is never fully
+        loaded.
+        :param pipeline: (TerrainSlicingPipeline) pipeline whose bounds are set.
+        :param threshold: (int) slicing interval, used as histogram bin width
+                          (so that the counts of each sliced value are exact).
+        :param feedback: (QgsFeedback) QGIS object used for cancelation.
+        :return: (dict) map of class to its (min, max) values.
+        """
+        histogram = RasterHistogram(reader=pipeline, binWidth=threshold).compute(feedback=feedback)
+        if not histogram.total():
+            raise QgsProcessingException(
+                self.tr('Input raster has no valid pixel inside the geographic boundary.')
+            )
+        minValue, maxValue = histogram.minValue, histogram.maxValue
         numberOfElevationBands = self.getNumberOfElevationBands(maxValue - minValue)
         areaRatioList = self.getAreaRatioList(numberOfElevationBands)
-        uniqueValues, uniqueCount = np.unique(npRaster, return_counts=True)
-        cumulativePercentage = np.cumsum(uniqueCount) / np.prod(npRaster.shape)
-        classThresholds = list(uniqueValues[
-                np.searchsorted(
-                    cumulativePercentage,
-                    np.cumsum(areaRatioList)
-                )
-            ]
-        )
+        classThresholds = histogram.quantiles(np.cumsum(areaRatioList))
         classDict = dict()
         for i, (a, b) in enumerate(zip([minValue]+classThresholds, classThresholds)):
             classDict[i] = (int(a), int(b))
@@ -2,7 +2,10 @@ import bz2
 from dataclasses import dataclass
 import pickle
 import os
-from ..structures.ternarySearchTree import Trie, Node
+import tempfile
+from qgis.core import QgsApplication
+from ..structures.ternarySearchTree import Trie, Node, suffixes
+from ..structures.sortedWordList import SortedWordList
 from DsgTools.core.NetworkTools.ExternalFilesHandler import ExternalFileHandlerConfig, ExternalFileDownloadProcessor
 
 WORLIST_FILE_PATH = os.path.join(
@@ -12,6 +15,20 @@ WORLIST_FILE_PATH = os.path.join(
     'wordDatasetPtBR.pbz2'
 )
 
+# compact word list compiled from WORLIST_FILE_PATH. It is kept on user's
+# profile (the plugin folder may be read-only) or, failing that, on the temp dir
+COMPILED_WORDLIST_FILE_NAME = 'wordDatasetPtBR.dic'
+
+def compiledWordListFolders():
+    """
+    :return: (list-of-str) folders the compiled word list may be written to,
+             in order of preference.
+    """
+    return [
+        os.path.join(QgsApplication.qgisSettingsDirPath(), 'dsgtools', 'spellChecker'),
+        os.path.join(tempfile.gettempdir(), 'dsgtools', 'spellChecker')
+    ]
+
 @dataclass
 class WordDatasetPtBRFileConfig(ExternalFileHandlerConfig):
     url = 'https://github.com/dsgoficial/external_files_plugins/releases/download/spell_checker_files/wordDatasetPtBR.pbz2'
@@ -44,7 +61,41 @@ class PtBR:
     def __init__(self):
         if not os.path.exists(WORLIST_FILE_PATH):
             raise Exception('Word list file not found.')
-        self.trie = self.decompress_pickle(WORLIST_FILE_PATH)
+        self.words = self.loadWordList()
+
+    def needsCompiling(self, filePath):
+        return not os.path.exists(filePath) or \
+            os.path.getmtime(filePath) < os.path.getmtime(WORLIST_FILE_PATH)
+
+    def loadWordList(self):
+        """
+        Loads the compact word list, compiling it first if needed. If it cannot
+        be written nor read on any of the candidate folders, the downloaded
+        ternary search tree is used instead.
+        :return: (SortedWordList/Trie) container of the words.
+        """
+        trie = None
+        for folder in compiledWordListFolders():
+            filePath = os.path.join(folder, COMPILED_WORDLIST_FILE_NAME)
+            try:
+                if self.needsCompiling(filePath):
+                    trie = trie or self.decompress_pickle(WORLIST_FILE_PATH)
+                    self.compileWordList(trie, filePath)
+                return SortedWordList(filePath)
+            except Exception:
+                # unwritable folder or unreadable (e.g. truncated) file
+                continue
+        return trie or self.decompress_pickle(WORLIST_FILE_PATH)
+
+    def compileWordList(self, trie, filePath):
+        """
+        Compiles the downloaded (pickled) ternary search tree into a compact word list,
+        which is loaded in milliseconds on the next runs.
+        :param trie: (Trie) downloaded ternary search tree.
+        :param filePath: (str) compiled word list's path.
+        """
+        os.makedirs(os.path.dirname(filePath), exist_ok=True)
+        SortedWordList.build(suffixes(trie.root), filePath)
 
     def compressed_pickle(self, filePath, data):
         with bz2.BZ2File(filePath, 'w') as f: 
@@ -56,4 +107,4 @@ class PtBR:
         return data
 
     def hasWord(self, word):
-        return word in self.trie
\ No newline at end of file
+        return word in self.words
\ No newline at end of file
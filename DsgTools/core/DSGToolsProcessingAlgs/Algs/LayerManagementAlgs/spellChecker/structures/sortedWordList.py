@@ -0,0 +1,92 @@
+"""
+A compact, memory-mapped dictionary of words.
+
+The file holds the distinct words (UTF-8) sorted by their bytes, concatenated,
+and preceded by an array with the offset of each word:
+
+    MAGIC | version (uint32) | n (uint32) | n + 1 offsets (uint32) | words
+
+Opening a file only maps it into memory, and a lookup is an iterative binary
+search over the offsets, so no structure is built in Python.
+"""
+import mmap
+import os
+import struct
+import tempfile
+
+MAGIC = b'DSGWORDS'
+VERSION = 1
+HEADER = struct.Struct('<8sII')
+
+
+class SortedWordList:
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self._file = open(filePath, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('Invalid word list file: {}'.format(filePath))
+        offsetsEnd = HEADER.size + 4 * (self._count + 1)
+        self._offsets = memoryview(self._mm)[HEADER.size:offsetsEnd].cast('I')
+        self._dataStart = offsetsEnd
+
+    @staticmethod
+    def build(words, filePath):
+        """
+        Writes a word list file. The file is replaced atomically, hence
+        concurrent builds of the same file do not collide.
+        :param words: (iterable-of-str) words (duplicates are ignored).
+        :param filePath: (str) output file path.
+        """
+        encoded = sorted({w.encode('utf-8') for w in words})
+        offsets, current = [], 0
+        for word in encoded:
+            offsets.append(current)
+            current += len(word)
+        offsets.append(current)
+        fd, tempPath = tempfile.mkstemp(
+            prefix=os.path.basename(filePath),
+            suffix='.tmp',
+            dir=os.path.dirname(os.path.abspath(filePath))
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+                f.write(struct.pack('<{}I'.format(len(offsets)), *offsets))
+                for word in encoded:
+                    f.write(word)
+            os.replace(tempPath, filePath)
+        except BaseException:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            raise
+
+    def _word(self, i):
+        start = self._dataStart + self._offsets[i]
+        return self._mm[start:self._dataStart + self._offsets[i + 1]]
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, word):
+        key = word.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = self._word(mid)
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def close(self):
+        if getattr(self, '_offsets', None) is not None:
+            self._offsets.release()
+            self._offsets = None
+        self._mm.close()
+        self._file.close()
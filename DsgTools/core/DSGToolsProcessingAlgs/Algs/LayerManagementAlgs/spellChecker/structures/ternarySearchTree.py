@@ -26,40 +26,47 @@ class Node:
 def insert(node, string):
     if len(string) == 0:
         return node
-    
-    head = string[0]
-    tail = string[1:]
-    if node is None:
-        node = Node(head)
-        
-    if head < node.char:
-        node.lo = insert(node.lo, string)
-    elif head > node.char:
-        node.hi = insert(node.hi, string)
-    else:
-        if len(tail) == 0:
-            node.endpoint = True
+    root = node
+    parent, attr = None, None
+    i = 0
+    while True:
+        head = string[i]
+        if node is None:
+            node = Node(head)
+            if parent is None:
+                root = node
+            else:
+                setattr(parent, attr, node)
+        if head < node.char:
+            parent, attr = node, 'lo'
+        elif head > node.char:
+            parent, attr = node, 'hi'
         else:
-            node.eq = insert(node.eq, tail)
-            
-    return node
+            i += 1
+            if i == len(string):
+                node.endpoint = True
+                return root
+            parent, attr = node, 'eq'
+        node = getattr(parent, attr)
 
 def search(node, string):
-    if node is None or len(string) == 0:
+    if len(string) == 0:
         return False
-
-    head = string[0]
-    tail = string[1:]
-    if head < node.char:
-        return search(node.lo, string)
-    elif head > node.char:
-        return search(node.hi, string)
-    else:
-        # use 'and' for matches on complete words only,
-        # versus 'or' for matches on string prefixes
-        if len(tail) == 0 and node.endpoint:
-            return True
-        return search(node.eq, tail)
+    i = 0
+    while node is not None:
+        head = string[i]
+        if head < node.char:
+            node = node.lo
+        elif head > node.char:
+            node = node.hi
+        else:
+            i += 1
+            # use 'and' for matches on complete words only,
+            # versus 'or' for matches on string prefixes
+            if i == len(string):
+                return node.endpoint
+            node = node.eq
+    return False
 
 def suffixes(node):
     if node is not None:
@@ -2,7 +2,7 @@ import re
 
 from PyQt5.QtCore import QCoreApplication
 from qgis import core
-from qgis.core import (QgsFeature, QgsField, QgsFields, QgsProcessing,
+from qgis.core import (QgsFeature, QgsFeatureRequest, QgsField, QgsFields, QgsProcessing,
                        QgsProcessingAlgorithm, QgsProcessingParameterField,
                        QgsProcessingParameterFeatureSink,
                        QgsProcessingParameterVectorLayer, QgsWkbTypes, QgsProcessingException,)
@@ -98,7 +98,11 @@ class SpellCheckerAlgorithm(QgsProcessingAlgorithm):
         idx = layer.fields().indexOf('auxiliary_storage__{}'.format(errorFieldName))
         layer.setFieldAlias(idx, errorFieldName)
         auxFields = auxLayer.fields()
-        for feature in layer.getFeatures():
+        # words of each feature, so that each distinct word is checked only once
+        featureWords = []
+        distinctWords = set()
+        request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+        for feature in layer.getFeatures(request):
             if feedback.isCanceled():
                 return {self.OUTPUT: ''}
             attributeValue = feature[attributeIndex]
@@ -107,11 +111,19 @@ class SpellCheckerAlgorithm(QgsProcessingAlgorithm):
             attributeValue = ''.join(e for e in attributeValue if not(e in [',', ';', '&', '.'] or e.isdigit()))
             wordlist = re.split(' |/', attributeValue)
             wordlist = [ w for w in wordlist if not w in ['-'] ]
-            wrongWords = [ word for word in wordlist if not spellchecker.hasWord(word.lower())]
+            featureWords.append((feature[pkField], wordlist))
+            distinctWords.update(word.lower() for word in wordlist)
+        wrongWordSet = {
+            word for word in distinctWords if not spellchecker.hasWord(word)
+        }
+        for pkValue, wordlist in featureWords:
+            if feedback.isCanceled():
+                return {self.OUTPUT: ''}
+            wrongWords = [ word for word in wordlist if word.lower() in wrongWordSet ]
             if len(wrongWords) == 0:
                 continue
             auxFeature = QgsFeature(auxFields)
-            auxFeature['ASPK'] = feature[pkField]
+            auxFeature['ASPK'] = pkValue
             auxFeature['_{}'.format(errorFieldName)] = ';'.join(wrongWords)
             auxLayer.addFeature(auxFeature)
         returnMessage = 'Field {} added/edited'.format(errorFieldName)
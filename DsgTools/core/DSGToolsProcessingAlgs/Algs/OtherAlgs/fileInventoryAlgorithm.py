@@ -27,7 +27,6 @@ from ...algRunner import AlgRunner
 import processing, os, requests
 from PyQt5.QtCore import QCoreApplication
 from qgis.core import (QgsProcessing,
-                       QgsFeatureSink,
                        QgsProcessingAlgorithm,
                        QgsProcessingParameterFeatureSource,
                        QgsProcessingParameterFeatureSink,
@@ -53,6 +52,7 @@ from qgis.core import (QgsProcessing,
                        QgsProcessingParameterType,
                        QgsProcessingParameterMatrix,
                        QgsProcessingParameterFile,
+                       QgsProcessingParameterFileDestination,
                        QgsCoordinateReferenceSystem,
                        QgsFields)
 
@@ -64,6 +64,7 @@ class FileInventoryAlgorithm(QgsProcessingAlgorithm):
     TYPE_LIST = 'TYPE_LIST'
     COPY_FILES = 'COPY_FILES'
     COPY_FOLDER= 'COPY_FOLDER'
+    MANIFEST = 'MANIFEST'
     OUTPUT = 'OUTPUT'
 
     def initAlgorithm(self, config):
@@ -120,6 +121,16 @@ class FileInventoryAlgorithm(QgsProcessingAlgorithm):
                 defaultValue=None
             )
         )
+        self.addParameter(
+            QgsProcessingParameterFileDestination(
+                self.MANIFEST,
+                self.tr('Inventory manifest (unchanged files are not searched again)'),
+                fileFilter='JSON (*.json)',
+                optional=True,
+                defaultValue=None,
+                createByDefault=False
+            )
+        )
         self.addParameter(
             QgsProcessingParameterFeatureSink(
                 self.OUTPUT,
@@ -139,6 +150,7 @@ class FileInventoryAlgorithm(QgsProcessingAlgorithm):
         copyFolder = self.parameterAsString(parameters, self.COPY_FOLDER, context)
         onlyGeo = self.parameterAsBool(parameters, self.ONLY_GEO, context)
         copyFiles = self.parameterAsBool(parameters, self.COPY_FILES, context)
+        manifestPath = self.parameterAsFileOutput(parameters, self.MANIFEST, context)
         sinkFields = QgsFields()
         for field in inventory.layer_attributes:
             sinkFields.append(field)
@@ -152,16 +164,18 @@ class FileInventoryAlgorithm(QgsProcessingAlgorithm):
                 QgsCoordinateReferenceSystem(4326)
             )
         
-        featList = inventory.make_inventory_from_processing(
+        # features are written to the sink as files are searched
+        inventory.make_inventory_from_processing(
                 inputFolder,
                 file_formats,
                 make_copy=copyFiles,
                 onlyGeo=onlyGeo,
-                destination_folder=copyFolder
+                destination_folder=copyFolder,
+                feedback=feedback,
+                sink=output_sink,
+                manifest_path=manifestPath or None
             )
 
-        output_sink.addFeatures(featList, QgsFeatureSink.FastInsert)
-
         return {'OUTPUT':output_dest_id}
 
     def name(self):
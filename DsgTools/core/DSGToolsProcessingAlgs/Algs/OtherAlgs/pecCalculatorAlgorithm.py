@@ -22,41 +22,35 @@
  *                                                                         *
  ***************************************************************************/
 """
-import math
-import functools
-from ...algRunner import AlgRunner
-import processing
-from PyQt5.QtCore import QCoreApplication
+import numpy as np
+from PyQt5.QtCore import QCoreApplication, QVariant
 from qgis.core import (QgsProcessing,
                        QgsFeatureSink,
                        QgsProcessingAlgorithm,
-                       QgsProcessingParameterFeatureSource,
                        QgsProcessingParameterFeatureSink,
-                       QgsFeature,
-                       QgsDataSourceUri,
-                       QgsProcessingOutputVectorLayer,
                        QgsProcessingParameterVectorLayer,
-                       QgsWkbTypes,
-                       QgsProcessingParameterBoolean,
-                       QgsProcessingParameterEnum,
                        QgsProcessingParameterNumber,
-                       QgsProcessingParameterMultipleLayers,
-                       QgsProcessingUtils,
-                       QgsSpatialIndex,
-                       QgsGeometry,
-                       QgsProcessingParameterField,
+                       QgsProcessingOutputNumber,
                        QgsProcessingMultiStepFeedback,
-                       QgsProcessingParameterFile,
-                       QgsProcessingParameterExpression,
                        QgsProcessingException,
+                       QgsFeature,
                        QgsFeatureRequest,
-                       QgsRectangle)
+                       QgsField,
+                       QgsFields,
+                       QgsGeometry,
+                       QgsPointXY,
+                       QgsWkbTypes)
+
+from DsgTools.core.GeometricTools.pointMatchingEngine import PointMatchingEngine
 
 class PecCalculatorAlgorithm(QgsProcessingAlgorithm):
     INPUT = 'INPUT'
     REFERENCE = 'REFERENCE'
     TOLERANCE = 'TOLERANCE'
-    # OUTPUT = 'OUTPUT'
+    OUTPUT = 'OUTPUT'
+    MEAN = 'MEAN'
+    RMS = 'RMS'
+    PERCENTILE = 'PERCENTILE'
 
     def initAlgorithm(self, config):
         """
@@ -85,7 +79,17 @@ class PecCalculatorAlgorithm(QgsProcessingAlgorithm):
                 defaultValue=2
             )
         )
-        
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT,
+                self.tr('Residual vectors'),
+                QgsProcessing.TypeVectorLine,
+                optional=True
+            )
+        )
+        self.addOutput(QgsProcessingOutputNumber(self.MEAN, self.tr('Mean')))
+        self.addOutput(QgsProcessingOutputNumber(self.RMS, self.tr('RMS')))
+        self.addOutput(QgsProcessingOutputNumber(self.PERCENTILE, self.tr('Percentile 90')))
 
     def processAlgorithm(self, parameters, context, feedback):
         """
@@ -106,85 +110,136 @@ class PecCalculatorAlgorithm(QgsProcessingAlgorithm):
             self.TOLERANCE,
             context
             )
-        distanceDict = dict()
-        featList = [i for i in inputLyr.getFeatures()]
-        step = 100/len(featList) if featList else 0
-        for current, feat in enumerate(featList):
-            if feedback.isCanceled():
-                break
-            if not feat.geometry().isGeosValid():
-                continue
-            id = feat.id()
-            geom = feat.geometry().asGeometryCollection()[0].asPoint()
-            x = geom.x()
-            y = geom.y()
-            bbox = QgsRectangle(
-                    x-tol,
-                    y-tol,
-                    x+tol,
-                    y+tol
-                )
-            request = QgsFeatureRequest()
-            request.setFilterRect(bbox)
-            minDistance = 0
-            candidateId = None
-            for candidateFeat in referenceLyr.getFeatures(request):
-                dist = feat.geometry().distance(candidateFeat.geometry())
-                if candidateId is None:
-                    minDistance = dist
-                    candidateId = candidateFeat.id()
-                    continue
-                elif dist < minDistance:
-                    minDistance = dist
-                    candidateId = candidateFeat.id()
-            if candidateId is not None:
-                distanceDict[id] = {
-                    'minDistance' : minDistance,
-                    'candidateId' : candidateId
-                }
-            feedback.setProgress(current*step)
-            
-            
-        distanceList = [i['minDistance'] for i in distanceDict.values()]
-        n = len(distanceList)
-        distanceSquared = [i['minDistance']**2 for i in distanceDict.values()]
-        rms = math.sqrt(sum(distanceSquared)/n)
-        percFunc = functools.partial(self.percentile, frequency=0.9)
-        perc = percFunc(distanceList)
-        mean = sum(distanceList)/n
-        feedback.pushInfo('MEAN: {mean}'.format(mean=mean))
-        feedback.pushInfo('RMS: {rms}'.format(rms=rms))
-        feedback.pushInfo('PERC: {perc}'.format(perc=perc))
+        multiStepFeedback = QgsProcessingMultiStepFeedback(4, feedback)
+        multiStepFeedback.setCurrentStep(0)
+        multiStepFeedback.setProgressText(self.tr('Loading input points...'))
+        inputIds, inputCoords = self.loadCoordinates(
+            inputLyr,
+            QgsFeatureRequest(),
+            feedback=multiStepFeedback
+        )
+        multiStepFeedback.setCurrentStep(1)
+        multiStepFeedback.setProgressText(self.tr('Loading reference points...'))
+        # reference points are compared on input's CRS
+        referenceIds, referenceCoords = self.loadCoordinates(
+            referenceLyr,
+            QgsFeatureRequest().setDestinationCrs(
+                inputLyr.crs(), context.transformContext()),
+            feedback=multiStepFeedback
+        )
+        multiStepFeedback.setCurrentStep(2)
+        multiStepFeedback.setProgressText(self.tr('Matching points...'))
+        matches, distances = PointMatchingEngine(referenceCoords, tol).match(
+            inputCoords,
+            feedback=multiStepFeedback
+        )
+        if feedback.isCanceled():
+            return {}
+        stats = PointMatchingEngine.statistics(distances)
+        if not stats['count']:
+            raise QgsProcessingException(
+                self.tr('No input point has a reference point within max distance.')
+            )
+        feedback.pushInfo('MEAN: {mean}'.format(mean=stats['mean']))
+        feedback.pushInfo('RMS: {rms}'.format(rms=stats['rms']))
+        feedback.pushInfo('PERC: {perc}'.format(perc=stats['percentile']))
+        outputs = {
+            self.MEAN: stats['mean'],
+            self.RMS: stats['rms'],
+            self.PERCENTILE: stats['percentile']
+        }
+        multiStepFeedback.setCurrentStep(3)
+        multiStepFeedback.setProgressText(self.tr('Writing residual vectors...'))
+        sink, sinkId = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            self.residualFields(),
+            QgsWkbTypes.LineString,
+            inputLyr.crs()
+        )
+        if sink is not None:
+            self.writeResiduals(
+                sink,
+                inputIds,
+                inputCoords,
+                referenceIds,
+                referenceCoords,
+                matches,
+                distances,
+                feedback=multiStepFeedback
+            )
+            outputs[self.OUTPUT] = sinkId
+        return outputs
 
-        return {}
-    
-    def percentile(self, N, frequency, key=lambda x:x):
+    def loadCoordinates(self, layer, request, feedback=None):
         """
-        Find the percentile of a list of values.
-
-        @parameter N - is a list of values. Note N MUST BE already sorted.
-        @parameter percent - a float value from 0.0 to 1.0.
-        @parameter key - optional key function to compute value from each element of N.
-
-        @return - the percentile of the values
-        """
-        if not N:
-            return None
-        sortedN = sorted(N)
-        if len(sortedN) < 1:
-            return 0 if not sortedN else 1
-        if frequency <= 0 :
-            return sortedN[0]
-        elif frequency >= 1:
-            return sortedN[-1]
-        position = frequency * (len(sortedN) - 1)
+        Loads the coordinates of the points of a layer (the first point of
+        each multipoint).
+        :param layer: (QgsVectorLayer) point layer.
+        :param request: (QgsFeatureRequest) request used to read the layer.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        :return: (tuple) array of feature ids and (n, 2) array of coordinates.
+        """
+        request.setNoAttributes()
+        featCount = layer.featureCount()
+        step = 100/featCount if featCount else 0
+        ids, xs, ys = [], [], []
+        for current, feat in enumerate(layer.getFeatures(request)):
+            if feedback is not None and feedback.isCanceled():
+                break
+            geom = feat.geometry()
+            if geom.isNull() or geom.isEmpty():
+                continue
+            point = geom.vertexAt(0)
+            ids.append(feat.id())
+            xs.append(point.x())
+            ys.append(point.y())
+            if feedback is not None:
+                feedback.setProgress(current*step)
+        return np.array(ids, dtype=np.int64), \
+            np.column_stack((np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64)))
 
-        bottom = math.floor(position)
-        top = math.ceil(position)
-        if top == bottom:
-            return sortedN[top]
-        return (sortedN[bottom] * (1. + bottom - position) + sortedN[top] * (1. + position - top) )
+    def residualFields(self):
+        fields = QgsFields()
+        fields.append(QgsField('input_id', QVariant.LongLong))
+        fields.append(QgsField('reference_id', QVariant.LongLong))
+        fields.append(QgsField('dx', QVariant.Double))
+        fields.append(QgsField('dy', QVariant.Double))
+        fields.append(QgsField('distance', QVariant.Double))
+        return fields
 
+    def writeResiduals(self, sink, inputIds, inputCoords, referenceIds,
+        referenceCoords, matches, distances, feedback=None):
+        """
+        Writes the residual vector (input point minus its reference point) of
+        each matched input point as a line from the reference to the input
+        point.
+        """
+        fields = self.residualFields()
+        matchedIdx = np.flatnonzero(matches >= 0)
+        deltas = inputCoords[matchedIdx] - referenceCoords[matches[matchedIdx]]
+        step = 100/len(matchedIdx) if len(matchedIdx) else 0
+        for current, (idx, (dx, dy)) in enumerate(zip(matchedIdx.tolist(), deltas.tolist())):
+            if feedback is not None and feedback.isCanceled():
+                break
+            refIdx = int(matches[idx])
+            feat = QgsFeature(fields)
+            feat.setGeometry(QgsGeometry.fromPolylineXY([
+                QgsPointXY(*referenceCoords[refIdx].tolist()),
+                QgsPointXY(*inputCoords[idx].tolist())
+            ]))
+            feat.setAttributes([
+                int(inputIds[idx]),
+                int(referenceIds[refIdx]),
+                dx,
+                dy,
+                float(distances[idx])
+            ])
+            sink.addFeature(feat, QgsFeatureSink.FastInsert)
+            if feedback is not None:
+                feedback.setProgress(current*step)
 
     def name(self):
         """
@@ -17,8 +17,8 @@ from qgis.core import (QgsProcessing,
 from qgis import processing
 from qgis.utils import iface
 import csv
-import concurrent.futures
 import os
+from DsgTools.core.Utils.executorService import ExecutorService
 
 class UnicodeFilterAlgorithm(QgsProcessingAlgorithm): 
 
@@ -58,9 +58,6 @@ class UnicodeFilterAlgorithm(QgsProcessingAlgorithm):
         feedback.setProgressText('Verificando unicodes...')
         layerList = self.parameterAsLayerList(parameters,'INPUT_LAYER_LIST', context)
         whitelist = self.getWhitelist(self.getCsvFilePath())
-        listSize = len(layerList)
-        progressStep = 100/listSize if listSize else 0
-        step = 0
         flags = {}
 
         def checkUnicode(layer):
@@ -78,15 +75,12 @@ class UnicodeFilterAlgorithm(QgsProcessingAlgorithm):
                 else:
                     continue
                 break
-            flags[layer.geometryType()] += featuresNotApproved
+            return layer.geometryType(), featuresNotApproved
 
-        pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count()-1)
-        futures = set()
-        for step, layer in enumerate(layerList):
-            if not(layer.geometryType() in flags):
-                flags[layer.geometryType()] = []
-            futures.add(pool.submit(checkUnicode, layer))
-        concurrent.futures.wait(futures, timeout=None, return_when=concurrent.futures.ALL_COMPLETED)
+        # each layer is a task and flags are only gathered on current thread
+        for geometryType, featuresNotApproved in ExecutorService.instance().map(
+            checkUnicode, layerList, chunkSize=1, feedback=feedback):
+            flags.setdefault(geometryType, []).extend(featuresNotApproved)
         
         output = {self.OUTPUT1: '', self.OUTPUT2: '', self.OUTPUT3: ''}
         for geometryType in flags:
@@ -19,9 +19,6 @@
  *                                                                         *
  ***************************************************************************/
 """
-import concurrent.futures
-import os
-
 import processing
 from qgis.core import (QgsFeature, QgsFeatureSink, QgsField, QgsFields,
                        QgsProcessing, QgsProcessingMultiStepFeedback,
@@ -31,6 +28,8 @@ from qgis.core import (QgsFeature, QgsFeatureSink, QgsField, QgsFields,
 from qgis.PyQt.QtCore import QCoreApplication, QVariant
 from qgis.utils import iface
 
+from DsgTools.core.Utils.executorService import ExecutorService
+
 from .validationAlgorithm import ValidationAlgorithm
 
 
@@ -169,38 +168,28 @@ class IdentifyCountourStreamIntersectionAlgorithm(ValidationAlgorithm):
         )
 
     def findProblems(self, feedback, outputPointsSet, outputLinesSet, inputLyr, idDict):
-        total = 100.0 / inputLyr.featureCount() if inputLyr.featureCount() else 0
         def buildOutputs(riverFeat, feedback):
             if feedback.isCanceled():
-                return
+                return None
             riverGeom = riverFeat.geometry()
             if riverFeat['AUTO_2'] not in idDict:
-                return
+                return None
             countourGeom = idDict[riverFeat['AUTO_2']].geometry()
             intersection = countourGeom.intersection(riverGeom)
             if intersection.isEmpty() or intersection.wkbType() == 1:
-                return
+                return None
+            return intersection
+        
+        buildOutputsLambda = lambda x: buildOutputs(x, feedback)
+        # outputs are only gathered on current thread
+        for intersection in ExecutorService.instance().map(
+            buildOutputsLambda, list(inputLyr.getFeatures()), feedback=feedback):
+            if intersection is None:
+                continue
             if intersection.wkbType() == 4:
                 outputPointsSet.add(intersection)
             if intersection.wkbType() in [2, 5]:
                 outputLinesSet.add(intersection)
-        
-        buildOutputsLambda = lambda x: buildOutputs(x, feedback)
-        
-        pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count())
-        futures = set()
-        current_idx = 0
-        
-        for feat in inputLyr.getFeatures():
-            if feedback is not None and feedback.isCanceled():
-                break
-            futures.add(pool.submit(buildOutputsLambda, feat))
-        
-        for x in concurrent.futures.as_completed(futures):
-            if feedback is not None and feedback.isCanceled():
-                break
-            feedback.setProgress(current_idx * total)
-            current_idx += 1
 
     def outLayer(self, parameters, context, geometry, streamLayer, geomtype):
         newFields = QgsFields()
@@ -20,14 +20,13 @@
  *                                                                         *
  ***************************************************************************/
 """
-import concurrent.futures
-import os
 from collections import defaultdict
 from typing import DefaultDict, Dict, Tuple, Union
 
 import processing
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
 from DsgTools.core.GeometricTools.layerHandler import LayerHandler
+from DsgTools.core.Utils.executorService import ExecutorService
 from PyQt5.QtCore import QCoreApplication
 from qgis.core import (QgsFeatureRequest, QgsGeometry, QgsPointXY,
                        QgsProcessing, QgsProcessingFeatureSourceDefinition,
@@ -242,7 +241,10 @@ class IdentifyDanglesAlgorithm(ValidationAlgorithm):
         if dangleSet:
             # currentValue = feedback.progress()
             currentTotal = 100/len(dangleSet)
-            for current, point in enumerate(dangleSet):
+            # flags are raised in coordinate order, so that output is stable
+            for current, point in enumerate(
+                sorted(dangleSet, key=lambda p: (p.x(), p.y()))
+            ):
                 if multiStepFeedback.isCanceled():
                     break
                 self.flagFeature(
@@ -254,58 +256,41 @@ class IdentifyDanglesAlgorithm(ValidationAlgorithm):
         return {self.FLAGS: self.flag_id}
 
     def buildInitialAndEndPointDict(self, lyr, algRunner, context, feedback, geographicBoundsLyr=None):
+        """
+        Maps each point on the lines' boundaries to the set of IDs (AUTO field)
+        of the lines that start or end on it. Boundaries follow the GEOS mod-2
+        rule, hence closed lines have no extremities.
+        """
         pointDict = defaultdict(set)
-        nSteps = 5 if geographicBoundsLyr is not None else 3
-        currentStep = 0
+        nSteps = 2 if geographicBoundsLyr is not None else 1
         multiStepFeedback = QgsProcessingMultiStepFeedback(nSteps, feedback)
-        multiStepFeedback.setCurrentStep(currentStep)
-        # this process of extracting the boundary is intentionally without the feedback
-        # to avoid the excessive amount of error messages that are generated due to closed lines.
-        boundaryLyr = algRunner.runBoundary(
-            inputLayer=lyr,
-            context=context
-        )
-        currentStep += 1
-        multiStepFeedback.setCurrentStep(currentStep)
-        boundaryLyr = algRunner.runMultipartToSingleParts(
-            inputLayer=boundaryLyr,
-            context=context,
+        multiStepFeedback.setCurrentStep(0)
+        nodeMapping = self.layerHandler.buildLineEndpointNodeMapping(
+            lyr,
+            boundaryRule=True,
+            idField="AUTO",
             feedback=multiStepFeedback
         )
-        currentStep += 1
-        multiStepFeedback.setCurrentStep(currentStep)
-        if geographicBoundsLyr is not None:
-            algRunner.runCreateSpatialIndex(
-                inputLyr=boundaryLyr,
-                context=context,
-                feedback=multiStepFeedback
-            )
-            currentStep += 1
-            multiStepFeedback.setCurrentStep(currentStep)
-            boundaryLyr = algRunner.runExtractByLocation(
-                inputLyr=boundaryLyr,
-                intersectLyr=geographicBoundsLyr,
-                context=context,
-                feedback=multiStepFeedback
-            )
-            currentStep += 1
-
-        multiStepFeedback.setCurrentStep(currentStep)
-        featCount = boundaryLyr.featureCount()
-        if featCount == 0:
+        for point, nodeLines in nodeMapping.items():
+            pointDict[point] = set(nodeLines['lines'])
+        if geographicBoundsLyr is None or not pointDict:
             return pointDict
-        step = 100/featCount
-        for current, feat in enumerate(boundaryLyr.getFeatures()):
+        multiStepFeedback.setCurrentStep(1)
+        boundsIdx = QgsSpatialIndex(
+            geographicBoundsLyr.getFeatures(),
+            None,
+            QgsSpatialIndex.FlagStoreFeatureGeometries
+        )
+        step = 100/len(pointDict)
+        for current, point in enumerate(list(pointDict)):
             if multiStepFeedback.isCanceled():
                 break
-            geom = feat.geometry()
-            if geom is None or not geom.isGeosValid():
-                continue
-            id = feat["AUTO"]
-            pointList = geom.asMultiPoint() if geom.isMultipart() else [
-                geom.asPoint()]
-            for point in pointList:
-                pointDict[point].add(id)
+            pointGeom = QgsGeometry.fromPointXY(point)
+            if not any(
+                boundsIdx.geometry(i).intersects(pointGeom) \
+                    for i in boundsIdx.intersects(pointGeom.boundingBox())
+            ):
+                pointDict.pop(point)
             multiStepFeedback.setProgress(current * step)
         return pointDict
 
@@ -367,27 +352,14 @@ class IdentifyDanglesAlgorithm(ValidationAlgorithm):
         if nPoints == 0:
             return inputLayerDangles
         localTotal = 100/nPoints
-        pool = concurrent.futures.ThreadPoolExecutor(
-            max_workers=os.cpu_count()-1)
-        futures = set()
-
-        def evaluate(point) -> Union[QgsPointXY, None]:
-            qgisPoint = QgsGeometry.fromPointXY(point)
-            buffer = qgisPoint.buffer(searchRadius, -1)
-            bufferBB = buffer.boundingBox()
-            # search radius to narrow down candidates
-            request = QgsFeatureRequest().setFilterRect(bufferBB)
-            bufferCount, intersectCount = 0, 0
-            point_relationship_lambda = lambda x: qgisPoint.intersects(x) \
-                if ignoreDanglesOnUnsegmentedLines else qgisPoint.touches(x)
-            for feat in inputLyr.getFeatures(request):
-                geom = feat.geometry()
-                if feedback is not None and feedback.isCanceled():
-                    return None
-                if geom.intersects(buffer):
-                    bufferCount += 1
-                    if point_relationship_lambda(geom):
-                        intersectCount += 1
+        multiStepFeedback = QgsProcessingMultiStepFeedback(
+            2, feedback) if feedback is not None else None
+        if multiStepFeedback is not None:
+            multiStepFeedback.setCurrentStep(0)
+        spatialIdx = self.buildInMemorySpatialIndex(
+            inputLyr, feedback=multiStepFeedback)
+
+        def evaluate(point, bufferCount, intersectCount) -> Union[QgsPointXY, None]:
             if inputIsBoundaryLayer and intersectCount == 1 and bufferCount == 1:
                 if relatedDict == dict():
                     return point
@@ -396,20 +368,20 @@ class IdentifyDanglesAlgorithm(ValidationAlgorithm):
                 return point
             return point if bufferCount != intersectCount else None
 
-        multiStepFeedback = QgsProcessingMultiStepFeedback(
-            2, feedback) if feedback is not None else None
-        multiStepFeedback.setCurrentStep(0)
-        for current, point in enumerate(pointSet):
-            if multiStepFeedback is not None and multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, point))
-            if multiStepFeedback is not None:
-                multiStepFeedback.setProgress(current * localTotal)
-        multiStepFeedback.setCurrentStep(1)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
+        if multiStepFeedback is not None:
+            multiStepFeedback.setCurrentStep(1)
+        for current, (point, (bufferCount, intersectCount)) in enumerate(
+            self.countCandidatesOnBuffers(
+                pointSet,
+                spatialIdx,
+                searchRadius,
+                usePointIntersects=ignoreDanglesOnUnsegmentedLines,
+                feedback=multiStepFeedback
+            )
+        ):
             if multiStepFeedback is not None and multiStepFeedback.isCanceled():
                 break
-            output = future.result()
+            output = evaluate(point, bufferCount, intersectCount)
             if output is not None:
                 inputLayerDangles.add(output)
             if multiStepFeedback is not None:
@@ -433,62 +405,90 @@ class IdentifyDanglesAlgorithm(ValidationAlgorithm):
         if nPoints == 0:
             return danglesWithFilterLayers, relatedDict
         localTotal = 100/nPoints
-        multiStepFeedback = QgsProcessingMultiStepFeedback(4, feedback)
+        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
         multiStepFeedback.setCurrentStep(0)
-        spatialIdx, allFeatureDict = self.buildSpatialIndexAndIdDict(
+        spatialIdx = self.buildInMemorySpatialIndex(
             filterLayer, feedback=multiStepFeedback)
         multiStepFeedback.setCurrentStep(1)
-
-        def evaluate(point: QgsPointXY) -> dict:
-            candidateCount, bufferCount = 0, 0
-            qgisPoint = QgsGeometry.fromPointXY(point)
-            # search radius to narrow down candidates
-            buffer = qgisPoint.buffer(searchRadius, -1)
-            bufferBB = buffer.boundingBox()
-            # if there is only one feat in candidateIds, that means that it is not a dangle
-            for id in spatialIdx.intersects(bufferBB):
-                candidateGeom = allFeatureDict[id].geometry()
-                if multiStepFeedback.isCanceled():
-                    return None
-                if buffer.intersects(candidateGeom):
-                    bufferCount += 1
-                    if (qgisPoint.intersects(candidateGeom)):
-                        candidateCount += 1
-            return point, {"candidateCount": candidateCount, "bufferCount": bufferCount}
-
-        futures = set()
-        pool = concurrent.futures.ThreadPoolExecutor(
-            max_workers=os.cpu_count()-1)
-        multiStepFeedback.setCurrentStep(2)
-        for current, point in enumerate(pointSet):
-            if multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, point))
-            multiStepFeedback.setProgress(localTotal*current)
-        multiStepFeedback.setCurrentStep(3)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
+        for current, (dangle, (bufferCount, candidateCount)) in enumerate(
+            self.countCandidatesOnBuffers(
+                pointSet,
+                spatialIdx,
+                searchRadius,
+                usePointIntersects=True,
+                feedback=multiStepFeedback
+            )
+        ):
             if multiStepFeedback.isCanceled():
                 break
-            dangle, dangleDict = future.result()
-            relatedDict[dangle] = dangleDict
-            if dangleDict["candidateCount"] != dangleDict["bufferCount"]:
+            relatedDict[dangle] = {
+                "candidateCount": candidateCount,
+                "bufferCount": bufferCount
+            }
+            if candidateCount != bufferCount:
                 danglesWithFilterLayers.add(dangle)
             multiStepFeedback.setProgress(localTotal*current)
 
         return danglesWithFilterLayers, relatedDict
 
-    def buildSpatialIndexAndIdDict(self, inputLyr, feedback=None):
+    def buildInMemorySpatialIndex(self, inputLyr, feedback=None):
         """
-        creates a spatial index for the centroid layer
+        Loads the geometries of inputLyr once into a bulk loaded spatial index.
+        Geometries are stored on the index, therefore no provider requests
+        are made while evaluating the dangle candidates.
         """
-        spatialIdx = QgsSpatialIndex()
-        idDict = {}
-        for feat in inputLyr.getFeatures():
-            if feedback is not None and feedback.isCanceled():
-                break
-            spatialIdx.addFeature(feat)
-            idDict[feat.id()] = feat
-        return spatialIdx, idDict
+        return QgsSpatialIndex(
+            inputLyr.getFeatures(QgsFeatureRequest().setNoAttributes()),
+            feedback,
+            QgsSpatialIndex.FlagStoreFeatureGeometries
+        )
+
+    def countCandidatesOnBuffers(
+        self, pointSet: set, spatialIdx: QgsSpatialIndex, searchRadius: float,
+        usePointIntersects: bool = True, feedback: QgsProcessingFeedback = None,
+        chunkSize: int = 1000
+    ):
+        """
+        Evaluates the dangle candidates in chunks of spatially sorted points.
+        For each point, counts the indexed geometries that intersect the
+        point's buffer and the ones that are related to the point itself
+        (intersects if usePointIntersects, touches otherwise). Each geometry
+        is prepared once per chunk and reused by every point that hits it.
+        Yields tuples (point, (bufferCount, relationshipCount)).
+        """
+        pointList = sorted(pointSet, key=lambda p: (p.x(), p.y()))
+
+        def evaluateChunk(chunk):
+            engineDict = dict()
+            output = list()
+            for point in chunk:
+                if feedback is not None and feedback.isCanceled():
+                    return output
+                qgisPoint = QgsGeometry.fromPointXY(point)
+                buffer = qgisPoint.buffer(searchRadius, -1)
+                bufferCount, relationshipCount = 0, 0
+                for featId in spatialIdx.intersects(buffer.boundingBox()):
+                    if featId not in engineDict:
+                        engine = QgsGeometry.createGeometryEngine(
+                            spatialIdx.geometry(featId).constGet())
+                        engine.prepareGeometry()
+                        engineDict[featId] = engine
+                    engine = engineDict[featId]
+                    if not engine.intersects(buffer.constGet()):
+                        continue
+                    bufferCount += 1
+                    if usePointIntersects and engine.intersects(qgisPoint.constGet()):
+                        relationshipCount += 1
+                    elif not usePointIntersects and engine.touches(qgisPoint.constGet()):
+                        relationshipCount += 1
+                output.append((point, (bufferCount, relationshipCount)))
+            return output
+
+        chunks = (
+            pointList[i:i + chunkSize] for i in range(0, len(pointList), chunkSize)
+        )
+        for output in ExecutorService.instance().map(evaluateChunk, chunks, chunkSize=1):
+            yield from output
 
     def name(self):
         """
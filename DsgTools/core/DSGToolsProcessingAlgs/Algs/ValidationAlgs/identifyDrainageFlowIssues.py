@@ -32,6 +32,8 @@ from qgis.core import (QgsFeature, QgsFeatureRequest, QgsField, QgsFields,
                        QgsProcessingParameterNumber, QgsProject, QgsWkbTypes, 
                        QgsProcessingMultiStepFeedback)
 
+from DsgTools.core.GeometricTools.layerHandler import LayerHandler
+
 from .validationAlgorithm import ValidationAlgorithm
 
 
@@ -64,49 +66,40 @@ class IdentifyDrainageFlowIssues(ValidationAlgorithm):
         )
         self.prepareFlagSink(parameters, lines, QgsWkbTypes.Point, context)
 
-        # Dictionary that indicates how many lines enter and how many lines exit a given point:
-        pointInAndOutDictionary = {}
-
-
-        # Iterate over lines setting the dictionary counters:
         lineCount = lines.featureCount()
         if lineCount == 0:
             return {self.FLAGS: self.flag_id}
         multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
         multiStepFeedback.setCurrentStep(0)
         multiStepFeedback.setProgressText(self.tr("Evaluating line structure..."))
-        stepSize = 100/lineCount
+        # Maps each node to the lines that start (go out) and end (come in) on
+        # it. Lines go from the first to the last vertex of the whole geometry
+        # and nodes with different Z values are not the same node:
+        nodeMapping = LayerHandler().buildLineEndpointNodeMapping(
+            lines,
+            wholeGeometry=True,
+            useZ=True,
+            feedback=multiStepFeedback
+        )
+        if not nodeMapping:
+            return {self.FLAGS: self.flag_id}
 
-        for current, line in enumerate(lines.getFeatures()):
-            if multiStepFeedback.isCanceled():
-                break
-            geom = list(line.geometry().vertices())
-            if len(geom) == 0:
-                continue
-            first_vertex = geom[0]
-            last_vertex = geom[-1]
-
-            if first_vertex.asWkt() not in pointInAndOutDictionary:
-                pointInAndOutDictionary[first_vertex.asWkt()] = { "incoming": 0, "outgoing": 0}
-
-            if last_vertex.asWkt() not in pointInAndOutDictionary:
-                pointInAndOutDictionary[last_vertex.asWkt()] = { "incoming": 0, "outgoing": 0}
-            
-            pointInAndOutDictionary[first_vertex.asWkt()]["outgoing"] += 1
-            pointInAndOutDictionary[last_vertex.asWkt()]["incoming"] += 1
-            multiStepFeedback.setProgress(current * stepSize)
-        
         multiStepFeedback.setCurrentStep(1)
         multiStepFeedback.setProgressText(self.tr("Raising flags..."))
-        stepSize = 100/len(pointInAndOutDictionary)
-        # Iterate over dictionary:
-        for current, (pointStr, inAndOutCounters) in enumerate(pointInAndOutDictionary.items()):
+        stepSize = 100/len(nodeMapping)
+        # Iterate over nodes:
+        for current, (point, nodeLines) in enumerate(nodeMapping.items()):
             if multiStepFeedback.isCanceled():
                 break
+            inAndOutCounters = {
+                "incoming": len(nodeLines['end']),
+                "outgoing": len(nodeLines['start'])
+            }
             errorMsg = self.errorWhenCheckingInAndOut(inAndOutCounters)
             if errorMsg != '':
                 self.flagFeature(
-                    flagGeom= QgsGeometry.fromWkt(pointStr),
+                    flagGeom=QgsGeometry.fromWkt(point) if isinstance(point, str) \
+                        else QgsGeometry.fromPointXY(point),
                     flagText=self.tr(errorMsg)
                 )
             multiStepFeedback.setProgress(current * stepSize)
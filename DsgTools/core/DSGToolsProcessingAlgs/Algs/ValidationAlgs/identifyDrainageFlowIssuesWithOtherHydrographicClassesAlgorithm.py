@@ -24,8 +24,7 @@
 from PyQt5.QtCore import QCoreApplication
 
 import processing
-import concurrent.futures
-import os
+from DsgTools.core.Utils.executorService import ExecutorService
 from itertools import product, chain
 from DsgTools.core.GeometricTools.layerHandler import LayerHandler
 from DsgTools.core.GeometricTools.networkHandler import NetworkHandler
@@ -454,7 +453,7 @@ class IdentifyDrainageFlowIssuesWithHydrographyElementsAlgorithm(ValidationAlgor
         nFeats = waterBodyLyr.featureCount()
         if nFeats == 0:
             return
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
+        multiStepFeedback = QgsProcessingMultiStepFeedback(1, feedback)
         multiStepFeedback.setProgressText(self.tr(f'Validating drainages with {waterBodyName}'))
         multiStepFeedback.setCurrentStep(0)
         flagLineLambda = lambda geom: self.flagFeature(
@@ -479,7 +478,7 @@ class IdentifyDrainageFlowIssuesWithHydrographyElementsAlgorithm(ValidationAlgor
             inCount, outCount = 0, 0
             for drainageFeat in drainagesLyr.getFeatures(bbox):
                 if multiStepFeedback.isCanceled():
-                    return intersectionSet
+                    return intersectionSet, None
                 drainageGeom = drainageFeat.geometry()
                 if not geomEngine.intersects(drainageGeom.constGet()):
                     continue
@@ -497,34 +496,18 @@ class IdentifyDrainageFlowIssuesWithHydrographyElementsAlgorithm(ValidationAlgor
                 intersectionSet.add(interWkt)
             polygonWithProblem = None if flowCheckLambda([inCount, outCount]) else geom
             return intersectionSet, polygonWithProblem
-        stepSize = 100 / nFeats
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() - 1)
-        futures = set()
-        for current, feat in enumerate(waterBodyLyr.getFeatures()):
-            if multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, feat))
-            multiStepFeedback.setProgress(stepSize * current)
-
-        multiStepFeedback.setCurrentStep(1)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback.isCanceled():
-                break
-            intersectionSet, polygonWithProblem = future.result()
-            # intersectionSet, polygonWithProblem = evaluate(feat)
-            # for wkt in intersectionSet:
-            #     flagLineLambda(QgsGeometry.fromWkt(wkt))
+        for intersectionSet, polygonWithProblem in ExecutorService.instance().map(
+            evaluate, list(waterBodyLyr.getFeatures()), feedback=multiStepFeedback):
             if intersectionSet != set():
                 list(map(flagLineLambda, list(map(lambda x: QgsGeometry.fromWkt(x), intersectionSet))))
             if polygonWithProblem is not None:
                 flagPolygonLambda(polygonWithProblem)
-            multiStepFeedback.setProgress(current * stepSize)
     
     def validateDrainagesEndPoints(self, endPointDict, elementList, feedback):
         nFeats = len(endPointDict)
         if nFeats == 0:
             return
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
+        multiStepFeedback = QgsProcessingMultiStepFeedback(1, feedback)
         multiStepFeedback.setProgressText(self.tr(f'Validating drainages end points.'))
         multiStepFeedback.setCurrentStep(0)
         flagPointLambda = lambda geom: self.flagFeature(
@@ -549,23 +532,10 @@ class IdentifyDrainageFlowIssuesWithHydrographyElementsAlgorithm(ValidationAlgor
                 if geomEngine.touches(candidateGeom.constGet()):
                     return None
             return geom
-        stepSize = 100 / nFeats
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() - 1)
-        futures = set()
-        for current, feat in enumerate(endPointDict.values()):
-            if multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, feat))
-            multiStepFeedback.setProgress(stepSize * current)
-
-        multiStepFeedback.setCurrentStep(1)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback.isCanceled():
-                break
-            geom = future.result()
+        for geom in ExecutorService.instance().map(
+            evaluate, endPointDict.values(), feedback=multiStepFeedback):
             if geom is not None:
                 flagPointLambda(geom)
-            multiStepFeedback.setProgress(current * stepSize)
 
 
     def name(self):
@@ -21,8 +21,7 @@
  ***************************************************************************/
 """
 
-import os
-import concurrent.futures
+from DsgTools.core.Utils.executorService import ExecutorService
 from PyQt5.QtCore import QCoreApplication
 from qgis.core import (QgsProcessing, QgsProcessingException,
                        QgsProcessingMultiStepFeedback,
@@ -134,8 +133,7 @@ class IdentifyDrainageLoops(ValidationAlgorithm):
         return {self.FLAGS: self.flag_id}
 
     def searchLoops(self, nx, geometryHandler, inputLyr, feedback, polygonLoops, polygonCount):
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
-        stepSize = 100 / polygonCount
+        multiStepFeedback = QgsProcessingMultiStepFeedback(1, feedback)
         flagFeatLambda = lambda x: self.flagFeature(
             flagGeom=x, flagText=self.tr('Loop on input drainages')
         )
@@ -143,7 +141,7 @@ class IdentifyDrainageLoops(ValidationAlgorithm):
             inputLyr, x
         )
         multiStepFeedback.setCurrentStep(0)
-        multiStepFeedback.setProgressText(self.tr('Submitting tasks to thread'))
+        multiStepFeedback.setProgressText(self.tr('Searching loops'))
         def evaluate(polygonFeature):
             geom = polygonFeature.geometry()
             geomEngine = QgsGeometry.createGeometryEngine(geom.constGet())
@@ -161,24 +159,11 @@ class IdentifyDrainageLoops(ValidationAlgorithm):
                     graph.add_edge(v1.asWkt(), v2.asWkt())
             loopSet = self.findLoopsOnEdgeSet(nx, graph, feedback=multiStepFeedback)
             return loopSet
-        pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count()-1)
-        futures = set()
-        for current, polygonFeature in enumerate(polygonLoops.getFeatures()):
-            if multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, polygonFeature))
-            multiStepFeedback.setCurrentStep(current * stepSize)
-
-        multiStepFeedback.setCurrentStep(1)
-        multiStepFeedback.setProgressText(self.tr('Evaluating results'))
-        
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback.isCanceled():
-                break
-            loopSet = future.result()
+        # each candidate scans the whole input layer, hence one per task
+        for loopSet in ExecutorService.instance().map(
+            evaluate, list(polygonLoops.getFeatures()), chunkSize=1, feedback=multiStepFeedback):
             if loopSet != set():
                 list(map(flagFeatLambda, loopSet))
-            multiStepFeedback.setCurrentStep(current * stepSize)
 
     def findLoopsOnEdgeSet(self, nx, graph, feedback):
         # loops = nx.strongly_connected_components(graph)
@@ -22,8 +22,7 @@
 """
 
 import itertools
-import concurrent.futures
-import os
+from DsgTools.core.Utils.executorService import ExecutorService
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
 from DsgTools.core.GeometricTools.layerHandler import LayerHandler
 from .validationAlgorithm import ValidationAlgorithm
@@ -199,7 +198,7 @@ class IdentifyNetworkConstructionIssuesAlgorithm(ValidationAlgorithm):
     
     def getUnsegmentedErrors(self, mergedLines, lineFilter, polygonFilter, flagSet, algRunner, context, feedback):
         # build spatial index on mergedLines
-        multiStepFeedback = QgsProcessingMultiStepFeedback(4, feedback)
+        multiStepFeedback = QgsProcessingMultiStepFeedback(3, feedback)
         multiStepFeedback.setCurrentStep(0)
         algRunner.runCreateSpatialIndex(
             mergedLines,
@@ -214,7 +213,6 @@ class IdentifyNetworkConstructionIssuesAlgorithm(ValidationAlgorithm):
         nFeats = mergedLines.featureCount()
         if nFeats == 0:
             return
-        stepSize = 100 / nFeats
         errorSet = set()
         def evaluate(feat):
             outputSet = set()
@@ -244,23 +242,9 @@ class IdentifyNetworkConstructionIssuesAlgorithm(ValidationAlgorithm):
                         outputSet.add(wkb)
             return outputSet
         
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()-1)
-        futures = set()
-        for current, feat in enumerate(mergedLines.getFeatures()):
-            if multiStepFeedback.isCanceled():
-                break
-            #put this into a thread after it is working
-            futures.add(pool.submit(evaluate, feat))
-            multiStepFeedback.setProgress(current * stepSize)
-        concurrent.futures.wait(futures, timeout=None, return_when=concurrent.futures.ALL_COMPLETED)
-        multiStepFeedback.setCurrentStep(3)
-        stepSize = 100/len(futures)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback.isCanceled():
-                break
-            outputSet = future.result()
+        for outputSet in ExecutorService.instance().map(
+            evaluate, list(mergedLines.getFeatures()), feedback=multiStepFeedback):
             errorSet = errorSet.union(outputSet)
-            multiStepFeedback.setProgress(current * stepSize)
         flagLambda = lambda x: self.flagFeature(x, self.tr("Line from input not split on intersection."), fromWkb=True)
         list(map(flagLambda, errorSet))
     
@@ -22,9 +22,8 @@
 
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
 from PyQt5.QtCore import QCoreApplication
-import os
 import processing
-import concurrent.futures
+from DsgTools.core.Utils.executorService import ExecutorService
 from DsgTools.core.GeometricTools.geometryHandler import GeometryHandler
 from DsgTools.core.GeometricTools.layerHandler import LayerHandler
 from qgis.core import (QgsDataSourceUri, QgsFeature, QgsFeatureSink,
@@ -160,27 +159,14 @@ class IdentifyOverlapsAlgorithm(ValidationAlgorithm):
                 set(intersects.asGeometryCollection()) if intersects.isMultipart() else {intersects}
             ) if intersects.type() == geomType else outputSet 
         
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
+        multiStepFeedback = QgsProcessingMultiStepFeedback(1, feedback)
         multiStepFeedback.setCurrentStep(0)
-        multiStepFeedback.setProgressText(self.tr("Finding overlaps: submitting to thread..."))
+        multiStepFeedback.setProgressText(self.tr("Finding overlaps..."))
         processLambda = lambda x: _processFeature(x, multiStepFeedback)
-        pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count())
-        futures = set()
         outputSet = set()
-        for current, feat in enumerate(inputLyr.getFeatures()):
-            if multiStepFeedback is not None and multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(processLambda, feat))
-        
-        multiStepFeedback.setCurrentStep(1)
-        multiStepFeedback.setProgressText(self.tr("Finding overlaps: processing thread outputs..."))
-        outputSet = set()
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback is not None and multiStepFeedback.isCanceled():
-                break
-            outputSet = outputSet.union(future.result())
-            # outputSet = outputSet.union(processLambda(feat))
-            multiStepFeedback.setProgress(current * total)
+        for output in ExecutorService.instance().map(
+            processLambda, list(inputLyr.getFeatures()), feedback=multiStepFeedback):
+            outputSet = outputSet.union(output)
         return outputSet
 
     def name(self):
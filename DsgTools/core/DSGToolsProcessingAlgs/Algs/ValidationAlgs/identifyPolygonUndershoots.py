@@ -20,8 +20,7 @@
  *                                                                         *
  ***************************************************************************/
 """
-import concurrent.futures
-import os
+from DsgTools.core.Utils.executorService import ExecutorService
 
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
 from DsgTools.core.GeometricTools.layerHandler import LayerHandler
@@ -168,23 +167,10 @@ class IdentifyPolygonUndershootsAlgorithm(ValidationAlgorithm):
                     return geom
             return None
         
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()-1)
-        futures = set()
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
-        multiStepFeedback.setCurrentStep(0)
-        for current, boundaryFeature in enumerate(boundaryLyr.getFeatures()):
-            if feedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, boundaryFeature))
-            feedback.setProgress(current * 100 / nFeats)
-        multiStepFeedback.setCurrentStep(1)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback.isCanceled():
-                break
-            result = future.result()
+        for result in ExecutorService.instance().map(
+            evaluate, list(boundaryLyr.getFeatures()), feedback=feedback):
             if result is not None:
                 undershootSet.add(result)
-            feedback.setProgress(current * 100 / nFeats)
         return undershootSet
 
     def flagFeatures(self, undershootSet, multiStepFeedback):
@@ -21,9 +21,8 @@
  ***************************************************************************/
 """
 
-import concurrent.futures
 from collections import defaultdict
-import os
+from DsgTools.core.Utils.executorService import ExecutorService
 
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
 from DsgTools.core.GeometricTools.layerHandler import LayerHandler
@@ -178,12 +177,10 @@ class IdentifyUnmergedLinesWithSameAttributeSetAlgorithm(ValidationAlgorithm):
         }
 
     def evaluateFlagCandidates(self, fieldList, fieldIdList, multiStepFeedback, localLyr, initialAndEndPointDict, mergedLineLyr, dictSize, filterPointSet):
-        stepSize = 100 / dictSize
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, multiStepFeedback)
+        multiStepFeedback = QgsProcessingMultiStepFeedback(1, multiStepFeedback)
         multiStepFeedback.setCurrentStep(0)
-        def evaluate(pointXY, idSet):
-            if multiStepFeedback.isCanceled():
-                return None
+        def evaluate(item):
+            pointXY, idSet = item
             geom = QgsGeometry.fromPointXY(pointXY)
             geomWkb = geom.asWkb()
             if geomWkb in filterPointSet:
@@ -202,27 +199,14 @@ class IdentifyUnmergedLinesWithSameAttributeSetAlgorithm(ValidationAlgorithm):
             f1, f2 = [i for i in localLyr.getFeatures(request)]
             differentFeats = any(f1[k] != f2[k] for k in fieldList)
             return geomWkb if not differentFeats else None
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()-1)
-        futures = set()
-
-        for current, (pointXY, idSet) in enumerate(initialAndEndPointDict.items()):
-            if multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, pointXY, idSet))
-            multiStepFeedback.setProgress(current * stepSize)
-        
-        multiStepFeedback.setCurrentStep(1)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback.isCanceled():
-                break
-            geomWkb = future.result()
+        for geomWkb in ExecutorService.instance().map(
+            evaluate, initialAndEndPointDict.items(), feedback=multiStepFeedback):
             if geomWkb is not None:
                 self.flagFeature(
                     flagGeom=geomWkb,
                     flagText=self.tr("Not merged lines with same attribute set"),
                     fromWkb=True
                 )
-            multiStepFeedback.setProgress(current * stepSize)
     
     def buildInitialAndEndPointDict(self, lyr, algRunner, context, feedback):
         pointDict = defaultdict(set)
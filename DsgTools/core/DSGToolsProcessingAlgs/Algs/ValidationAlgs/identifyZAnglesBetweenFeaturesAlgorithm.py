@@ -21,8 +21,7 @@
 """
 
 import math
-import concurrent.futures
-import os
+from DsgTools.core.Utils.executorService import ExecutorService
 
 from PyQt5.QtCore import QCoreApplication, QVariant
 from qgis.core import (QgsFeature, QgsFeatureRequest, QgsField, QgsFields,
@@ -157,8 +156,10 @@ class identifyZAnglesBetweenFeaturesAlgorithm(ValidationAlgorithm):
         lineCount = lines.featureCount()
         if lineCount == 0:
             return featsToAnalyse
-        total = 100 / lineCount
-        def evaluateLine(feat1):
+        def evaluateLine(item):
+            # the feature's position is passed along, as it is compared to
+            # the candidates' ones to evaluate each pair only once
+            i, feat1 = item
             featsToAnalyse = []
             if feedback is not None and feedback.isCanceled():
                 return []
@@ -198,22 +199,9 @@ class identifyZAnglesBetweenFeaturesAlgorithm(ValidationAlgorithm):
                                     featsToAnalyse.append(toAnalyse)
             return featsToAnalyse
         
-        futures = set()
-        pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count()-1)
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
-        multiStepFeedback.setCurrentStep(0)
-        multiStepFeedback.pushInfo(self.tr("Submitting tasks to thread"))
-        for i, feat1 in enumerate(lines.getFeatures()):
-            futures.add(pool.submit(evaluateLine, feat1))
-        multiStepFeedback.setCurrentStep(1)
-        multiStepFeedback.pushInfo(self.tr("Evaluating tasks"))
-        concurrent.futures.wait(futures, timeout=None, return_when=concurrent.futures.ALL_COMPLETED)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if feedback is not None and feedback.isCanceled():
-                break
-            featsToAnalyse += future.result()
-            multiStepFeedback.setProgress(total * current)
-
+        for output in ExecutorService.instance().map(
+            evaluateLine, list(enumerate(lines.getFeatures())), feedback=feedback):
+            featsToAnalyse += output
         return featsToAnalyse
 
     def checkIntersectionAndCreateFeature4p(self, v1, v2, v3, v4, angle):
@@ -29,12 +29,18 @@ from qgis.core import (QgsTask,
                        QgsLayerTreeLayer,
                        QgsProcessingFeedback,
                        QgsProcessingModelAlgorithm,
+                       QgsProcessingModelChildParameterSource,
+                       QgsProcessingFeatureSourceDefinition,
                        QgsVectorLayer,
                        QgsProcessingUtils)
 from qgis.PyQt.QtCore import pyqtSignal, QCoreApplication
 from processing.tools import dataobjects
 import processing
 
+from DsgTools.core.DSGToolsProcessingAlgs.Models.modelResultCache import ModelResultCache
+from DsgTools.core.Utils.processingProfiler import (ProcessingProfiler,
+                                                    ProfilingFeedback)
+
 class DsgToolsProcessingModel(QgsTask):
     """
     Handles models and materializes QgsProcessingModels from a DSGTools default
@@ -45,6 +51,10 @@ class DsgToolsProcessingModel(QgsTask):
     # xml: XML string               #
     # file: path to a local file    #
     # model: qgis resgistered model #
+    # child algorithms' parameter types that refer to map layers
+    LAYER_PARAMETER_TYPES = [
+        "source", "vector", "raster", "layer", "multilayer", "mesh"
+    ]
     modelFinished = pyqtSignal(QgsTask)
     
     # Appending status flags to the existing ones
@@ -86,8 +96,13 @@ class DsgToolsProcessingModel(QgsTask):
             "status" : False,
             "executionTime" : .0,
             "errorMessage" : self.tr("Thread not started yet."),
-            "finishStatus" : "initial"
+            "finishStatus" : "initial",
+            "fromCache" : False,
+            "profile" : []
         }
+        self.profiler = ProcessingProfiler(name)
+        # inputs' fingerprint, taken on the main thread (see prepareCache)
+        self._fingerprint = None
 
     def setTitle(self, title):
         """
@@ -305,6 +320,44 @@ class DsgToolsProcessingModel(QgsTask):
         """
         return self.flags()["flagLayerNames"] if self.flags() else []
 
+    def useCache(self):
+        """
+        Indicates whether model's output may be reused from its last successful
+        run when its inputs were not modified since then.
+        :return: (bool) whether model's results are cached.
+        """
+        return self.flags().get("useCache", True) if self.flags() else False
+
+    def usesSelection(self, model=None):
+        """
+        Checks whether any of model's child algorithms is set to only handle
+        the selected features of its input layers.
+        :param model: (QgsProcessingModelAlgorithm) model to be checked.
+        :return: (bool) whether model's output depends on layers' selection.
+        """
+        model = model or self.model()
+        for child in model.childAlgorithms().values():
+            for paramName, sources in child.parameterSources().items():
+                for source in sources:
+                    if source.source() != QgsProcessingModelChildParameterSource.StaticValue:
+                        continue
+                    value = source.staticValue()
+                    if isinstance(value, QgsProcessingFeatureSourceDefinition):
+                        if value.selectedFeaturesOnly:
+                            return True
+                    elif "SELECTED" in paramName.upper() and value in (True, "true", 1):
+                        return True
+        return False
+
+    def prepareCache(self):
+        """
+        Takes the fingerprint of model's inputs, which will be checked against
+        the cached output when model is run. Layers are read and watched, so
+        this must be called from the main thread, before the task is started.
+        """
+        self._fingerprint = ModelResultCache.instance().fingerprint(self) \
+            if self.useCache() else None
+
     def enableLocalFlags(self):
         """
         Indicates whether model should store its to a local DSGTools default
@@ -345,6 +398,53 @@ class DsgToolsProcessingModel(QgsTask):
                 for param in model.parameterDefinitions()
         ]
 
+    def dependsOn(self):
+        """
+        Names of the models that must be finished before this model is started
+        when running on a Workflow, as declared on its parameters.
+        :return: (list-of-str) models' names.
+        """
+        return list(self._param["dependsOn"]) \
+            if self._param and "dependsOn" in self._param else []
+
+    def _layerReferences(self, value):
+        if isinstance(value, (list, tuple)):
+            return {ref for v in value for ref in self._layerReferences(v)}
+        if isinstance(value, QgsProcessingFeatureSourceDefinition):
+            value = value.source.staticValue()
+        if isinstance(value, QgsMapLayer):
+            return {value.name()}
+        return {str(value)} if value else set()
+
+    def layerNames(self, model=None):
+        """
+        Names of the layers handled by the model. They might be declared on
+        model's parameters ("layers") or they are inferred from the static
+        layer parameters of its child algorithms.
+        :param model: (QgsProcessingModelAlgorithm) model to have its layers
+                      checked.
+        :return: (set-of-str) layers' names. An empty set means model's layers
+                 could not be identified.
+        """
+        if not self._param:
+            return set()
+        if "layers" in self._param:
+            return set(self._param["layers"])
+        layers = set()
+        model = model or self.model()
+        for child in model.childAlgorithms().values():
+            alg = child.algorithm()
+            if alg is None:
+                continue
+            sources = child.parameterSources()
+            for param in alg.parameterDefinitions():
+                if param.type() not in self.LAYER_PARAMETER_TYPES:
+                    continue
+                for source in sources.get(param.name(), []):
+                    if source.source() == QgsProcessingModelChildParameterSource.StaticValue:
+                        layers |= self._layerReferences(source.staticValue())
+        return layers
+
     def addLayerToGroup(self, layer, groupname, subgroupname=None):
         """
         Adds a layer to a group into layer panel.
@@ -357,6 +457,9 @@ class DsgToolsProcessingModel(QgsTask):
             else QgsProcessingUtils.mapLayerFromString(layer)
         qaGroup = self.createGroup(groupname, root)
         subGroup = self.createGroup(subgroupname, qaGroup)
+        if subGroup.findLayer(layer.id()) is not None:
+            # e.g. a cached output that is still loaded
+            return
         QgsProject.instance().addMapLayer(layer, addToLegend = False)
         subGroup.addLayer(layer)
         # root.insertChildNode(-1, QgsLayerTreeLayer(subGroup))
@@ -377,14 +480,34 @@ class DsgToolsProcessingModel(QgsTask):
         model = self.model()
         if self.isCanceled():
             return {}
-        context = dataobjects.createContext(
-            feedback=feedback)
-        out = processing.run(
-            model,
-            { param : "memory:" for param in self.modelParameters(model) },
-            feedback=feedback,
-            context=context
+        self.profiler = ProcessingProfiler(self.name())
+        profilingFeedback = ProfilingFeedback(
+            self.profiler,
+            {
+                childId: child.description() \
+                    for childId, child in model.childAlgorithms().items()
+            },
+            feedback
         )
+        context = dataobjects.createContext(
+            feedback=profilingFeedback)
+        with self.profiler, self.profiler.measure(
+            ProcessingProfiler.MODEL, self.name()
+        ) as modelRecord:
+            out = processing.run(
+                model,
+                { param : "memory:" for param in self.modelParameters(model) },
+                feedback=profilingFeedback,
+                context=context
+            )
+            profilingFeedback.finish()
+            self.setChildFeatureCounts(
+                model, profilingFeedback.childRecords, out, context)
+            modelRecord["featuresOut"] = sum(
+                ProcessingProfiler.featureCount(vl, context) or 0 \
+                    for k, vl in out.items() \
+                        if k not in ("CHILD_INPUTS", "CHILD_RESULTS")
+            )
         # not sure exactly when, but on 3.16 LTR output from model runs include
         # new items on it. these new items break our implementation =)
         # hence the popitems
@@ -392,21 +515,74 @@ class DsgToolsProcessingModel(QgsTask):
         out.pop("CHILD_RESULTS", None)
         if not self.loadOutput():
             return out
-        flagLayerNames = self.flagLayerNames()
         for name, vl in out.items():
+            if isinstance(vl, QgsMapLayer):
+                vl.setName(name.split(":", 2)[-1])
+        self.addOutputToGroup(out.values(), model.displayName())
+        return out
+
+    def addOutputToGroup(self, layers, groupName):
+        """
+        Adds model's output layers to the Quality Assurance group into layer
+        panel. Empty flag layers are not added.
+        :param layers: (list-of-QgsMapLayer) output layers.
+        :param groupName: (str) name of the subgroup for model's output.
+        """
+        flagLayerNames = self.flagLayerNames()
+        for vl in layers:
             if vl is None:
                 continue
             if not isinstance(vl, QgsMapLayer) or not vl.isValid():
                 continue
-            vl.setName(name.split(":", 2)[-1])
             if vl.name() in flagLayerNames and vl.featureCount() == 0:
                 continue
             self.addLayerToGroup(
                 vl,
                 self.tr("DSGTools Quality Assurance Models"),
-                model.displayName()
+                groupName
             )
-        return out
+
+    def setChildFeatureCounts(self, model, childRecords, out, context):
+        """
+        Fills the input and output feature counts of the child algorithms'
+        profiling records. Inputs are the static layers set to each child and
+        outputs are the layers it produced.
+        :param model: (QgsProcessingModelAlgorithm) model that was run.
+        :param childRecords: (dict) map of child's ID to its record.
+        :param out: (dict) model's output, including its children's results.
+        :param context: (QgsProcessingContext) context the model was run on.
+        """
+        childResults = out.get("CHILD_RESULTS", dict())
+        for childId, child in model.childAlgorithms().items():
+            record = childRecords.get(childId)
+            if record is None:
+                continue
+            staticValues = [
+                source.staticValue() \
+                    for sources in child.parameterSources().values() \
+                        for source in sources \
+                            if source.source() == QgsProcessingModelChildParameterSource.StaticValue
+            ]
+            record["featuresIn"] = self._sumFeatureCounts(staticValues, context)
+            results = childResults.get(childId, dict())
+            record["featuresOut"] = self._sumFeatureCounts(
+                results.values() if isinstance(results, dict) else [], context)
+
+    def _sumFeatureCounts(self, values, context):
+        counts = [
+            ProcessingProfiler.featureCount(v, context) for v in values \
+                if isinstance(v, (str, QgsMapLayer, QgsProcessingFeatureSourceDefinition))
+        ]
+        counts = [c for c in counts if c is not None]
+        return sum(counts) if counts else None
+
+    def profile(self):
+        """
+        Profiling records of model's last run: the model itself, each of its
+        child algorithms and each AlgRunner call made by them.
+        :return: (list-of-dict) profiling records.
+        """
+        return self.output.get("profile", [])
 
     def export(self, filepath):
         """
@@ -432,12 +608,25 @@ class DsgToolsProcessingModel(QgsTask):
         :return: (bool) task success status.
         """
         start = time()
+        cache = ModelResultCache.instance()
+        fingerprint = self._fingerprint
+        cachedResult = cache.get(self.name(), fingerprint)
+        if cachedResult is not None:
+            self.output = {
+                "result" : cachedResult,
+                "status" : True,
+                "errorMessage" : "",
+                "fromCache" : True,
+                "executionTime" : time() - start
+            }
+            return True
         try:
             if not self.feedback.isCanceled() or not self.isCanceled():
                 self.output = {
                     "result": dict(),
                     "status" : True,
-                    "errorMessage" : ""
+                    "errorMessage" : "",
+                    "fromCache" : False
                 }
                 for paramName, vl in self.runModel(self.feedback).items():
                     baseName = paramName.rsplit(":", 1)[-1]
@@ -455,9 +644,13 @@ class DsgToolsProcessingModel(QgsTask):
                 "result" : {},
                 "status" : False,
                 "errorMessage" : self.tr("Model has failed:\n'{error}'")\
-                                 .format(error=str(e))
+                                 .format(error=str(e)),
+                "fromCache" : False
             }
         self.output["executionTime"] = time() - start
+        self.output["profile"] = self.profiler.asList()
+        if self.output["status"] and not self.isCanceled():
+            cache.put(self.name(), fingerprint, self.output["result"])
         return self.output["status"]
     
     def hasFlags(self):
@@ -476,6 +669,11 @@ class DsgToolsProcessingModel(QgsTask):
         always called right after run is finished (read the docs on QgsTask).
         :param result: (bool) run returned valued.
         """
+        if result and self.output.get("fromCache") and self.loadOutput():
+            # cached output layers were removed from layer panel (or they are
+            # not there yet) and they must be shown as if model was run
+            self.addOutputToGroup(
+                self.output["result"].values(), self.model().displayName())
         if result and self.onFlagsRaised() == 'halt' and self.hasFlags():
             self.cancel()
             self.feedback.cancel()
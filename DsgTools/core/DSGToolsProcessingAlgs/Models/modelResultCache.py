@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from qgis.core import QgsMapLayer, QgsProject, QgsVectorLayer
+from qgis.PyQt import sip
+from qgis.PyQt.QtCore import QObject
+
+
+class ModelResultCache(QObject):
+    """
+    Keeps the output of the last successful run of each Quality Assurance
+    model along with the fingerprint of its inputs: model's source and
+    parameters and, for each of its layers, an edition counter, its feature
+    count, its extent, its latest update timestamp (if available) and, for
+    models that only handle selected features, its selection. A model whose
+    fingerprint matches the cached one does not need to be run again. Only the
+    most recently used entries are kept and entries are dropped as soon as any
+    of their output layers is removed from the project.
+    """
+    # fields that store a feature's last modification timestamp
+    TIMESTAMP_FIELDS = ["updated_at"]
+    # maximum number of cached model outputs
+    MAX_ENTRIES = 32
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self, parent=None):
+        """
+        Class constructor.
+        :param parent: (QObject) parent object.
+        """
+        super(ModelResultCache, self).__init__(parent)
+        self._entries = OrderedDict()
+        self._counters = dict()
+        self._lock = threading.Lock()
+        QgsProject.instance().layersWillBeRemoved.connect(self.releaseLayers)
+
+    @classmethod
+    def instance(cls):
+        """
+        Gets the cache shared by DSGTools' Quality Assurance workflows.
+        :return: (ModelResultCache) shared cache.
+        """
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def watchLayer(self, layer):
+        """
+        Connects the edition signals from a layer to its edition counter.
+        :param layer: (QgsVectorLayer) layer to be watched.
+        """
+        layerId = layer.id()
+        with self._lock:
+            if layerId in self._counters:
+                return
+            self._counters[layerId] = 0
+        increase = lambda *args: self._increaseCounter(layerId)
+        for signal in (
+            layer.featureAdded,
+            layer.featuresDeleted,
+            layer.geometryChanged,
+            layer.attributeValueChanged,
+            layer.dataChanged,
+            layer.afterCommitChanges
+        ):
+            signal.connect(increase)
+        layer.willBeDeleted.connect(lambda: self._counters.pop(layerId, None))
+
+    def _increaseCounter(self, layerId):
+        with self._lock:
+            if layerId in self._counters:
+                self._counters[layerId] += 1
+
+    def findLayer(self, layerName):
+        """
+        Finds a project layer from its ID or name.
+        :param layerName: (str) layer's ID or name.
+        :return: (QgsMapLayer) layer found or None.
+        """
+        project = QgsProject.instance()
+        layer = project.mapLayer(layerName)
+        if layer is not None:
+            return layer
+        layers = project.mapLayersByName(layerName)
+        return layers[0] if len(layers) == 1 else None
+
+    def layerFingerprint(self, layer, useSelection=False):
+        """
+        Gets the data fingerprint of a layer.
+        :param layer: (QgsMapLayer) layer to be fingerprinted.
+        :param useSelection: (bool) whether layer's selection is part of its
+                             fingerprint.
+        :return: (tuple) layer's fingerprint.
+        """
+        if not isinstance(layer, QgsVectorLayer):
+            return (layer.id(), layer.source(), layer.extent().toString())
+        self.watchLayer(layer)
+        lastUpdate = None
+        for fieldName in self.TIMESTAMP_FIELDS:
+            idx = layer.fields().indexFromName(fieldName)
+            if idx >= 0:
+                lastUpdate = str(layer.maximumValue(idx))
+                break
+        selection = None
+        if useSelection:
+            selection = hashlib.sha1(
+                ",".join(map(str, sorted(layer.selectedFeatureIds()))).encode("utf-8")
+            ).hexdigest()
+        return (
+            layer.id(),
+            self._counters.get(layer.id(), 0),
+            layer.featureCount(),
+            layer.extent().toString(),
+            lastUpdate,
+            selection
+        )
+
+    def sourceHash(self, model):
+        """
+        Hashes model's source and parameters.
+        :param model: (DsgToolsProcessingModel) model to be hashed.
+        :return: (str) source hash.
+        """
+        sha = hashlib.sha1(
+            json.dumps(model.asDict(), sort_keys=True, default=str).encode("utf-8")
+        )
+        if model.source() == "file" and os.path.exists(model.data()):
+            with open(model.data(), "rb") as fp:
+                sha.update(fp.read())
+        return sha.hexdigest()
+
+    def fingerprint(self, model):
+        """
+        Gets the fingerprint of a model's inputs. Layers are read and watched,
+        hence it must be called from the main thread.
+        :param model: (DsgToolsProcessingModel) model to be fingerprinted.
+        :return: (tuple) model's fingerprint or None, if any of model's layers
+                 could not be identified (it should not be cached).
+        """
+        layerNames = model.layerNames()
+        if not layerNames:
+            return None
+        useSelection = model.usesSelection()
+        layerFingerprints = []
+        for layerName in sorted(layerNames):
+            layer = self.findLayer(layerName)
+            if layer is None:
+                return None
+            layerFingerprints.append(self.layerFingerprint(layer, useSelection))
+        return (self.sourceHash(model), tuple(layerFingerprints))
+
+    def get(self, modelName, fingerprint):
+        """
+        Retrieves the cached output of a model.
+        :param modelName: (str) model's name.
+        :param fingerprint: (tuple) current fingerprint of model's inputs.
+        :return: (dict) a copy of the cached output layers map or None, if it
+                 is not cached, it is outdated or any of its layers was deleted.
+        """
+        if fingerprint is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(modelName)
+            if entry is not None:
+                self._entries.move_to_end(modelName)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        result = entry[1]
+        for vl in result.values():
+            if isinstance(vl, QgsMapLayer) and sip.isdeleted(vl):
+                self.invalidate(modelName)
+                return None
+        return dict(result)
+
+    def put(self, modelName, fingerprint, result):
+        """
+        Caches the output of a successful model run.
+        :param modelName: (str) model's name.
+        :param fingerprint: (tuple) fingerprint of model's inputs when it was run.
+        :param result: (dict) model's output layers map.
+        """
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._entries.pop(modelName, None)
+            self._entries[modelName] = (fingerprint, dict(result))
+            # least recently used entries are dropped, releasing their layers
+            while len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def releaseLayers(self, layerIds):
+        """
+        Drops the cached outputs that hold any of the layers that are about to
+        be removed from the project, so that they are not kept alive.
+        :param layerIds: (list-of-str) IDs of the layers being removed.
+        """
+        layerIds = set(layerIds)
+        with self._lock:
+            for modelName, (fingerprint, result) in list(self._entries.items()):
+                if any(
+                    isinstance(vl, QgsMapLayer) and not sip.isdeleted(vl) \
+                        and vl.id() in layerIds for vl in result.values()
+                ):
+                    self._entries.pop(modelName)
+
+    def invalidate(self, modelName=None):
+        """
+        Drops the cached output of a model or of every model.
+        :param modelName: (str) model's name. If None, cache is cleared.
+        """
+        with self._lock:
+            if modelName is None:
+                self._entries = OrderedDict()
+            else:
+                self._entries.pop(modelName, None)
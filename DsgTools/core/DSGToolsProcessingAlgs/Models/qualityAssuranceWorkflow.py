@@ -30,6 +30,8 @@ from qgis.core import (QgsApplication,
 from qgis.PyQt.QtCore import QObject, pyqtSignal
 
 from DsgTools.core.DSGToolsProcessingAlgs.Models.dsgToolsProcessingModel import DsgToolsProcessingModel
+from DsgTools.core.Utils.executorService import getWorkerCount
+from DsgTools.core.Utils.processingProfiler import ProcessingProfiler
 
 class QualityAssuranceWorkflow(QObject):
     """
@@ -242,11 +244,51 @@ class QualityAssuranceWorkflow(QObject):
         """
         return dict(self._param)
 
+    def profile(self):
+        """
+        Profiling records of the last run of each model, following the
+        execution order.
+        :return: (list-of-dict) profiling records.
+        """
+        if not hasattr(self, "_executionOrder"):
+            return []
+        records = []
+        for idx in sorted(self._executionOrder):
+            model = self._executionOrder[idx]
+            if model.name() in self.output and "profile" in self.output[model.name()]:
+                records += self.output[model.name()]["profile"]
+        return records
+
+    def exportProfile(self, filepath):
+        """
+        Exports the profiling records of the workflow's last run. Output format
+        is defined by the file extension (.csv or .json).
+        :param filepath: (str) path to output file.
+        :return: (bool) operation success.
+        """
+        records = self.profile()
+        if filepath.lower().endswith(".csv"):
+            ProcessingProfiler.exportCsv(records, filepath)
+        else:
+            ProcessingProfiler.exportJson(records, filepath)
+        return os.path.exists(filepath)
+
     def finished(self):
         """
         Executes all post-processing actions.
         """
         # Add default post-processing actions here!
+        if self._param.get("profileOutput"):
+            # both formats are written next to each other
+            basePath = os.path.splitext(self._param["profileOutput"])[0]
+            for ext in (".json", ".csv"):
+                try:
+                    self.exportProfile(basePath + ext)
+                except OSError:
+                    self.feedback.reportError(
+                        self.tr("Unable to write profiling report to {0}.")\
+                            .format(basePath + ext)
+                    )
         self.workflowFinished.emit()
 
     def runOnMainThread(self):
@@ -275,8 +317,10 @@ class QualityAssuranceWorkflow(QObject):
 
     def setupModelTask(self, model):
         """
-        Sets model to run on QGIS task manager.
+        Sets model to run on QGIS task manager. Model's inputs are
+        fingerprinted right before, on current (main) thread.
         """
+        model.prepareCache()
         QgsApplication.taskManager().addTask(model)
 
     def hold(self):
@@ -299,17 +343,27 @@ class QualityAssuranceWorkflow(QObject):
             if m.status() == m.OnHold:
                 m.unhold()
 
-    def currentModel(self):
+    def runningModels(self):
         """
-        Retrieves the model currently running, if any.
-        :return: (DsgToolsProcessingModel) current active model.
+        Retrieves the models currently running, as models may run concurrently.
+        :return: (list-of-DsgToolsProcessingModel) active models, following
+                 the execution order.
         """
         if not hasattr(self, "_executionOrder"):
-            return None
-        for m in self._executionOrder.values():
-            if m.status() == m.Running:
-                return m
-        return None
+            return []
+        return [
+            m for m in self._executionOrder.values() if m.status() == m.Running
+        ]
+
+    def pendingModels(self):
+        """
+        Retrieves the models of current execution that were not started yet.
+        :return: (list-of-DsgToolsProcessingModel) models waiting to be run,
+                 following the execution order.
+        """
+        if not hasattr(self, "_pendingModels"):
+            return []
+        return [self._pendingModels[idx] for idx in sorted(self._pendingModels)]
 
     def raiseFlagWarning(self, model):
         """
@@ -344,11 +398,69 @@ class QualityAssuranceWorkflow(QObject):
             "ignore" : partial(self.modelFinished.emit, model)
         }[model.onFlagsRaised()]()
 
-    def run(self, firstModelName=None, cooldown=None):
+    def maxConcurrentModels(self):
+        """
+        Maximum number of models to be run simultaneously, if set on workflow's
+        parameters. Defaults to the number of available worker threads.
+        :return: (int) maximum number of concurrent models.
+        """
+        if "maxConcurrentModels" in self._param:
+            return max(1, int(self._param["maxConcurrentModels"]))
+        return getWorkerCount()
+
+    def modelDependencies(self, models):
+        """
+        Maps each model to the models that must be finished before it starts.
+        A model depends on the previous models it declares as a dependency and
+        on the previous models that share any layer with it. Models whose layers
+        could not be identified are run after all previous models and before
+        all the following ones. Models set to halt on flags are run before all
+        the following ones, as their flags may stop the workflow.
+        :param models: (dict) map of execution order to model.
+        :return: (dict) map of execution order to the set of execution orders
+                 it depends on.
+        """
+        nameMap = {model.name(): idx for idx, model in models.items()}
+        layerMap = {idx: model.layerNames() for idx, model in models.items()}
+        dependencies = dict()
+        for idx, model in models.items():
+            dependencies[idx] = {
+                nameMap[name] for name in model.dependsOn() \
+                    if name in nameMap and nameMap[name] < idx
+            }
+            for previousIdx in models:
+                if previousIdx >= idx:
+                    continue
+                if not layerMap[idx] or not layerMap[previousIdx] or \
+                    layerMap[idx] & layerMap[previousIdx] or \
+                    models[previousIdx].onFlagsRaised() == "halt":
+                    dependencies[idx].add(previousIdx)
+        return dependencies
+
+    def scheduleModels(self):
+        """
+        Sends to QGIS task manager every pending model whose dependencies are
+        finished, respecting the concurrency limit.
+        """
+        if self.feedback.isCanceled():
+            return
+        for idx in sorted(self._pendingModels):
+            if len(self._runningModels) >= self._maxConcurrentModels:
+                break
+            if not self._dependencies[idx] <= self._finishedModels:
+                continue
+            model = self._pendingModels.pop(idx)
+            self._runningModels.add(idx)
+            self.setupModelTask(model)
+
+    def run(self, firstModelName=None, cooldown=None, maxConcurrentModels=None):
         """
-        Executes all models in secondary threads.
+        Executes all models in secondary threads. Models are run as soon as the
+        models they depend on are finished (see modelDependencies).
         :param firstModelName: (str) first model's name to be executed.
         :param cooldown: (float) time to wait till next model is started.
+        :param maxConcurrentModels: (int) maximum number of models to be run
+                                    simultaneously.
         """
         self._executionOrder = {
             idx: model for idx, model in enumerate(self.validModels().values())
@@ -356,10 +468,6 @@ class QualityAssuranceWorkflow(QObject):
         modelCount = len(self._executionOrder)
         if self.hasInvalidModel() or modelCount == 0:
             return None
-        def modelCompleted(model, step):
-            self.output[model.name()] = model.output
-            self._multiStepFeedback.setCurrentStep(step)
-            self.handleFlags(model)
         if firstModelName is not None:
             for idx, model in self._executionOrder.items():
                 if model.name() == firstModelName:
@@ -371,30 +479,57 @@ class QualityAssuranceWorkflow(QObject):
         else:
             initialIdx = 0
             self.output = dict()
-        for idx, currentModel in self._executionOrder.items():
-            if idx < initialIdx:
-                continue
+        self._maxConcurrentModels = maxConcurrentModels or self.maxConcurrentModels()
+        self._pendingModels = {
+            idx: model for idx, model in self._executionOrder.items() \
+                if idx >= initialIdx
+        }
+        self._dependencies = self.modelDependencies(self._pendingModels)
+        self._runningModels = set()
+        self._finishedModels = set()
+        self._workflowSettled = False
+        def settle():
+            # workflow is finished once no model is running and no model will
+            # be started (all were run or workflow was canceled/halted)
+            if self._workflowSettled or self._runningModels or \
+                (self._pendingModels and not self.feedback.isCanceled()):
+                return
+            self._workflowSettled = True
+            self.finished()
+        def modelCompleted(model, idx):
+            self.output[model.name()] = model.output
+            self._runningModels.discard(idx)
+            self._finishedModels.add(idx)
+            self._multiStepFeedback.setCurrentStep(
+                initialIdx + len(self._finishedModels)
+            )
+            self.handleFlags(model)
+            self.scheduleModels()
+            settle()
+        def modelTerminated(model, idx):
+            self._runningModels.discard(idx)
+            self._pendingModels.pop(idx, None)
+            self.modelFailed.emit(model)
+            # models that depend on a failed model are not run (canceling a
+            # model that was not started terminates it right away)
+            for dependentIdx in list(self._pendingModels):
+                if idx in self._dependencies[dependentIdx] and \
+                    dependentIdx in self._pendingModels:
+                    self._pendingModels[dependentIdx].cancel()
+            self.scheduleModels()
+            settle()
+        for idx, currentModel in self._pendingModels.items():
             # all models MUST pass through this postprocessing method
             currentModel.taskCompleted.connect(
-                partial(modelCompleted, currentModel, idx + 1)
+                partial(modelCompleted, currentModel, idx)
             )
             currentModel.begun.connect(
                 partial(self.modelStarted.emit, currentModel)
             )
             currentModel.taskTerminated.connect(
-                partial(self.modelFailed.emit, currentModel)
+                partial(modelTerminated, currentModel, idx)
             )
-            if idx != modelCount - 1:
-                self._executionOrder[idx + 1].addSubTask(
-                    currentModel,
-                    subTaskDependency=currentModel.ParentDependsOnSubTask
-                )
-            else:
-                # last model indicates workflow finish
-                currentModel.taskCompleted.connect(self.finished)
-        # last model will trigger every dependent model till the first added to
-        # the task manager
-        self.setupModelTask(currentModel)
+        self.scheduleModels()
 
     def lastModelName(self):
         """
@@ -27,9 +27,34 @@ from qgis.core import (Qgis,
                        QgsProcessingUtils,
                        QgsProcessingFeatureSourceDefinition)
 
+from DsgTools.core.Utils.processingProfiler import ProcessingProfiler
+
 class AlgRunner:
     Break, Snap, RmDangle, ChDangle, RmBridge, ChBridge, RmDupl, RmDac, BPol, Prune, RmArea, RmLine, RMSA = range(13)
 
+    def runProcessing(self, algorithm, parameters, *args, **kwargs):
+        """
+        Runs a processing algorithm (see processing.run). If a profiler is
+        active on current thread, the run is recorded by it.
+        :param algorithm: (str) algorithm's ID.
+        :param parameters: (dict) algorithm's parameters.
+        :return: (dict) algorithm's output.
+        """
+        profiler = ProcessingProfiler.active()
+        if profiler is None:
+            return processing.run(algorithm, parameters, *args, **kwargs)
+        context = kwargs.get("context", args[2] if len(args) > 2 else None)
+        with profiler.measure(
+            ProcessingProfiler.ALG_RUNNER,
+            algorithm,
+            featuresIn=ProcessingProfiler.featureCount(parameters.get("INPUT"), context)
+        ) as record:
+            output = processing.run(algorithm, parameters, *args, **kwargs)
+            if isinstance(output, dict):
+                record["featuresOut"] = ProcessingProfiler.featureCount(
+                    output.get("OUTPUT"), context)
+        return output
+
     def generateGrassOutputAndError(self):
         uuid_value = str(uuid.uuid4()).replace('-','')
         output = QgsProcessingUtils.generateTempFilename('output_{uuid}.shp'.format(uuid=uuid_value))
@@ -52,7 +77,7 @@ class AlgRunner:
             'FIELD': field,
             'OUTPUT': outputLyr
         }
-        output = processing.run('native:dissolve', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('native:dissolve', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runGrassDissolve(self, inputLyr, context, feedback=None, column=None, outputLyr=None, onFinish=None):
@@ -78,7 +103,7 @@ class AlgRunner:
             'input' : inputLyr,
             'output' : outputLyr or QgsProcessingUtils.generateTempFilename('output.shp')
         }
-        output = processing.run('grass7:v.dissolve', parameters, onFinish, feedback, context)
+        output = self.runProcessing('grass7:v.dissolve', parameters, onFinish, feedback, context)
         return self.getGrassReturn(output, context)
 
     def runDonutHoleExtractor(self, inputLyr, context, feedback=None, donuthole=None, outershell=None , selected=False):
@@ -90,7 +115,7 @@ class AlgRunner:
             'OUTERSHELL': outershell,
             'DONUTHOLE' : donuthole
         }
-        output = processing.run('dsgtools:donutholeextractor', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:donutholeextractor', parameters, context=context, feedback=feedback)
         return output['OUTERSHELL'], output['DONUTHOLE']
     
     def runDeleteHoles(self, inputLyr, context, feedback=None, outputLyr=None, min_area=0):
@@ -100,7 +125,7 @@ class AlgRunner:
             'MIN_AREA': min_area,
             'OUTPUT': outputLyr
         }
-        output = processing.run('native:deleteholes', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('native:deleteholes', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runOverlay(self, lyrA, lyrB, context, atype=0, btype=0, feedback=None, snap=0, operator=0, minArea=1e-8):
@@ -121,7 +146,7 @@ class AlgRunner:
             'GRASS_VECTOR_DSCO':'',
             'GRASS_VECTOR_LCO':''
             }
-        outputDict = processing.run('grass7:v.overlay', parameters, context=context, feedback=feedback)
+        outputDict = self.runProcessing('grass7:v.overlay', parameters, context=context, feedback=feedback)
         return self.getGrassReturn(outputDict, context)
     
     def runClean(self, inputLyr, toolList, context, feedback=None, typeList=None, returnError=False, useFollowup=False, snap=None, minArea=None): 
@@ -145,7 +170,7 @@ class AlgRunner:
             'GRASS_VECTOR_LCO':'',
             'GRASS_VECTOR_EXPORT_NOCAT':False
             }
-        outputDict = processing.run('grass7:v.clean', parameters, context=context, feedback=feedback)
+        outputDict = self.runProcessing('grass7:v.clean', parameters, context=context, feedback=feedback)
         return self.getGrassReturn(outputDict, context, returnError=returnError)
     
     def runDsgToolsClean(self, inputLyr, context, feedback=None, onlySelected = False, snap=None, minArea=None, flags=None):
@@ -159,7 +184,7 @@ class AlgRunner:
             'MINAREA': minArea,
             'FLAGS' : flags
         }
-        output = processing.run('dsgtools:cleangeometries', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:cleangeometries', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
 
     def runDouglasSimplification(self, inputLyr, threshold, context,
@@ -214,7 +239,7 @@ class AlgRunner:
             'GRASS_OUTPUT_TYPE_PARAMETER':0,
             'GRASS_VECTOR_DSCO':'',
             'GRASS_VECTOR_LCO':''}
-        outputDict = processing.run("grass7:v.generalize", parameters,
+        outputDict = self.runProcessing("grass7:v.generalize", parameters,
                                     context=context, feedback=feedback)
         return self.getGrassReturn(outputDict, context, returnError=returnError)
 
@@ -225,7 +250,7 @@ class AlgRunner:
             'SELECTED' : onlySelected,
             'FLAGS': flagLyr
         }
-        output = processing.run('dsgtools:identifyduplicatedgeometries', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:identifyduplicatedgeometries', parameters, context=context, feedback=feedback)
         return output['FLAGS']
 
     def runIdentifyDuplicatedFeatures(self, inputLyr, context, onlySelected=False, attributeBlackList=None, excludePrimaryKeys=True, ignoreVirtualFields=True, feedback=None, flagLyr=None):
@@ -239,7 +264,7 @@ class AlgRunner:
             'IGNORE_VIRTUAL_FIELDS' : ignoreVirtualFields,
             'IGNORE_PK_FIELDS' : excludePrimaryKeys
         }
-        output = processing.run('dsgtools:identifyduplicatedfeatures', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:identifyduplicatedfeatures', parameters, context=context, feedback=feedback)
         return output['FLAGS']
 
     def runIdentifySmallLines(self, inputLyr, tol, context, feedback=None, flagLyr=None, onlySelected=False):
@@ -250,7 +275,7 @@ class AlgRunner:
             'SELECTED' : onlySelected,
             'FLAGS': flagLyr
         }
-        output = processing.run('dsgtools:identifysmalllines', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:identifysmalllines', parameters, context=context, feedback=feedback)
         return output['FLAGS']
 
     def runIdentifySmallPolygons(self, inputLyr, tol, context, feedback=None, flagLyr=None, onlySelected=False):
@@ -261,7 +286,7 @@ class AlgRunner:
             'SELECTED' : onlySelected,
             'FLAGS': flagLyr
         }
-        output = processing.run('dsgtools:identifysmallpolygons', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:identifysmallpolygons', parameters, context=context, feedback=feedback)
         return output['FLAGS']
 
     def runSnapGeometriesToLayer(self, inputLayer, referenceLayer, tol, context, feedback=None, behavior=None, outputLyr=None):
@@ -274,7 +299,7 @@ class AlgRunner:
             'BEHAVIOR' : behavior,
             'OUTPUT' : outputLyr
         }
-        output = processing.run('qgis:snapgeometries', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('qgis:snapgeometries', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
 
     def runSnapLayerOnLayer(self, inputLayer, referenceLayer, tol, context, onlySelected=False, feedback=None, behavior=None, buildCache=False):
@@ -287,7 +312,7 @@ class AlgRunner:
             'BEHAVIOR' : behavior,
             'BUILD_CACHE': False,
         }
-        output = processing.run('dsgtools:snaplayeronlayer', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:snaplayeronlayer', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
 
     def runIdentifyDangles(
@@ -309,7 +334,7 @@ class AlgRunner:
             'GEOGRAPHIC_BOUNDARY': geographicBoundsLyr,
             'FLAGS' : flagLyr,
         }
-        output = processing.run('dsgtools:identifydangles', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:identifydangles', parameters, context=context, feedback=feedback)
         return output if returnProcessingDict else output['FLAGS']
     
     def runSnapToGrid(self, inputLayer, tol, context, feedback=None, outputLyr=None):
@@ -322,7 +347,7 @@ class AlgRunner:
             'MSPACING':0,
             'OUTPUT':outputLyr
         }
-        output = processing.run("native:snappointstogrid", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:snappointstogrid", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runRemoveNull(self, inputLayer, context, feedback=None, outputLyr=None):
@@ -331,7 +356,7 @@ class AlgRunner:
             'INPUT':inputLayer,
             'OUTPUT':outputLyr
         }
-        output = processing.run("native:removenullgeometries", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:removenullgeometries", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runClip(self, inputLayer, overlayLayer, context, feedback=None, outputLyr=None):
@@ -341,7 +366,7 @@ class AlgRunner:
             'OVERLAY' : overlayLayer,
             'OUTPUT' : outputLyr
         }
-        output = processing.run("native:clip", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:clip", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runSymDiff(self, inputLayer, overlayLayer, context, feedback=None, outputLyr=None):
@@ -351,7 +376,7 @@ class AlgRunner:
             'OVERLAY' : overlayLayer,
             'OUTPUT' : outputLyr
         }
-        output = processing.run("native:symmetricaldifference", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:symmetricaldifference", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runBoundary(self, inputLayer, context, feedback=None, outputLyr=None):
@@ -360,7 +385,7 @@ class AlgRunner:
             'INPUT' : inputLayer,
             'OUTPUT' : outputLyr
         }
-        output = processing.run("native:boundary", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:boundary", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runMultipartToSingleParts(self, inputLayer, context, feedback=None, outputLyr=None):
@@ -369,7 +394,7 @@ class AlgRunner:
             'INPUT' : inputLayer,
             'OUTPUT' : outputLyr
         }
-        output = processing.run("native:multiparttosingleparts", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:multiparttosingleparts", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
 
     def runBuffer(self, inputLayer, distance, context, dissolve=False, endCapStyle=None, joinStyle=None,\
@@ -389,7 +414,7 @@ class AlgRunner:
             'MITER_LIMIT' : mitterLimit,
             'OUTPUT' : outputLyr
         }
-        output = processing.run("native:buffer", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:buffer", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runIntersection(self, inputLyr, context, inputFields=None, outputLyr=None, overlayLyr=None, overlayFields=None, feedback=None):
@@ -403,7 +428,7 @@ class AlgRunner:
             'OVERLAY' : overlayLyr,
             'OVERLAY_FIELDS' : overlayFields 
             }
-        output = processing.run("native:intersection", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:intersection", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runFilterExpression(self, inputLyr, expression, context, outputLyr=None, feedback=None):
@@ -413,7 +438,7 @@ class AlgRunner:
             'INPUT' : inputLyr,
             'OUTPUT' : outputLyr
             }
-        output = processing.run("native:extractbyexpression", parameters, context=context, feedback=feedback)
+        output = self.runProcessing("native:extractbyexpression", parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runRemoveDuplicatedFeatures(self, inputLyr, context, onlySelected=False, attributeBlackList=None, excludePrimaryKeys=True, ignoreVirtualFields=True, feedback=None, outputLyr=None):
@@ -428,7 +453,7 @@ class AlgRunner:
             'IGNORE_PK_FIELDS' : excludePrimaryKeys,
             'OUTPUT' : outputLyr
         }
-        output = processing.run('dsgtools:removeduplicatedfeatures', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:removeduplicatedfeatures', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runApplStylesFromDatabaseToLayers(self, inputList, context, styleName, feedback=None, outputLyr=None):
@@ -438,7 +463,7 @@ class AlgRunner:
             'STYLE_NAME' : styleName,
             'OUTPUT' : outputLyr
         }
-        output = processing.run('dsgtools:applystylesfromdatabasetolayersalgorithm', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:applystylesfromdatabasetolayersalgorithm', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runMatchAndApplyQmlStylesToLayer(self, inputList, context, qmlFolder, feedback=None, outputLyr=None):
@@ -448,7 +473,7 @@ class AlgRunner:
             'QML_FOLDER' : qmlFolder,
             'OUTPUT' : outputLyr
         }
-        output = processing.run('dsgtools:matchandapplyqmlstylestolayersalgorithm', parameters, context=context, feedback=feedback)
+        output = self.runProcessing('dsgtools:matchandapplyqmlstylestolayersalgorithm', parameters, context=context, feedback=feedback)
         return output['OUTPUT']
     
     def runAddAutoIncrementalField(self, inputLyr, context, feedback=None, outputLyr=None, fieldName=None, start=1, sortAscending=True, sortNullsFirst=False):
@@ -464,7 +489,7 @@ class AlgRunner:
             'SORT_NULLS_FIRST': sortNullsFirst,
             'OUTPUT': outputLyr,
         }
-        output = processing.run(
+        output = self.runProcessing(
             'native:addautoincrementalfield',
             parameters,
             context=context,
@@ -478,7 +503,7 @@ class AlgRunner:
             'INPUT':inputLyr,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             'native:polygonstolines' if Qgis.QGIS_VERSION_INT >= 30600 \
                 else 'qgis:polygonstolines',
             parameters,
@@ -493,7 +518,7 @@ class AlgRunner:
             'INPUT' : inputLyr,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             'native:extractvertices',
             parameters,
             context=context,
@@ -507,7 +532,7 @@ class AlgRunner:
             'INPUT' : inputLyr,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             'native:explodelines',
             parameters,
             context=context,
@@ -522,7 +547,7 @@ class AlgRunner:
             'CRS' : crs,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             'native:mergevectorlayers',
             parameters,
             context=context,
@@ -536,7 +561,7 @@ class AlgRunner:
             'LAYERS' : inputLyr,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "native:saveselectedfeatures",
             parameters,
             context=context,
@@ -556,7 +581,7 @@ class AlgRunner:
         :param feedback: (QgsFeedback) QGIS progress tracking component.
         :return: (QgsVectorLayer) reprojected layer.
         """
-        return processing.run(
+        return self.runProcessing(
             "native:reprojectlayer",
             {
                 'INPUT' : layer,
@@ -574,7 +599,7 @@ class AlgRunner:
             'ALL_PARTS' : allParts,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "native:pointonsurface",
             parameters,
             context=context,
@@ -590,7 +615,7 @@ class AlgRunner:
             'FLAGS' : 'memory:',
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "dsgtools:removeduplicatedgeometries",
             parameters,
             context=context,
@@ -605,7 +630,7 @@ class AlgRunner:
             'KEEP_FIELDS' : keepFields,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "qgis:polygonize",
             parameters,
             context=context,
@@ -629,7 +654,7 @@ class AlgRunner:
             'PREFIX' : '',
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "qgis:joinattributesbylocation",
             parameters,
             context=context,
@@ -646,7 +671,7 @@ class AlgRunner:
             'INTERSECT_FIELDS' : [],
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "native:lineintersections",
             parameters,
             context=context,
@@ -665,7 +690,7 @@ class AlgRunner:
             'LINES' : usedLines,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "native:splitwithlines",
             parameters,
             context=context,
@@ -684,7 +709,7 @@ class AlgRunner:
             'AGGREGATES' : aggregates,
             'OUTPUT' : outputLyr
         }
-        output = processing.run(
+        output = self.runProcessing(
             "qgis:aggregate",
             parameters,
             context=context,
@@ -697,7 +722,7 @@ class AlgRunner:
             'INPUT': inputLyr,
             'SELECTED': onlySelected
         }
-        output = processing.run(
+        output = self.runProcessing(
             "dsgtools:deaggregategeometries",
             parameters,
             context=context,
@@ -706,7 +731,7 @@ class AlgRunner:
         return output
 
     def runCreateSpatialIndex(self, inputLyr, context, feedback=None):
-        processing.run(
+        self.runProcessing(
             "native:createspatialindex",
             {'INPUT':inputLyr},
             feedback=feedback,
@@ -717,7 +742,7 @@ class AlgRunner:
     def runExtractByLocation(self, inputLyr, intersectLyr, context, predicate=None, feedback=None, outputLyr=None):
         predicate = [0] if predicate is None else predicate
         outputLyr = 'memory:' if outputLyr is None else outputLyr
-        output = processing.run(
+        output = self.runProcessing(
             "native:extractbylocation",
             {
                 'INPUT': inputLyr,
@@ -732,7 +757,7 @@ class AlgRunner:
 
     def runCreateFieldWithExpression(self, inputLyr, expression, fieldName, context, fieldType=0, fieldLength=1000, fieldPrecision=0, feedback=None, outputLyr=None):
         outputLyr = 'memory:' if outputLyr is None else outputLyr
-        output = processing.run(
+        output = self.runProcessing(
             "native:fieldcalculator",
             {
                 'INPUT': inputLyr,
@@ -748,7 +773,7 @@ class AlgRunner:
         return output['OUTPUT']
 
     def runStringCsvToLayerList(self, stringCSV, context, feedback=None):
-        output = processing.run(
+        output = self.runProcessing(
             "dsgtools:stringcsvtolayerlistalgorithm",
             {
                 'INPUTLAYERS': stringCSV,
@@ -761,7 +786,7 @@ class AlgRunner:
 
     def runClipRasterLayer(self, inputRaster, mask, context, feedback=None, outputRaster=None):
         outputRaster = 'TEMPORARY_OUTPUT' if outputRaster is None else outputRaster
-        output = processing.run(
+        output = self.runProcessing(
             "gdal:cliprasterbymasklayer",
             {
                 'INPUT': inputRaster,
@@ -789,7 +814,7 @@ class AlgRunner:
 
     def runGrassMapCalcSimple(self, inputA, expression, context, feedback=None, inputB=None, inputC=None, inputD=None, inputE=None, inputF=None, outputRaster=None):
         outputRaster = 'TEMPORARY_OUTPUT' if outputRaster is None else outputRaster
-        output = processing.run(
+        output = self.runProcessing(
             "grass7:r.mapcalc.simple",
             {
                 'a': inputA,
@@ -812,7 +837,7 @@ class AlgRunner:
 
     def runGrassReclass(self, inputRaster, expression, context, feedback=None, outputRaster=None):
         outputRaster = 'TEMPORARY_OUTPUT' if outputRaster is None else outputRaster
-        output = processing.run(
+        output = self.runProcessing(
             "grass7:r.reclass",
             {
                 'input': inputRaster,
@@ -831,7 +856,7 @@ class AlgRunner:
 
     def runSieve(self, inputRaster, threshold, context, eightConectedness=False, feedback=None, outputRaster=None):
         outputRaster = 'TEMPORARY_OUTPUT' if outputRaster is None else outputRaster
-        output = processing.run(
+        output = self.runProcessing(
             "gdal:sieve",
             {
                 'INPUT': inputRaster,
@@ -900,14 +925,14 @@ class AlgRunner:
             'GRASS_OUTPUT_TYPE_PARAMETER':0,
             'GRASS_VECTOR_DSCO':'',
             'GRASS_VECTOR_LCO':''}
-        outputDict = processing.run("grass7:v.generalize", parameters,
+        outputDict = self.runProcessing("grass7:v.generalize", parameters,
                                     context=context, feedback=feedback)
         return self.getGrassReturn(outputDict, context, returnError=returnError)
 
     def runGdalPolygonize(self, inputRaster, context, band=1, field=None, eightConectedness=False, feedback=None, outputLyr=None):
         outputLyr = 'TEMPORARY_OUTPUT' if outputLyr is None else outputLyr
         field = 'DN' if field is None else field
-        output = processing.run(
+        output = self.runProcessing(
             "gdal:polygonize",
             {
                 'INPUT': inputRaster,
@@ -924,7 +949,7 @@ class AlgRunner:
     
     def runExtractSpecificVertices(self, inputLyr, vertices, context, feedback=None, outputLyr=None):
         outputLyr = 'TEMPORARY_OUTPUT' if outputLyr is None else outputLyr
-        output = processing.run(
+        output = self.runProcessing(
             "native:extractspecificvertices",
             {
                 'INPUT': inputLyr,
@@ -938,7 +963,7 @@ class AlgRunner:
     
     def runCreateGrid(self, extent, crs, hSpacing, vSpacing, context, type=2, feedback=None, outputLyr=None, hOverlay=0, vOverlay=0):
         outputLyr = 'memory:' if outputLyr is None else outputLyr
-        output = processing.run(
+        output = self.runProcessing(
             "native:creategrid",
             {
                 'TYPE': type,
@@ -22,11 +22,17 @@
 """
 import os, collections
 import time
+import json
+import hashlib
+import threading
+import concurrent.futures
+from contextlib import nullcontext
 
-from qgis.PyQt.QtCore import QObject, pyqtSignal, QSettings
+from qgis.PyQt.QtCore import QObject, pyqtSignal, QSettings, Qt
 from qgis.core import QgsFeatureRequest, QgsProject, QgsProcessingContext, \
                       QgsProcessingMultiStepFeedback, QgsProcessingMultiStepFeedback, \
-                      QgsTask, QgsProcessingFeedback
+                      QgsTask, QgsProcessingFeedback, QgsVectorLayer, \
+                      QgsVectorLayerFeatureSource
 
 from DsgTools.core.dsgEnums import DsgEnums
 from DsgTools.core.Factories.DbFactory.dbFactory import DbFactory
@@ -34,6 +40,7 @@ from DsgTools.core.Factories.LayerLoaderFactory.layerLoaderFactory import LayerL
 from DsgTools.core.GeometricTools.layerHandler import LayerHandler
 from DsgTools.core.GeometricTools.featureHandler import FeatureHandler
 from DsgTools.core.Factories.DbCreatorFactory.dbCreatorFactory import DbCreatorFactory
+from DsgTools.core.Utils.executorService import getWorkerCount
 
 class DbConverter(QgsTask):
     conversionUpdated = pyqtSignal(str)
@@ -49,16 +56,35 @@ class DbConverter(QgsTask):
         3.b- apply feature map to destination - feature level; and
     4- each successfully filtered and mapped layer will be then sent to be perpetuated to output - layer level.
     """
-    def __init__(self, iface, conversionMap=None, description='', flags=QgsTask.CanCancel):
+    # number of converted features written and committed at once
+    DEFAULT_BATCH_SIZE = 5000
+    # settings group in which conversion checkpoints are persisted
+    CHECKPOINT_SETTINGS_GROUP = "DSGTools/DbConverter/checkpoints"
+
+    def __init__(self, iface, conversionMap=None, description='', flags=QgsTask.CanCancel, batchSize=None, maxWorkers=None):
         """
         Class constructor.
         :param iface: (QgsInterface) QGIS interface object (for runtime operations).
         :param conversionMap: (dict) conversion map generated by Datasource Conversion tool.
+        :param batchSize: (int) maximum number of features converted and committed
+                          to an output layer at once.
+        :param maxWorkers: (int) maximum number of layers converted simultaneously.
+                           Defaults to the plugin's worker count setting.
         """
         super(DbConverter, self).__init__(description, flags)
         self.iface = iface
         self.conversionMap = conversionMap
+        self.batchSize = batchSize or self.DEFAULT_BATCH_SIZE
+        self.maxWorkers = maxWorkers or getWorkerCount()
+        # each worker thread holds its own connection to the output layers
+        self._workerLayers = {}
+        self._workerLayersLock = threading.Lock()
+        self._writeLocks = {}
+        self._writeLocksLock = threading.Lock()
         self.coordinateTransformers = {}
+        self._checkpointLock = threading.Lock()
+        # feedbacks of the running layer conversion jobs (see streamToOutput)
+        self._jobFeedbacks = []
         self.output = {
             'creationErrors' : {},
             'successfulLayers' : {},
@@ -70,6 +96,14 @@ class DbConverter(QgsTask):
         self.feedback.progressChanged.connect(self.setProgress)
         self.feedback.canceled.connect(self.cancel)
 
+    def cancel(self):
+        """
+        Cancels the task, stopping the layer conversions running on workers.
+        """
+        super(DbConverter, self).cancel()
+        for jobFeedback in list(self._jobFeedbacks):
+            jobFeedback.cancel()
+
     def getConversionCount(self, conversionMap=None):
         """
         Gets how many conversion procedures are required.
@@ -240,7 +274,7 @@ class DbConverter(QgsTask):
         abstractDb = DbFactory().createDbFactory(driver=DsgEnums.DriverPostGIS)
         # ignore all info except for the password
         password = self.userPasswordFromHost(hostname=host, username=user)
-        return abstractDb if abstractDb.testCredentials(host, port, db, user, password) else None
+        return abstractDb if abstractDb.connectDatabaseFromPool(host, port, db, user, password) else None
 
     def connectToSpatialite(self, parameters):
         """
@@ -551,6 +585,369 @@ class DbConverter(QgsTask):
                 feedback.setProgress(current * stepSize)
         return success, fail
 
+    def checkpointKey(self, inputDb, outputDb, conversionStep, stepConversionMap, layer):
+        """
+        Gets the key used to store the conversion progress of a layer. Besides
+        the datasources and the layer, it identifies the conversion step and
+        its filters, as they define which features are converted.
+        :param inputDb: (str) input datasource.
+        :param outputDb: (str) output datasource.
+        :param conversionStep: (int) index of the conversion step for the input datasource.
+        :param stepConversionMap: (dict) conversion map for the conversion step.
+        :param layer: (str) layer name.
+        :return: (str) checkpoint key.
+        """
+        stepFilter = json.dumps(
+            stepConversionMap.get("filter", {}), sort_keys=True, default=str)
+        key = json.dumps(
+            [inputDb, outputDb, conversionStep, stepFilter, layer], default=str)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def getCheckpoint(self, checkpointKey):
+        """
+        Gets the ID of the last input feature whose conversion was committed.
+        Checkpoints are persisted on user settings, so that an interrupted
+        conversion may be resumed on a later session.
+        :param checkpointKey: (str) key of the layer conversion (see checkpointKey).
+        :return: (int) feature ID or None, if there is no checkpoint.
+        """
+        if checkpointKey is None:
+            return None
+        with self._checkpointLock:
+            value = QSettings().value(
+                "{0}/{1}".format(self.CHECKPOINT_SETTINGS_GROUP, checkpointKey))
+        return int(value) if value is not None else None
+
+    def setCheckpoint(self, checkpointKey, featId):
+        """
+        Persists the ID of the last input feature whose conversion was committed.
+        :param checkpointKey: (str) key of the layer conversion (see checkpointKey).
+        :param featId: (int) feature ID.
+        """
+        if checkpointKey is None:
+            return
+        with self._checkpointLock:
+            settings = QSettings()
+            settings.setValue(
+                "{0}/{1}".format(self.CHECKPOINT_SETTINGS_GROUP, checkpointKey), featId)
+            settings.sync()
+
+    def clearCheckpoint(self, checkpointKey):
+        """
+        Removes the checkpoint of a completed layer conversion.
+        :param checkpointKey: (str) key of the layer conversion (see checkpointKey).
+        """
+        if checkpointKey is None:
+            return
+        with self._checkpointLock:
+            settings = QSettings()
+            settings.remove(
+                "{0}/{1}".format(self.CHECKPOINT_SETTINGS_GROUP, checkpointKey))
+            settings.sync()
+
+    def commitBatch(self, vl, featureList, flexibleConversion):
+        """
+        Writes and commits a batch of converted features to an output layer.
+        :param vl: (QgsVectorLayer) output layer.
+        :param featureList: (list-of-QgsFeature) converted features to be added.
+        :param flexibleConversion: (bool) whether defective features should be
+                                   isolated and ignored instead of failing the batch.
+        :return: (tuple) number of features added and commit error (empty if
+                 batch was successfully commited).
+        """
+        with self.writeLock(vl):
+            return self._commitBatch(vl, featureList, flexibleConversion)
+
+    def _commitBatch(self, vl, featureList, flexibleConversion):
+        vl.startEditing()
+        count = 0
+        if vl.addFeatures(featureList):
+            count = len(featureList)
+        elif flexibleConversion:
+            # only defective features from current batch are ignored
+            vl.rollBack()
+            vl.startEditing()
+            for feature in featureList:
+                count += vl.addFeature(feature)
+        vl.updateExtents()
+        if vl.commitChanges():
+            return count, ""
+        error = vl.commitErrors()[0] if vl.commitErrors() else ""
+        vl.rollBack()
+        if not flexibleConversion:
+            return 0, error
+        # the datasource refused the batch: features are committed one at a
+        # time, so that only the defective ones are left out
+        count = 0
+        for feature in featureList:
+            vl.startEditing()
+            if vl.addFeature(feature) and vl.commitChanges():
+                count += 1
+            else:
+                vl.rollBack()
+        return count, ""
+
+    def getCoordinateTransformer(self, vl, outputLayer):
+        """
+        Gets the (cached) coordinate transformer from an input layer's CRS to
+        an output layer's CRS.
+        :param vl: (QgsVectorLayer) input layer.
+        :param outputLayer: (QgsVectorLayer) output layer.
+        :return: (QgsCoordinateTransform) coordinate transformer.
+        """
+        k = "{0}->{1}".format(vl.crs().authid(), outputLayer.crs().authid())
+        if k not in self.coordinateTransformers:
+            self.coordinateTransformers[k] = LayerHandler().getCoordinateTransformer(
+                inputLyr=vl, outputLyr=outputLayer)
+        return self.coordinateTransformers[k]
+
+    def streamLayer(self, source, outputLayer, conversionMode, coordinateTransformer,
+                    parameterDict, featureCount=0, checkpointKey=None, batchSize=None,
+                    feedback=None):
+        """
+        Converts and loads features from an input layer to an output layer in
+        bounded batches, committing each batch. At most one batch of converted
+        features is held in memory. Features are read ordered by their ID and
+        the ID of the last feature of each committed batch is checkpointed, so
+        that an interrupted conversion is resumed after it. Input layer is only
+        read through its feature source, hence this method may run on a worker
+        thread.
+        :param source: (QgsVectorLayerFeatureSource) prepared input layer's
+                       feature source, created on the thread owning the layer.
+        :param outputLayer: (QgsVectorLayer) output layer.
+        :param conversionMode: (int) current step conversion mode.
+        :param coordinateTransformer: (QgsCoordinateTransform) transformer from
+                                      input layer's CRS to output layer's CRS.
+        :param parameterDict: (dict) input layer's destination parameters (see
+                              LayerHandler.getDestinationParameters).
+        :param featureCount: (int) input layer's feature count.
+        :param checkpointKey: (str) key used to store the conversion progress.
+                              Must be None for filtered layers, as their IDs
+                              are not stable across runs.
+        :param batchSize: (int) maximum number of features on each batch.
+        :param feedback: (QgsFeedback) QGIS tool for progress tracking.
+        :return: (tuple) number of features added and error message (empty if
+                 every batch was commited).
+        """
+        fh = FeatureHandler()
+        batchSize = batchSize or self.batchSize
+        flexibleConversion = conversionMode == DsgEnums.FlexibleConversion
+        request = QgsFeatureRequest().addOrderBy("$id")
+        lastCommitted = self.getCheckpoint(checkpointKey)
+        if lastCommitted is not None:
+            # already converted on a previous (interrupted) run
+            request.setFilterExpression("$id > {0}".format(lastCommitted))
+        stepSize = 100 / featureCount if featureCount else 0
+        count, batch, lastId = 0, set(), None
+        for current, feature in enumerate(source.getFeatures(request)):
+            if feedback is not None and feedback.isCanceled():
+                return count, ""
+            batch |= fh.handleConvertedFeature(
+                feat=feature,
+                lyr=outputLayer,
+                parameterDict=parameterDict,
+                coordinateTransformer=coordinateTransformer
+            )
+            lastId = feature.id()
+            if len(batch) < batchSize:
+                continue
+            added, error = self.commitBatch(outputLayer, list(batch), flexibleConversion)
+            if error:
+                return count, error
+            count += added
+            self.setCheckpoint(checkpointKey, lastId)
+            batch = set()
+            if feedback is not None:
+                feedback.setProgress(current * stepSize)
+        if batch:
+            added, error = self.commitBatch(outputLayer, list(batch), flexibleConversion)
+            if error:
+                return count, error
+            count += added
+        if lastId is not None:
+            self.setCheckpoint(checkpointKey, lastId)
+        return count, ""
+
+    def convertFeatures(self, source, outputLayer, coordinateTransformer, parameterDict, feedback=None):
+        """
+        Converts the features from an input layer without writing them. Used
+        for memory outputs, which can't be reopened by workers and must only be
+        edited by the thread owning them.
+        :param source: (QgsVectorLayerFeatureSource) prepared input layer's
+                       feature source, created on the thread owning the layer.
+        :param outputLayer: (QgsVectorLayer) output layer.
+        :param coordinateTransformer: (QgsCoordinateTransform) transformer from
+                                      input layer's CRS to output layer's CRS.
+        :param parameterDict: (dict) input layer's destination parameters (see
+                              LayerHandler.getDestinationParameters).
+        :param feedback: (QgsFeedback) QGIS tool for progress tracking.
+        :return: (list-of-QgsFeature) converted features.
+        """
+        fh = FeatureHandler()
+        featureSet = set()
+        for feature in source.getFeatures():
+            if feedback is not None and feedback.isCanceled():
+                break
+            featureSet |= fh.handleConvertedFeature(
+                feat=feature,
+                lyr=outputLayer,
+                parameterDict=parameterDict,
+                coordinateTransformer=coordinateTransformer
+            )
+        return list(featureSet)
+
+    def workerLayer(self, vl):
+        """
+        Gets the instance of an output layer owned by current thread. Each worker
+        opens its own connection to the output datasource, as layers must not
+        be edited from more than one thread at once. Memory layers can't be
+        reopened and are never handed to workers (see convertFeatures).
+        :param vl: (QgsVectorLayer) output layer.
+        :return: (QgsVectorLayer) a layer for the same datasource as vl.
+        """
+        key = (threading.get_ident(), vl.providerType(), vl.source())
+        with self._workerLayersLock:
+            if key not in self._workerLayers:
+                self._workerLayers[key] = QgsVectorLayer(
+                    vl.source(), vl.name(), vl.providerType())
+            return self._workerLayers[key]
+
+    def releaseWorkerLayers(self):
+        """
+        Deletes the output layers opened by worker threads (see workerLayer),
+        closing their connections. Must only be called once workers are done.
+        """
+        with self._workerLayersLock:
+            self._workerLayers.clear()
+
+    def writeLock(self, vl):
+        """
+        Gets the lock that serializes the commits to the datasource of a layer.
+        File based datasources (e.g. GeoPackage and SpatiaLite) accept a single
+        writer at a time, while PostGIS and memory layers (only written by the
+        thread owning them) do not need a lock.
+        :param vl: (QgsVectorLayer) output layer.
+        :return: a context manager to be held while writing to vl.
+        """
+        if vl.providerType() in ("ogr", "spatialite"):
+            path = vl.source().split("|")[0]
+        else:
+            return nullcontext()
+        with self._writeLocksLock:
+            if path not in self._writeLocks:
+                self._writeLocks[path] = threading.Lock()
+            return self._writeLocks[path]
+
+    def streamToOutput(self, inputPreparedLayers, outputLayers, conversionMode, checkpointKeys=None, feedback=None):
+        """
+        Converts and loads features from a given set of layers to a different set
+        of layers in bounded batches (see streamLayer). Each layer is converted
+        by a separate job on a pool of workers. Memory outputs are converted by
+        workers, but written on current thread, which owns them.
+        :param inputPreparedLayers: (dict) map of layers to be translated.
+        :param outputLayers: (dict) map of layers to be filled.
+        :param conversionMode: (int) current step conversion mode.
+        :param checkpointKeys: (dict) map of layers to the key used to store their
+                               conversion progress (see checkpointKey).
+        :param feedback: (QgsProcessingMultiStepFeedback) QGIS tool for progress tracking.
+        :return: (tuple-of-dict) successful features addition and failed ones.
+        """
+        success = dict()
+        fail = dict()
+        layers = [l for l, vl in inputPreparedLayers.items() if l in outputLayers and vl.featureCount() > 0]
+        if not layers:
+            return success, fail
+        multiStepFeedback = QgsProcessingMultiStepFeedback(len(layers), feedback) \
+                                if feedback is not None else None
+        lh = LayerHandler()
+        # everything read from input layers is prepared on current thread, as
+        # workers may only read their feature sources
+        jobs = {
+            layer: {
+                'source': QgsVectorLayerFeatureSource(inputPreparedLayers[layer]),
+                'coordinateTransformer': self.getCoordinateTransformer(
+                    inputPreparedLayers[layer], outputLayers[layer]),
+                'parameterDict': lh.getDestinationParameters(inputPreparedLayers[layer]),
+                'featureCount': inputPreparedLayers[layer].featureCount(),
+                'checkpointKey': checkpointKeys.get(layer) if checkpointKeys is not None else None
+            } for layer in layers
+        }
+        memoryLayers = {l for l in layers if outputLayers[l].providerType() == "memory"}
+
+        def convertLayer(layer, jobFeedback):
+            if layer in memoryLayers:
+                return self.convertFeatures(
+                    source=jobs[layer]['source'],
+                    outputLayer=outputLayers[layer],
+                    coordinateTransformer=jobs[layer]['coordinateTransformer'],
+                    parameterDict=jobs[layer]['parameterDict'],
+                    feedback=jobFeedback
+                )
+            return self.streamLayer(
+                outputLayer=self.workerLayer(outputLayers[layer]),
+                conversionMode=conversionMode,
+                feedback=jobFeedback,
+                **jobs[layer]
+            )
+
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(self.maxWorkers, len(layers)))
+        )
+        futures, jobFeedbacks = dict(), list()
+        self._jobFeedbacks = jobFeedbacks
+        try:
+            for layer in layers:
+                if (feedback is not None and feedback.isCanceled()) or self.isCanceled():
+                    break
+                jobFeedback = QgsProcessingFeedback()
+                if feedback is not None:
+                    # job feedbacks live on this thread, which has no event loop
+                    feedback.canceled.connect(jobFeedback.cancel, Qt.DirectConnection)
+                jobFeedbacks.append(jobFeedback)
+                futures[pool.submit(convertLayer, layer, jobFeedback)] = layer
+            for current, future in enumerate(concurrent.futures.as_completed(futures)):
+                if (feedback is not None and feedback.isCanceled()) or self.isCanceled():
+                    break
+                layer = futures[future]
+                vl = outputLayers[layer]
+                try:
+                    if layer in memoryLayers:
+                        count, error = self.commitBatch(
+                            vl, future.result(), conversionMode == DsgEnums.FlexibleConversion)
+                    else:
+                        count, error = future.result()
+                except Exception as e:
+                    # a failed layer does not stop the conversion of the others
+                    count, error = 0, str(e)
+                if error:
+                    self.conversionUpdated.emit(self.tr("{0} failed to be loaded.").format(vl.name()))
+                    fail[layer] = error
+                else:
+                    self.conversionUpdated.emit(self.tr("{0} successfully loaded.").format(vl.name()))
+                    success[layer] = count
+                if multiStepFeedback is not None:
+                    multiStepFeedback.setCurrentStep(current + 1)
+        finally:
+            # running jobs are stopped (on cancelation or on an unexpected
+            # error) and the ones not yet started are dropped
+            if len(success) + len(fail) < len(futures):
+                for jobFeedback in jobFeedbacks:
+                    jobFeedback.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+            if feedback is not None:
+                for jobFeedback in jobFeedbacks:
+                    feedback.canceled.disconnect(jobFeedback.cancel)
+            self._jobFeedbacks = []
+            self.releaseWorkerLayers()
+        # output layers read on the main thread must reflect workers' commits
+        for layer in success:
+            outputLayers[layer].dataProvider().reloadData()
+            outputLayers[layer].updateExtents()
+        # keeps the layers order, regardless of the order jobs were finished
+        success = {l: success[l] for l in layers if l in success}
+        fail = {l: fail[l] for l in layers if l in fail}
+        return success, fail
+
     def getLogHeader(self):
         """
         Gets log header. Used to initiate log.
@@ -632,7 +1029,7 @@ class DbConverter(QgsTask):
         allOutputLayers = dict()
         errors = dict()
         successfulLayers, failedLayers = None, None
-        nSteps = len(self.getAllUniqueInputDb()) + len(self.getAllUniqueOutputDb()) * 4
+        nSteps = len(self.getAllUniqueInputDb()) + len(self.getAllUniqueOutputDb()) * 3
         multiStepFeedback = QgsProcessingMultiStepFeedback(nSteps, feedback)
         # start log
         conversionSummary = self.getLogHeader()
@@ -679,18 +1076,28 @@ class DbConverter(QgsTask):
                 currentStep += 1
                 preparedLayers = self.prepareInputLayers(inputLayers, conversionStepMap, feedback=multiStepFeedback)
 
-                self.conversionUpdated.emit(self.tr("Mapping features..."))
-                multiStepFeedback.setCurrentStep(currentStep)
-                currentStep += 1
-                mappedFeatures = self.mapFeatures(preparedLayers, outputLayers, feedback=multiStepFeedback)
-
                 self.conversionUpdated.emit(self.tr("Loading layers to {0}...").format(outputDb))
                 multiStepFeedback.setCurrentStep(currentStep)
                 currentStep += 1
-                successfulLayers, failedLayers = self.loadToOuput(
-                                                    mappedFeatures, outputLayers, conversionStepMap["conversionMode"],\
-                                                    feedback=multiStepFeedback
+                # filtered layers are temporary outputs whose feature IDs are
+                # not stable across runs, hence they can't be resumed
+                checkpointKeys = {
+                    layer: self.checkpointKey(inputDb, outputDb, currentOutput, conversionStepMap, layer) \
+                        if vl is inputLayers.get(layer) else None for layer, vl in preparedLayers.items()
+                }
+                filteredLayers = [layer for layer, key in checkpointKeys.items() if key is None]
+                if filteredLayers:
+                    self.conversionUpdated.emit(
+                        self.tr("Resuming is disabled for filtered layers: {0}.\n").format(
+                            ", ".join(filteredLayers)))
+                successfulLayers, failedLayers = self.streamToOutput(
+                                                    preparedLayers, outputLayers, conversionStepMap["conversionMode"],\
+                                                    checkpointKeys=checkpointKeys, feedback=multiStepFeedback
                                                  )
+                if not (multiStepFeedback.isCanceled() or self.isCanceled()):
+                    # completed layers are not resumed on a new conversion
+                    for layer in successfulLayers:
+                        self.clearCheckpoint(checkpointKeys[layer])
                 # log update
                 conversionSummary += self.addConversionStepToLog(conversionStep, inputDb, outputDb, inputLayers, \
                                             errors, successfulLayers, failedLayers, "{0:.2f} s".format(time.time() - startTime))
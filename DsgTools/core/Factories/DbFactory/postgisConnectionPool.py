@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import threading
+import time
+import weakref
+
+from qgis.PyQt.QtSql import QSqlQuery
+
+
+class ThreadConnections(object):
+    """
+    Idle connections released by a single thread. It is stored on that
+    thread's local storage, hence its connections are closed (on that thread)
+    as soon as the thread ends.
+    """
+    def __init__(self):
+        """
+        Class constructor.
+        """
+        # list of (key, QSqlDatabase, release time), oldest first
+        self.idle = []
+        # connections dropped by other threads, closed by the owner thread
+        self.toClose = []
+
+    @staticmethod
+    def close(db):
+        try:
+            db.close()
+        except RuntimeError:
+            pass
+
+    def __del__(self):
+        for entry in self.idle + self.toClose:
+            self.close(entry[1])
+
+
+class PostgisConnectionPool(object):
+    """
+    Process-wide pool of idle PostgreSQL connections (QSqlDatabase), keyed by
+    host, port, database and user. A QSqlDatabase may only be used on the
+    thread that opened it, hence connections are only handed out to the
+    thread that released them and are only closed by it: connections dropped
+    by another thread are closed on the owner's next call to the pool or when
+    the owner ends. Connections are checked before being reused and are closed
+    once they are idle for too long.
+    """
+    # maximum number of idle connections kept by the pool
+    DEFAULT_MAX_SIZE = 20
+    # seconds
+    DEFAULT_MAX_IDLE_TIME = 300
+    # a session keeps the search path set when it was opened, hence any later
+    # ALTER DATABASE/ROLE ... SET search_path is applied to reused sessions
+    # (role and database specific settings win over role specific ones, which
+    # win over database specific ones)
+    SEARCH_PATH_SQL = """
+        SELECT set_config('search_path', cfg.value, false)
+        FROM (
+            SELECT substr(c, 13) AS value,
+                (r.setdatabase <> 0)::int + 2 * (r.setrole <> 0)::int AS priority
+            FROM pg_db_role_setting r, unnest(r.setconfig) AS c
+            WHERE c LIKE 'search_path=%'
+                AND r.setdatabase IN (
+                    0, (SELECT oid FROM pg_database WHERE datname = current_database())
+                )
+                AND r.setrole IN (
+                    0, (SELECT oid FROM pg_roles WHERE rolname = session_user)
+                )
+        ) AS cfg
+        ORDER BY cfg.priority DESC
+        LIMIT 1
+    """
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self, maxSize=None, maxIdleTime=None):
+        """
+        Class constructor.
+        :param maxSize: (int) maximum number of idle connections.
+        :param maxIdleTime: (float) seconds a connection may be kept idle.
+        """
+        self.maxSize = maxSize or self.DEFAULT_MAX_SIZE
+        self.maxIdleTime = maxIdleTime or self.DEFAULT_MAX_IDLE_TIME
+        self._local = threading.local()
+        # every thread's idle connections, dropped along with their thread
+        self._threads = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """
+        Gets the pool shared by DsgTools.
+        :return: (PostgisConnectionPool) shared pool.
+        """
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(connections.idle) for connections in self._threads)
+
+    @staticmethod
+    def key(host, port, database, user):
+        """
+        :return: (tuple) pool key of a set of connection parameters.
+        """
+        return (str(host), int(port), str(database), str(user))
+
+    def dbKey(self, db):
+        """
+        :param db: (QSqlDatabase) connection.
+        :return: (tuple) pool key of the connection.
+        """
+        return self.key(db.hostName(), db.port(), db.databaseName(), db.userName())
+
+    def isHealthy(self, db):
+        """
+        Checks whether a connection is still usable.
+        :param db: (QSqlDatabase) connection to be checked.
+        :return: (bool) whether the connection answers a trivial query.
+        """
+        if not db.isOpen():
+            return False
+        query = QSqlQuery(db)
+        return query.exec_("SELECT 1")
+
+    def resetSession(self, db):
+        """
+        Resets the session settings that may be outdated on a reused connection.
+        :param db: (QSqlDatabase) connection to be reset.
+        :return: (bool) whether the session was reset.
+        """
+        query = QSqlQuery(db)
+        return query.exec_("RESET search_path") and query.exec_(self.SEARCH_PATH_SQL)
+
+    def _threadConnections(self):
+        """
+        :return: (ThreadConnections) idle connections of current thread.
+        """
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = ThreadConnections()
+            self._local.connections = connections
+            with self._lock:
+                self._threads.add(connections)
+        return connections
+
+    def _drop(self, predicate, threadConnections=None):
+        """
+        Drops the idle connections that satisfy predicate. They are closed by
+        their own threads.
+        :param predicate: (callable) receives an idle entry.
+        :param threadConnections: (list-of-ThreadConnections) connections to
+                                  be checked. Defaults to every thread's.
+        """
+        with self._lock:
+            for connections in threadConnections or list(self._threads):
+                dropped = [entry for entry in connections.idle if predicate(entry)]
+                if not dropped:
+                    continue
+                connections.idle = [
+                    entry for entry in connections.idle if not predicate(entry)]
+                connections.toClose.extend(dropped)
+        self._closeDropped()
+
+    def _closeDropped(self):
+        """
+        Closes the dropped connections of current thread.
+        """
+        connections = self._threadConnections()
+        with self._lock:
+            toClose, connections.toClose = connections.toClose, []
+        for entry in toClose:
+            ThreadConnections.close(entry[1])
+
+    def evictIdle(self):
+        """
+        Closes the connections of current thread that have been idle for too
+        long. Idle connections of finished threads are closed as they end.
+        """
+        limit = time.monotonic() - self.maxIdleTime
+        self._drop(
+            lambda entry: entry[2] < limit,
+            threadConnections=[self._threadConnections()]
+        )
+
+    def acquire(self, host, port, database, user, password):
+        """
+        Hands out an idle connection opened with the same parameters.
+        :param host: (str) server's host.
+        :param port: (int) server's port.
+        :param database: (str) database name.
+        :param user: (str) user name.
+        :param password: (str) user's password.
+        :return: (QSqlDatabase) an open connection or None, if there is no
+                 healthy idle connection available for current thread.
+        """
+        self.evictIdle()
+        key = self.key(host, port, database, user)
+        connections = self._threadConnections()
+        while True:
+            with self._lock:
+                # most recently released first
+                idx = next((
+                    i for i in range(len(connections.idle) - 1, -1, -1) \
+                        if connections.idle[i][0] == key \
+                            and connections.idle[i][1].password() == password
+                ), None)
+                if idx is None:
+                    return None
+                _, db, _ = connections.idle.pop(idx)
+            if self.isHealthy(db) and self.resetSession(db):
+                return db
+            ThreadConnections.close(db)
+
+    def release(self, db):
+        """
+        Gives a connection back to the pool. Any pending transaction is rolled
+        back. If the pool is full, the oldest idle connection of current
+        thread is closed to make room; if there is none, db is not pooled.
+        :param db: (QSqlDatabase) connection that is no longer used.
+        :return: (bool) whether the connection was pooled. Otherwise, caller
+                 remains responsible for closing it.
+        """
+        if not db.isOpen() or db.driverName() != 'QPSQL':
+            return False
+        self.evictIdle()
+        connections = self._threadConnections()
+        db.rollback()
+        evicted = None
+        with self._lock:
+            size = sum(len(c.idle) for c in self._threads)
+            if size >= self.maxSize:
+                if not connections.idle:
+                    return False
+                evicted = connections.idle.pop(0)[1]
+            connections.idle.append((self.dbKey(db), db, time.monotonic()))
+        if evicted is not None:
+            ThreadConnections.close(evicted)
+        return True
+
+    def discard(self, host, port, database):
+        """
+        Drops every idle connection to a database (e.g. before it is dropped
+        or used as a template, which require no open connections). Connections
+        of current thread are closed right away.
+        :param host: (str) server's host.
+        :param port: (int) server's port.
+        :param database: (str) database name.
+        """
+        prefix = self.key(host, port, database, "")[:3]
+        self._drop(lambda entry: entry[0][:3] == prefix)
+
+    def clear(self):
+        """
+        Drops every idle connection. Connections of current thread are closed
+        right away.
+        """
+        self._drop(lambda entry: True)
@@ -31,6 +31,7 @@ from qgis.core import (Qgis,
                        QgsDataSourceUri)
 
 from .abstractDb import AbstractDb
+from .postgisConnectionPool import PostgisConnectionPool
 from ..SqlFactory.sqlGeneratorFactory import SqlGeneratorFactory
 from ....gui.CustomWidgets.BasicInterfaceWidgets.progressWidget import ProgressWidget
 from DsgTools.core.dsgEnums import DsgEnums
@@ -54,10 +55,36 @@ class PostgisDb(AbstractDb):
         self.gen = SqlGeneratorFactory().createSqlGenerator(driver=DsgEnums.DriverPostGIS)
         self.databaseEncoding = 'utf-8'
 
-    def closeDatabase(self):
+    def __del__(self):
+        """
+        Destructor. The connection is closed rather than pooled, since objects
+        may be collected on any thread and pooled connections must be given
+        back by the thread that uses them.
+        """
+        try:
+            self.closeDatabase(pool=False)
+        except:
+            pass
+
+    def closeDatabase(self, pool=True):
+        """
+        Gives the connection back to the connection pool (or closes it, if the pool
+        does not take it). This object may still reconnect later on.
+        :param pool: (bool) whether the connection may be pooled.
+        """
         if self.db is not None and self.db.isOpen():
             # self.dropAllConections(self.getDatabaseName())
-            self.db.close()
+            db = self.db
+            if pool and PostgisConnectionPool.instance().release(db):
+                # pooled connection may be handed out to another object
+                self.db = QSqlDatabase('QPSQL')
+                self.db.setHostName(db.hostName())
+                self.db.setPort(db.port())
+                self.db.setDatabaseName(db.databaseName())
+                self.db.setUserName(db.userName())
+                self.db.setPassword(db.password())
+            else:
+                db.close()
 
     def getDatabaseParameters(self):
         """
@@ -98,9 +125,26 @@ class PostgisDb(AbstractDb):
         user: user name
         password: user password
         """
-        if not self.testCredentials(host, port, database, user, password):
+        if not self.connectDatabaseFromPool(host, port, database, user, password):
             self.getCredentials(host, port, user, database)
 
+    def connectDatabaseFromPool(self, host, port, database, user, password):
+        """
+        Connects to database reusing an idle connection from the connection pool, if
+        available. Credentials are not asked for.
+        :param host: (str) host IP.
+        :param port: (int) host port.
+        :param database: (str) database name.
+        :param user: (str) user name.
+        :param password: (str) user password.
+        :return: (bool) whether connection was established.
+        """
+        pooledDb = PostgisConnectionPool.instance().acquire(host, port, database, user, password)
+        if pooledDb is not None:
+            self.db = pooledDb
+            return True
+        return self.testCredentials(host, port, database, user, password)
+
     def getCredentials(self, host, port, user, database):
         conInfo = "host={0} port={1} dbname={2}".format(host, port, database)
         check = False
@@ -3566,6 +3610,7 @@ class PostgisDb(AbstractDb):
         Terminates all database conections
         """
         self.checkAndOpenDb()
+        PostgisConnectionPool.instance().discard(self.db.hostName(), self.db.port(), dbName)
         if self.checkSuperUser():
             sql = self.gen.dropAllConections(dbName)
             query = QSqlQuery(self.db)
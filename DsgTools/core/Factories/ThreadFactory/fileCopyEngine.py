@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import hashlib
+import os
+import shutil
+import threading
+
+from osgeo import gdal, ogr
+
+from DsgTools.core.Utils.executorService import ExecutorService
+
+
+class FileCopyEngine(object):
+    """
+    Copies inventoried datasets to a folder on the shared worker pool. Each
+    dataset is copied along with its sidecar files as plain bytes (only
+    formats that reference other files by path are copied through their
+    drivers) and each copied file is verified against its source checksum.
+    Files already copied (same size, modification time and checksum) are
+    skipped, so that interrupted copies may be resumed.
+    """
+    COPIED, SKIPPED, FAILED = 'copied', 'skipped', 'failed'
+    # files that share the main file's name (without its extension)
+    SIDECAR_EXTENSIONS = (
+        '.dbf', '.shx', '.prj', '.cpg', '.qix', '.sbn', '.sbx', '.shp.xml',
+        '.aux.xml', '.tfw', '.tifw', '.wld', '.jgw', '.pgw', '.j2w', '.ovr'
+    )
+    # files that share the main file's full name
+    SUFFIX_EXTENSIONS = ('.aux.xml', '.ovr', '.msk')
+    # formats that must be copied by their drivers
+    DRIVER_COPY_EXTENSIONS = ('vrt',)
+    BLOCK_SIZE = 1024 ** 2
+
+    def __init__(self, destinationFolder, verifyExisting=True):
+        """
+        Class constructor.
+        :param destinationFolder: (str) folder datasets are copied to.
+        :param verifyExisting: (bool) whether existing copies with the same
+                               size and modification time as their sources
+                               are also compared by checksum before skipped.
+        """
+        self.destinationFolder = destinationFolder
+        self.verifyExisting = verifyExisting
+
+    def datasetFiles(self, filepath):
+        """
+        Gets the files of a dataset: its main file and its existing sidecars.
+        :param filepath: (str) dataset's main file.
+        :return: (list-of-str) dataset's files.
+        """
+        stem = os.path.splitext(filepath)[0]
+        candidates = [stem + ext for ext in self.SIDECAR_EXTENSIONS] + \
+            [filepath + ext for ext in self.SUFFIX_EXTENSIONS]
+        files = [filepath]
+        for candidate in candidates:
+            for name in (candidate, stem + candidate[len(stem):].upper()):
+                if name not in files and os.path.isfile(name):
+                    files.append(name)
+        return files
+
+    def destinationPath(self, filepath):
+        return os.path.join(self.destinationFolder, os.path.basename(filepath))
+
+    def checksum(self, filepath):
+        """
+        :param filepath: (str) file path.
+        :return: (str) BLAKE2b digest of file's content.
+        """
+        digest = hashlib.blake2b()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(self.BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def isCopied(self, source, destination):
+        """
+        Checks whether a file was already copied.
+        :param source: (str) source file.
+        :param destination: (str) destination file.
+        :return: (bool) whether destination matches source.
+        """
+        if not os.path.isfile(destination):
+            return False
+        sourceStat, destinationStat = os.stat(source), os.stat(destination)
+        if sourceStat.st_size != destinationStat.st_size or \
+            int(sourceStat.st_mtime) != int(destinationStat.st_mtime):
+            return False
+        return not self.verifyExisting or \
+            self.checksum(source) == self.checksum(destination)
+
+    def copyFile(self, source, destination):
+        """
+        Copies a file as plain bytes through a temporary file, verifies the
+        copy's checksum and keeps source's modification time.
+        :param source: (str) source file.
+        :param destination: (str) destination file.
+        """
+        # datasets may share sidecars, hence each thread uses its own file
+        tempPath = '{0}.{1}.part'.format(destination, threading.get_ident())
+        digest = hashlib.blake2b()
+        with open(source, 'rb') as src, open(tempPath, 'wb') as dst:
+            for block in iter(lambda: src.read(self.BLOCK_SIZE), b''):
+                digest.update(block)
+                dst.write(block)
+        if self.checksum(tempPath) != digest.hexdigest():
+            os.remove(tempPath)
+            raise Exception('Checksum mismatch on copy of {0}'.format(source))
+        shutil.copystat(source, tempPath)
+        os.replace(tempPath, destination)
+
+    def driverCopy(self, source, destination):
+        """
+        Copies a dataset through its OGR/GDAL driver.
+        :param source: (str) dataset's main file.
+        :param destination: (str) destination file.
+        """
+        ogrSrc = ogr.Open(source)
+        if ogrSrc:
+            ogrSrc.GetDriver().CopyDataSource(ogrSrc, destination)
+            return
+        gdalSrc = gdal.Open(source)
+        if not gdalSrc:
+            raise Exception('Unable to open {0}'.format(source))
+        gdalSrc.GetDriver().CreateCopy(destination, gdalSrc)
+
+    def copyDataset(self, filepath):
+        """
+        Copies a dataset and its sidecar files. Runs on worker threads.
+        :param filepath: (str) dataset's main file.
+        :return: (tuple) file path, status (COPIED, SKIPPED or FAILED) and an
+                 error message (None unless it failed).
+        """
+        try:
+            if filepath.split('.')[-1].lower() in self.DRIVER_COPY_EXTENSIONS:
+                self.driverCopy(filepath, self.destinationPath(filepath))
+                return filepath, self.COPIED, None
+            status = self.SKIPPED
+            for source in self.datasetFiles(filepath):
+                destination = self.destinationPath(source)
+                if self.isCopied(source, destination):
+                    continue
+                self.copyFile(source, destination)
+                status = self.COPIED
+            return filepath, status, None
+        except Exception as e:
+            return filepath, self.FAILED, str(e)
+
+    def copy(self, fileList, feedback=None):
+        """
+        Copies datasets concurrently.
+        :param fileList: (list-of-str) datasets' main files.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        :return: (generator) results of copyDataset, as they are finished.
+        """
+        os.makedirs(self.destinationFolder, exist_ok=True)
+        return ExecutorService.instance().map(
+            self.copyDataset, fileList, chunkSize=1, feedback=feedback)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import json
+import os
+import tempfile
+import threading
+
+
+class InventoryManifest(object):
+    """
+    Persistent record of the inventory result of each file, keyed by its path.
+    A record is only reused while file's modification time and size are
+    unchanged, so that re-inventories skip files that were not modified.
+    Records are appended to a JSON lines file (a header line followed by a
+    line per record, later lines overriding earlier ones), hence saving costs
+    only the new records. The file is compacted at the end of each complete
+    inventory, when records of files that were not found anymore are pruned.
+    """
+    VERSION = 2
+    # number of new records after which they are appended to disk
+    DEFAULT_SAVE_INTERVAL = 1000
+
+    def __init__(self, filepath, saveInterval=None):
+        """
+        Class constructor. Existing records are loaded from filepath.
+        :param filepath: (str) manifest's file path.
+        :param saveInterval: (int) number of new records after which the
+                             manifest is saved (so that interrupted runs may
+                             be resumed).
+        """
+        self.filepath = filepath
+        self.saveInterval = saveInterval or self.DEFAULT_SAVE_INTERVAL
+        self._records = dict()
+        # records not written to disk yet
+        self._pending = []
+        # paths of the files found on current run
+        self._seen = set()
+        # whether manifest file must be written from scratch
+        self._rewrite = True
+        self._lock = threading.Lock()
+        self._saveLock = threading.Lock()
+        self.load()
+
+    def __len__(self):
+        return len(self._records)
+
+    def load(self):
+        """
+        Loads manifest's records from disk. Unreadable manifests are ignored and
+        so are unreadable lines (e.g. the last one of an interrupted run).
+        """
+        if not self.filepath or not os.path.exists(self.filepath):
+            return
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as fp:
+                header = json.loads(fp.readline() or "{}")
+                if not isinstance(header, dict) or header.get("version") != self.VERSION:
+                    return
+                complete = True
+                for line in fp:
+                    # a truncated last line would swallow the next record
+                    complete = line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                        self._records[record["path"]] = {
+                            "key": record["key"], "value": record["value"]}
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except (OSError, ValueError):
+            self._records = dict()
+            return
+        self._rewrite = not complete
+
+    @staticmethod
+    def _line(filepath, record):
+        return json.dumps(
+            {"path": filepath, "key": record["key"], "value": record["value"]}
+        ) + "\n"
+
+    def _writeAll(self, paths):
+        """
+        Writes the records of the given paths as a new manifest. File is
+        replaced atomically.
+        :param paths: (iterable) paths of the records to be written.
+        """
+        folder = os.path.dirname(os.path.abspath(self.filepath))
+        fd, tempPath = tempfile.mkstemp(
+            prefix=os.path.basename(self.filepath), suffix=".tmp", dir=folder)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                fp.write(json.dumps({"version": self.VERSION}) + "\n")
+                for path in paths:
+                    fp.write(self._line(path, self._records[path]))
+            os.replace(tempPath, self.filepath)
+        except OSError:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            raise
+
+    def save(self, prune=False):
+        """
+        Writes manifest's new records to disk.
+        :param prune: (bool) whether the records of the files that were not
+                      found on current run should be dropped. It should only
+                      be set after a complete run.
+        """
+        with self._saveLock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                if prune:
+                    self._records = {
+                        path: record for path, record in self._records.items() \
+                            if path in self._seen
+                    }
+                rewrite = prune or self._rewrite
+                paths = list(self._records) if rewrite else None
+            if rewrite:
+                self._writeAll(paths)
+                self._rewrite = False
+                return
+            if not pending:
+                return
+            with open(self.filepath, "a", encoding="utf-8") as fp:
+                fp.writelines(self._line(path, record) for path, record in pending)
+
+    @staticmethod
+    def fileKey(stat):
+        """
+        :param stat: (os.stat_result) file's status.
+        :return: (list) values that identify a version of a file.
+        """
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def get(self, filepath, stat):
+        """
+        Gets the record of a file, if it was not modified since recorded. The
+        file is accounted as found on current run.
+        :param filepath: (str) file's path.
+        :param stat: (os.stat_result) file's current status.
+        :return: (dict) file's record or None.
+        """
+        with self._lock:
+            self._seen.add(filepath)
+            record = self._records.get(filepath)
+        if record is None or record["key"] != self.fileKey(stat):
+            return None
+        return record["value"]
+
+    def put(self, filepath, stat, value):
+        """
+        Records a file's inventory result.
+        :param filepath: (str) file's path.
+        :param stat: (os.stat_result) file's status when it was inventoried.
+        :param value: (dict) JSON serializable result.
+        """
+        record = {"key": self.fileKey(stat), "value": value}
+        with self._lock:
+            self._seen.add(filepath)
+            self._records[filepath] = record
+            self._pending.append((filepath, record))
+            mustSave = len(self._pending) >= self.saveInterval
+        if mustSave:
+            self.save()
@@ -34,9 +34,12 @@ from qgis.PyQt.QtCore import pyqtSlot
 from qgis.core import QgsMessageLog, QgsVectorFileWriter, QgsVectorLayer, \
                       QgsCoordinateReferenceSystem, QgsCoordinateTransform, \
                       QgsGeometry, QgsField, QgsPointXY, QgsProcessingMultiStepFeedback,\
-                      QgsFeature, QgsProject, QgsFields
+                      QgsFeature, QgsProject, QgsFields, QgsFeatureSink
 
+from DsgTools.core.Utils.executorService import ExecutorService
 from .genericThread import GenericThread
+from .inventoryManifest import InventoryManifest
+from .fileCopyEngine import FileCopyEngine
 
 class InventoryMessages(QObject):
     def __init__(self, thread):
@@ -83,6 +86,24 @@ class InventoryMessages(QObject):
         self.thread.stopped[0] = True    
 
 class InventoryThread(GenericThread):
+    # leading bytes of common formats, used to discard files before opening them with GDAL/OGR
+    MAGIC_NUMBERS = {
+        'tif': (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+'),
+        'tiff': (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+'),
+        'shp': (b'\x00\x00\x27\x0a',),
+        'gpkg': (b'SQLite format 3\x00',),
+        'sqlite': (b'SQLite format 3\x00',),
+        'jp2': (b'\x00\x00\x00\x0cjP', b'\xff\x4f\xff\x51'),
+        'png': (b'\x89PNG\r\n\x1a\n',),
+        'jpg': (b'\xff\xd8\xff',),
+        'jpeg': (b'\xff\xd8\xff',),
+        'pdf': (b'%PDF',),
+    }
+    # files that are only inventoried along with their main file
+    SIDECAR_EXTENSIONS = ('prj', 'cpg', 'qix')
+    # files probed on each worker task
+    PROBE_CHUNK_SIZE = 16
+
     def __init__(self):
         """
         Constructor.
@@ -132,58 +153,173 @@ class InventoryThread(GenericThread):
         else:
             return set(format_list)
     
-    def make_inventory_from_processing(self, parent_folder, format_list, destination_folder=None, make_copy=False, onlyGeo=True, feedback=None):
+    def walk_files(self, parent_folder, format_set, feedback=None):
+        """
+        Lazily walks through a folder tree.
+        :param parent_folder: (str) root folder.
+        :param format_set: (set) extensions of the files to be yielded.
+        :param feedback: (QgsFeedback) used to stop walking when canceled.
+        :return: (generator) tuples of file path and extension.
+        """
+        folders = [parent_folder]
+        while folders:
+            if feedback is not None and feedback.isCanceled():
+                return
+            try:
+                entries = list(os.scandir(folders.pop()))
+            except OSError:
+                continue
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.path)
+                    continue
+                extension = entry.name.split('.')[-1]
+                if extension in format_set:
+                    yield entry.path, extension
+
+    def has_expected_signature(self, full_path, extension):
+        """
+        Checks the leading bytes of a file against the ones of its format.
+        :param full_path: (str) file path.
+        :param extension: (str) file extension.
+        :return: (bool) False if file certainly is not of the format of its extension.
+        """
+        extension = extension.lower()
+        if extension in self.SIDECAR_EXTENSIONS:
+            return False
+        if extension not in self.MAGIC_NUMBERS:
+            return True
+        try:
+            with open(full_path, 'rb') as f:
+                header = f.read(16)
+        except OSError:
+            return False
+        return header.startswith(self.MAGIC_NUMBERS[extension])
+
+    def probe_file(self, full_path, extension):
+        """
+        Opens a file with OGR/GDAL and computes its inventory attributes.
+        :param full_path: (str) file path.
+        :param extension: (str) file extension.
+        :return: (dict) JSON serializable result: if file is recognized, its attributes and
+                 its bounding box (EPSG:4326) as WKT (None if it is not georeferenced).
+        """
+        if not self.has_expected_signature(full_path, extension):
+            return {'recognized': False}
+        ogrSrc = ogr.Open(full_path)
+        gdalSrc = None if ogrSrc else gdal.Open(full_path)
+        if not ogrSrc and not gdalSrc:
+            return {'recognized': False}
+        (ogrPoly, prjWkt) = self.getDataSourceExtent(ogrSrc, gdalSrc)
+        ogrSrc, gdalSrc = None, None
+        wkt = None
+        if ogrPoly is not None and prjWkt:
+            crsSrc = QgsCoordinateReferenceSystem()
+            crsSrc.createFromWkt(prjWkt)
+            wkt = self.reprojectBoundingBox(crsSrc, ogrPoly).asWkt()
+        return {
+            'recognized': True,
+            'wkt': wkt,
+            'attributes': self.makeAttributes(full_path, extension)
+        }
+
+    def inventory_file(self, item, manifest=None):
+        """
+        Gets the inventory result of a file, reusing its manifest record if the file was
+        not modified. Runs on worker threads.
+        :param item: (tuple) file path and extension.
+        :param manifest: (InventoryManifest) manifest of previous inventories.
+        :return: (tuple) file path and its result (see probe_file).
+        """
+        full_path, extension = item
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return full_path, {'recognized': False}
+        result = manifest.get(full_path, stat) if manifest is not None else None
+        if result is None:
+            result = self.probe_file(full_path, extension)
+            if manifest is not None:
+                manifest.put(full_path, stat, result)
+        return full_path, result
+
+    def make_inventory_from_processing(self, parent_folder, format_list, destination_folder=None, make_copy=False, onlyGeo=True, feedback=None, sink=None, manifest_path=None):
+        """
+        Inventories the files of a folder tree. Folders are walked lazily while files are
+        probed (by their leading bytes, then opened with OGR/GDAL) on the worker pool.
+        :param parent_folder: (str) root folder.
+        :param format_list: (list-of-str) extensions of the files to be inventoried.
+        :param destination_folder: (str) folder inventoried files are copied to.
+        :param make_copy: (bool) whether inventoried files should be copied.
+        :param onlyGeo: (bool) whether recognized files that are not georeferenced are skipped.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and progress tracking.
+        :param sink: (QgsFeatureSink) if given, inventory features are written to it as they
+                     are computed instead of being returned.
+        :param manifest_path: (str) path of a manifest of previous inventories. Files that were
+                              not modified since are not probed again.
+        :return: (list-of-QgsFeature) inventory features (empty if a sink is given).
+        """
         featList = []
         fileList = []
         format_set = self.get_format_set(format_list)
-        tuple_list = [i for i in os.walk(parent_folder)]
-        nSteps = len(tuple_list) if make_copy else len(tuple_list) - 1
+        nSteps = 2 if make_copy else 1
         multiStepFeedback = QgsProcessingMultiStepFeedback(nSteps, feedback) if feedback else None
-        for current_step, [root, dirs, files] in enumerate(tuple_list):
-            if feedback is not None:
-                if feedback.isCanceled():
-                    return []
-                multiStepFeedback.setCurrentStep(current_step)
-            n_files = len(files)
-            files_progress = 100/n_files if n_files else 0
-            for current, current_file in enumerate(files):
-                if multiStepFeedback is not None and multiStepFeedback.isCanceled():
-                    break
-                extension = current_file.split('.')[-1]
-                if extension not in format_set:
-                    continue
-                full_path = self.get_full_path(current_file, root)
-                if gdal.Open(full_path) or ogr.Open(full_path):
-                    bbox_geom, attributes = self.computeBoxAndAttributes(None, full_path, extension, insertIntoMemory=False)
-                    new_feat = self.get_new_feat(bbox_geom, attributes)
-                    featList.append(new_feat)
-                    fileList.append(full_path)
-                if multiStepFeedback is not None:
-                    multiStepFeedback.setProgress(files_progress * current)
+        if multiStepFeedback is not None:
+            multiStepFeedback.setCurrentStep(0)
+        manifest = InventoryManifest(manifest_path) if manifest_path else None
+        results = ExecutorService.instance().map(
+            lambda item: self.inventory_file(item, manifest=manifest),
+            self.walk_files(parent_folder, format_set, feedback=multiStepFeedback),
+            chunkSize=self.PROBE_CHUNK_SIZE,
+            feedback=multiStepFeedback
+        )
+        for current, (full_path, result) in enumerate(results):
+            if multiStepFeedback is not None and (current + 1) % 500 == 0:
+                multiStepFeedback.setProgressText(
+                    self.tr('{n} files searched').format(n=current + 1))
+            if not result['recognized'] or (result['wkt'] is None and onlyGeo):
+                continue
+            geom = QgsGeometry.fromWkt(result['wkt']) if result['wkt'] is not None else QgsGeometry()
+            new_feat = self.get_new_feat(geom, result['attributes'])
+            if sink is not None:
+                sink.addFeature(new_feat, QgsFeatureSink.FastInsert)
+            else:
+                featList.append(new_feat)
+            fileList.append(full_path)
+        if manifest is not None:
+            # files that were not found are only known after a complete walk
+            manifest.save(
+                prune=multiStepFeedback is None or not multiStepFeedback.isCanceled())
+        if multiStepFeedback is not None and multiStepFeedback.isCanceled():
+            return featList
         if make_copy:
             if multiStepFeedback is not None:
-                multiStepFeedback.setCurrentStep(nSteps)
-            copy_len = len(fileList)
-            for current, file_ in fileList:
-                if multiStepFeedback is not None and multiStepFeedback.isCanceled:
-                    break
-                try:
-                    self.copy_single_file(file_, destination_folder)
-                    if multiStepFeedback is not None:
-                        multiStepFeedback.pushInfo(
-                            self.tr('File {file} copied to {destination}').format(
-                                file=file_,
-                                destination=destination_folder
-                            )
+                multiStepFeedback.setCurrentStep(1)
+            copyEngine = FileCopyEngine(destination_folder)
+            for file_, status, error in copyEngine.copy(fileList, feedback=multiStepFeedback):
+                if multiStepFeedback is None:
+                    continue
+                if status == FileCopyEngine.FAILED:
+                    multiStepFeedback.pushInfo(
+                        self.tr('Error copying file {file}: {exception}\n').format(
+                            file=file_,
+                            exception=error
                         )
-                except Exception as e:
-                    if multiStepFeedback is not None:
-                        multiStepFeedback.pushInfo(
-                            self.tr('Error copying file {file}: {exception}\n').format(
-                                file=file_,
-                                exception='\n'.join(e.args)
-                            )
+                    )
+                elif status == FileCopyEngine.SKIPPED:
+                    multiStepFeedback.pushInfo(
+                        self.tr('File {file} already copied to {destination}').format(
+                            file=file_,
+                            destination=destination_folder
                         )
+                    )
+                else:
+                    multiStepFeedback.pushInfo(
+                        self.tr('File {file} copied to {destination}').format(
+                            file=file_,
+                            destination=destination_folder
+                        )
+                    )
         return featList
         
 
@@ -325,63 +461,30 @@ class InventoryThread(GenericThread):
 
     def copy(self, destinationFolder):
         """
-        Copy inventoried files considering the dataset
+        Copy inventoried files considering the dataset (see FileCopyEngine)
         destinationFolder: copy destination folder
         """
-        for fileName in self.files:
-            # adjusting the separators according to the OS
-            fileName = fileName.replace('/', os.sep)
-            file = fileName.split(os.sep)[-1]
-            newFileName = os.path.join(destinationFolder, file)
-            newFileName = newFileName.replace('/', os.sep)
-
-            try:
-                gdalSrc = gdal.Open(fileName)
-                ogrSrc = ogr.Open(fileName)
-                if ogrSrc:
-                    self.copyOGRDataSource(ogrSrc, newFileName)
-                elif gdalSrc:
-                    self.copyGDALDataSource(gdalSrc, newFileName)
-            except Exception as e:
-                QgsMessageLog.logMessage(self.messenger.getCopyErrorMessage()+'\n'+':'.join(e.args), "DSGTools Plugin", QgsMessageLog.INFO)
-                return (0, self.messenger.getCopyErrorMessage()+'\n'+':'.join(e.args))
+        fileList = [
+            (f.decode('UTF-8') if isinstance(f, bytes) else f).replace('/', os.sep) \
+                for f in self.files
+        ]
+        errors = [
+            '{0}: {1}'.format(fileName, error) \
+                for fileName, status, error in FileCopyEngine(destinationFolder).copy(fileList) \
+                    if status == FileCopyEngine.FAILED
+        ]
+        if errors:
+            QgsMessageLog.logMessage(self.messenger.getCopyErrorMessage()+'\n'+'\n'.join(errors), "DSGTools Plugin", QgsMessageLog.INFO)
+            return (0, self.messenger.getCopyErrorMessage()+'\n'+'\n'.join(errors))
         
         QgsMessageLog.logMessage(self.messenger.getSuccessInventoryAndCopyMessage(), "DSGTools Plugin", QgsMessageLog.INFO)
         return (1, self.messenger.getSuccessInventoryAndCopyMessage())
     
     def copy_single_file(self, file_name, destination_folder):
-        file_name = file_name.replace('/', os.sep)
-        file_ = file_name.split(os.sep)[-1]
-        newFileName = os.path.join(destination_folder, file_)
-        newFileName = newFileName.replace('/', os.sep)
-        gdalSrc = gdal.Open(fileName)
-        ogrSrc = ogr.Open(fileName)
-        if ogrSrc:
-            self.copyOGRDataSource(ogrSrc, newFileName)
-        elif gdalSrc:
-            self.copyGDALDataSource(gdalSrc, newFileName)
-
-    def copyGDALDataSource(self, gdalSrc, newFileName):
-        """
-        Copies a GDAL datasource
-        gdalSrc: original gdal source
-        newFileName: new file name
-        """
-        driver = gdalSrc.GetDriver()
-        dst_ds = driver.CreateCopy(newFileName, gdalSrc)
-        ogrSrc = None
-        dst_ds = None
-    
-    def copyOGRDataSource(self, ogrSrc, newFileName):
-        """
-        Copies a OGR datasource
-        ogrSrc: original ogr source
-        newFileName: new file name
-        """
-        driver = ogrSrc.GetDriver()
-        dst_ds = driver.CopyDataSource(ogrSrc, newFileName)
-        ogrSrc = None
-        dst_ds = None
+        _, status, error = FileCopyEngine(destination_folder).copyDataset(
+            file_name.replace('/', os.sep))
+        if status == FileCopyEngine.FAILED:
+            raise Exception(error)
 
     def isInFormatsList(self, ext):
         """
@@ -448,8 +551,16 @@ class InventoryThread(GenericThread):
         Makes a ogr polygon to represent the extent (i.e. bounding box)
         filename: file name
         """
-        gdalSrc = gdal.Open(filename)
         ogrSrc = ogr.Open(filename)
+        gdalSrc = None if ogrSrc else gdal.Open(filename)
+        return self.getDataSourceExtent(ogrSrc, gdalSrc)
+
+    def getDataSourceExtent(self, ogrSrc, gdalSrc):
+        """
+        Makes a ogr polygon to represent the extent (i.e. bounding box) of an opened file
+        ogrSrc: ogr data source (None if file is not a vector)
+        gdalSrc: gdal data source (None if file is not a raster)
+        """
         if ogrSrc:
             poly = ogr.Geometry(ogr.wkbPolygon)
             spatialRef = None
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+from qgis.core import QgsGeometry, QgsSpatialIndex
+
+from .nestingTree import NestingTree
+
+
+class ContourNestingTree(NestingTree):
+    """
+    Nesting tree of closed contour polygons (see NestingTree). Containment is
+    tested with a point on the surface of each polygon against prepared
+    geometries of the candidates, which are taken from a spatial index of
+    polygons' bounding boxes. Unlike its vertices, that point is never on the
+    boundary of a polygon that shares edges with it (e.g. polygons closed by
+    the frame).
+    Polygons are referred to by their position on the tree (their order by
+    area, smallest first).
+    """
+    def __init__(self, features, feedback=None):
+        """
+        Class constructor. Builds the tree.
+        :param features: (iterable-of-QgsFeature) contour polygons.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        """
+        decorated = [(feat.geometry().area(), feat) for feat in features]
+        decorated.sort(key=lambda x: x[0])
+        super(ContourNestingTree, self).__init__(len(decorated))
+        self.areas = [area for area, _ in decorated]
+        self.features = [feat for _, feat in decorated]
+        # geometries must outlive their engines
+        self.geometries = [feat.geometry() for feat in self.features]
+        self._engines = dict()
+        self.buildFromGeometries(feedback=feedback)
+
+    def engine(self, idx):
+        """
+        Gets the prepared geometry engine of a polygon, creating it if needed.
+        :param idx: (int) polygon's position.
+        :return: (QgsGeometryEngine) prepared engine.
+        """
+        if idx not in self._engines:
+            engine = QgsGeometry.createGeometryEngine(self.geometries[idx].constGet())
+            engine.prepareGeometry()
+            self._engines[idx] = engine
+        return self._engines[idx]
+
+    def buildFromGeometries(self, feedback=None):
+        """
+        Finds the direct parent of each polygon.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        """
+        rects = [geom.boundingBox() for geom in self.geometries]
+        interiorPoints = [geom.pointOnSurface() for geom in self.geometries]
+        spatialIdx = QgsSpatialIndex()
+        for idx, rect in enumerate(rects):
+            spatialIdx.addFeature(idx, rect)
+        self.build(
+            [
+                (rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()) \
+                    for rect in rects
+            ],
+            lambda candId, idx: self.engine(candId).contains(
+                interiorPoints[idx].constGet()),
+            candidates=lambda idx: spatialIdx.intersects(rects[idx]),
+            feedback=feedback
+        )
+        # engines are no longer needed
+        self._engines = dict()
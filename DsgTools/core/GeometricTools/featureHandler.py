@@ -24,7 +24,6 @@ from __future__ import absolute_import
 from builtins import range
 import itertools
 import sys
-import os
 from qgis.core import QgsMessageLog, QgsVectorLayer, QgsGeometry, QgsField, QgsVectorDataProvider, \
     QgsFeatureRequest, QgsExpression, QgsFeature, QgsSpatialIndex, Qgis, \
     QgsCoordinateTransform, QgsWkbTypes, QgsProcessingMultiStepFeedback,\
@@ -34,7 +33,7 @@ from qgis.PyQt.Qt import QObject, QVariant
 from .geometryHandler import GeometryHandler
 from .attributeHandler import AttributeHandler
 from DsgTools.core.Utils.FrameTools.map_index import UtmGrid
-import concurrent.futures
+from DsgTools.core.Utils.executorService import ExecutorService
 
 
 class FeatureHandler(QObject):
@@ -362,10 +361,6 @@ class FeatureHandler(QObject):
         )
         multiStepFeedback.setCurrentStep(1)
         multiStepFeedback.pushInfo(self.tr('Building grid'))
-        gridMultistepFeedback = QgsProcessingMultiStepFeedback(
-            len(inomenList),
-            multiStepFeedback
-        )
         constraintDict = {
             'spatialIdx': spatialIdx,
             'idDict': idDict,
@@ -383,24 +378,12 @@ class FeatureHandler(QObject):
                 xSubdivisions=xSubdivisions,
                 ySubdivisions=ySubdivisions,
                 constraintDict=constraintDict,
-                feedback=gridMultistepFeedback
-            )
-        pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count())
-        futures = []
-        current_idx = 0
-        for inomen in inomenList:
-            # gridMultistepFeedback.setCurrentStep(i)
-            if gridMultistepFeedback.isCanceled():
-                break
-            futures.append(
-                pool.submit(compute, inomen)
+                feedback=multiStepFeedback
             )
-
-        for x in concurrent.futures.as_completed(futures):
-            if gridMultistepFeedback.isCanceled():
-                break
-            gridMultistepFeedback.setCurrentStep(current_idx)
-            current_idx += 1
+        # each start index is subdivided recursively, hence one per task
+        for _ in ExecutorService.instance().map(
+            compute, inomenList, chunkSize=1, feedback=multiStepFeedback):
+            pass
 
     def buildSpatialIndexAndIdDict(self, inputLyr, feedback=None,
                                    featureRequest=None):
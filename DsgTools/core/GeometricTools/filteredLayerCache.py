@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+from collections import OrderedDict
+
+from qgis.PyQt.Qt import QObject
+
+
+class FilteredLayerCache(QObject):
+    """
+    LRU cache of filtered layers and their in-memory spatial indexes. Entries
+    are keyed by source layer id, filter expression and the source layer's
+    modification counter. The counter is increased whenever the source layer
+    is edited, hence stale entries are never served.
+    """
+    # bytes
+    DEFAULT_MEMORY_BUDGET = 512 * 1024 ** 2
+    # rough memory overhead of each feature on the layer and on the index
+    FEATURE_OVERHEAD = 256
+    # rough average size of a geometry (bytes)
+    AVERAGE_GEOMETRY_SIZE = 1024
+
+    def __init__(self, memoryBudget=None, parent=None):
+        """
+        Instantiates the cache.
+        :param memoryBudget: (int) maximum amount of memory (in bytes) to be
+                             used by the cached entries.
+        :param parent: (QObject) parent object.
+        """
+        super(FilteredLayerCache, self).__init__(parent)
+        self.memoryBudget = memoryBudget or self.DEFAULT_MEMORY_BUDGET
+        self.usedMemory = 0
+        self._entries = OrderedDict()
+        self._counters = dict()
+        self._connections = list()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def watchLayer(self, layer):
+        """
+        Connects the edition signals from a source layer to the invalidation
+        of its entries.
+        :param layer: (QgsVectorLayer) source layer to be watched.
+        """
+        layerId = layer.id()
+        if layerId in self._counters:
+            return
+        self._counters[layerId] = 0
+        invalidate = lambda *args: self.invalidateLayer(layerId)
+        signals = (
+            layer.featureAdded,
+            layer.featuresDeleted,
+            layer.geometryChanged,
+            layer.attributeValueChanged,
+            layer.dataChanged,
+            layer.willBeDeleted
+        )
+        for signal in signals:
+            signal.connect(invalidate)
+            self._connections.append((signal, invalidate))
+
+    def modificationCounter(self, layer):
+        """
+        Gets the modification counter of a source layer.
+        :param layer: (QgsVectorLayer) source layer.
+        :return: (int) how many times layer was edited since it started
+                 being watched.
+        """
+        self.watchLayer(layer)
+        return self._counters[layer.id()]
+
+    def key(self, layer, exp):
+        """
+        Gets the cache key of a source layer filtered by an expression.
+        :param layer: (QgsVectorLayer) source layer.
+        :param exp: (str) filtering expression.
+        :return: (tuple) cache key.
+        """
+        return (layer.id(), exp or "", self.modificationCounter(layer))
+
+    def get(self, key):
+        """
+        Retrieves a cached entry and marks it as the most recently used.
+        :param key: (tuple) cache key (see key method).
+        :return: (tuple) the filtered QgsVectorLayer and its QgsSpatialIndex
+                 or None, if key is not cached.
+        """
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        layer, spatialIdx, _ = self._entries[key]
+        return layer, spatialIdx
+
+    def put(self, key, layer, spatialIdx):
+        """
+        Caches a filtered layer and its spatial index. Least recently used
+        entries are evicted until the memory budget is respected. The newest
+        entry is always kept.
+        :param key: (tuple) cache key (see key method).
+        :param layer: (QgsVectorLayer) filtered layer.
+        :param spatialIdx: (QgsSpatialIndex) in-memory index of layer with
+                           stored geometries or None, if layer is not indexed.
+        """
+        if key in self._entries:
+            self._pop(key)
+        size = self.estimateMemory(layer, spatialIdx)
+        while self._entries and self.usedMemory + size > self.memoryBudget:
+            self._pop(next(iter(self._entries)))
+        self._entries[key] = (layer, spatialIdx, size)
+        self.usedMemory += size
+
+    def estimateMemory(self, layer, spatialIdx=None):
+        """
+        Estimates how much memory is held by a filtered layer and its index
+        from its feature count (features are not read). Geometries are stored
+        both on the layer and on the index.
+        :param layer: (QgsVectorLayer) filtered layer.
+        :param spatialIdx: (QgsSpatialIndex) layer's index, if any.
+        :return: (int) estimated size in bytes.
+        """
+        copies = 1 if spatialIdx is None else 2
+        return max(0, layer.featureCount()) * copies * \
+            (self.AVERAGE_GEOMETRY_SIZE + self.FEATURE_OVERHEAD)
+
+    def _pop(self, key):
+        _, _, size = self._entries.pop(key)
+        self.usedMemory -= size
+
+    def invalidateLayer(self, layerId):
+        """
+        Drops every entry built from a source layer and increases its
+        modification counter.
+        :param layerId: (str) source layer's ID.
+        """
+        if layerId in self._counters:
+            self._counters[layerId] += 1
+        for key in [k for k in self._entries if k[0] == layerId]:
+            self._pop(key)
+
+    def clear(self):
+        """
+        Drops every entry and stops watching the source layers.
+        """
+        for signal, slot in self._connections:
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                # layer might have already been deleted
+                pass
+        self._connections = list()
+        self._counters = dict()
+        self._entries = OrderedDict()
+        self.usedMemory = 0
@@ -21,24 +21,25 @@
  ***************************************************************************/
 """
 
+from array import array
 from collections import defaultdict
 import copy
 from functools import partial
-from itertools import combinations
-import os
+import hashlib
 
 from processing.tools import dataobjects
 
-import concurrent.futures
+import numpy as np
 
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
 from DsgTools.core.Utils.FrameTools.map_index import UtmGrid
+from DsgTools.core.Utils.executorService import ExecutorService
 from qgis.analysis import QgsGeometrySnapper, QgsInternalGeometrySnapper
 from qgis.core import (edit, Qgis, QgsCoordinateReferenceSystem, QgsCoordinateTransform,
                        QgsExpression, QgsFeature, QgsFeatureRequest, QgsField, QgsFields, QgsGeometry, QgsMessageLog,
                        QgsProcessingContext, QgsProcessingMultiStepFeedback, QgsProcessingUtils, QgsProject,
                        QgsSpatialIndex, QgsVectorDataProvider, QgsVectorLayer, QgsVectorLayerUtils, QgsWkbTypes,
-                       QgsProcessingFeatureSourceDefinition, QgsFeatureSink)
+                       QgsProcessingFeatureSourceDefinition, QgsFeatureSink, QgsPoint, QgsPointXY)
 from qgis.PyQt.Qt import QObject, QVariant
 
 from .featureHandler import FeatureHandler
@@ -367,11 +368,9 @@ class LayerHandler(QObject):
         idsToRemove, featuresToAdd = set(), set()
         lyr.startEditing()
         lyr.beginEditCommand('Updating layer {0}'.format(lyr.name()))
-        localTotal = 100/len(inputDict) if inputDict else 0
-        futures = set()
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()-1)
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
-        def evaluate(id_, featDict):
+        multiStepFeedback = QgsProcessingMultiStepFeedback(1, feedback)
+        def evaluate(item):
+            id_, featDict = item
             idsToRemove, featuresToAdd, geometriesToChange = set(), set(), set()
             if multiStepFeedback.isCanceled():
                 return idsToRemove, featuresToAdd, geometriesToChange
@@ -394,25 +393,15 @@ class LayerHandler(QObject):
             return idsToRemove, featuresToAdd, geometriesToChange
 
         multiStepFeedback.setCurrentStep(0)
-        multiStepFeedback.pushInfo(self.tr("Submitting tasks to thread..."))
-        for current, (id_, featDict) in enumerate(inputDict.items()):
-            if feedback is not None and feedback.isCanceled():
-                return
-            futures.add(pool.submit(evaluate, id_, featDict))
-            if feedback is not None:
-                feedback.setProgress(localTotal*current)
-        multiStepFeedback.setCurrentStep(1)
-        multiStepFeedback.pushInfo(self.tr("Evaluating results..."))
+        multiStepFeedback.pushInfo(self.tr("Evaluating features..."))
         changeGeometryLambda = lambda x: lyr.changeGeometry(x[0], x[1], skipDefaultValue=True)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if feedback is not None and feedback.isCanceled():
-                return
-            deletedIds, addedFeatures, geometriesToChange = future.result()
+        for deletedIds, addedFeatures, geometriesToChange in ExecutorService.instance().map(
+            evaluate, inputDict.items(), feedback=multiStepFeedback):
             list(map(changeGeometryLambda, geometriesToChange))
             featuresToAdd = featuresToAdd.union(addedFeatures)
             idsToRemove = idsToRemove.union(deletedIds)
-            if feedback is not None:
-                feedback.setProgress(localTotal*current)
+        if multiStepFeedback.isCanceled():
+            return
         lyr.addFeatures(list(featuresToAdd))
         if not keepFeatures:
             lyr.deleteFeatures(list(idsToRemove))
@@ -494,153 +483,342 @@ class LayerHandler(QObject):
         """
         Calculates initial point and end point from each line from lyr.
         """
+        featureDict = dict() if addFeatureToList else None
+        nodeMapping = self.buildLineEndpointNodeMapping(
+            lyr,
+            onlySelected=onlySelected,
+            featureDict=featureDict,
+            feedback=feedback if recordStepProgress else None
+        )
         # start and end points dict
         endVerticesDict = dict()
-        # iterating over features to store start and end points
-        iterator = lyr.getFeatures() if not onlySelected else lyr.getSelectedFeatures()
-        if recordStepProgress:
-            featCount = lyr.featureCount() if not onlySelected else lyr.selectedFeatureCount()
-            if featCount == 0:
-                return endVerticesDict
-            size = 100 / featCount
+        for point, nodeLines in nodeMapping.items():
+            ids = nodeLines['lines']
+            endVerticesDict[point] = [featureDict[i] for i in ids] \
+                if addFeatureToList else ids
+        return endVerticesDict
+
+    def buildLineEndpointNodeMapping(self, lyr, onlySelected=False, tolerance=None,
+                                     ignoreMultiPart=False, ignoreClosed=False,
+                                     idField=None, featureDict=None, feedback=None,
+                                     wholeGeometry=False, boundaryRule=False,
+                                     useZ=False):
+        """
+        Builds the mapping from each node (start or end point) of a line layer
+        to the IDs of the lines that start and end on it. Start and end
+        coordinates of all lines are pulled into NumPy arrays on a single pass
+        over the features and they are grouped into nodes on a single sort.
+        :param lyr: (QgsVectorLayer) line layer.
+        :param onlySelected: (bool) whether only selected features should be
+                             considered.
+        :param tolerance: (float) size of the grid coordinates are snapped to
+                          before being grouped. If None, coordinates must
+                          match exactly to be the same node.
+        :param ignoreMultiPart: (bool) whether features with more than one
+                                part should be ignored. Otherwise, each part
+                                is taken as a line.
+        :param ignoreClosed: (bool) whether lines that start and end on the
+                             same point should be ignored.
+        :param idField: (str) name of the field to be used as line ID. If not
+                        given, feature ID is used.
+        :param featureDict: (dict) if given, it is filled with the read
+                            features ({id : QgsFeature}).
+        :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :param wholeGeometry: (bool) whether only the first and the last
+                              vertices of the whole geometry are taken as its
+                              extremities, instead of the ones of each part.
+        :param boundaryRule: (bool) whether the extremities of each feature
+                             are its boundary, following the GEOS mod-2 rule:
+                             points shared by an even number of part
+                             extremities (e.g. closed lines) are not on the
+                             boundary. Features with non-finite extremities
+                             (i.e. a GEOS invalid boundary) are ignored.
+        :param useZ: (bool) whether Z coordinate is part of the node identity.
+                     Nodes are then given as their WKT (QgsPointXY can't hold
+                     Z values).
+        :return: (dict) { (QgsPointXY) node : { 'start' : [line IDs],
+                 'end' : [line IDs], 'lines' : [line IDs] } }. 'lines' holds
+                 every line touching the node in reading order and node point
+                 is the first line extremity found on it.
+        """
+        iterator, featCount = self.getFeatureList(lyr, onlySelected=onlySelected)
+        size = 100 / featCount if featCount else 0
+        useZ = useZ and QgsWkbTypes.hasZ(lyr.wkbType())
+        dim = 3 if useZ else 2
+        # one record for each extremity, in reading order
+        idList, recordIds, isStart = list(), array('q'), array('b')
+        coords = array('d')
         for current, feat in enumerate(iterator):
             if feedback is not None and feedback.isCanceled():
                 break
             geom = feat.geometry()
-            lineList = geom.asMultiPolyline() if geom.isMultipart() else [
-                geom.asPolyline()]
-            for line in lineList:
-                self.addFeatToDict(
-                    endVerticesDict=endVerticesDict,
-                    line=line,
-                    item=feat if addFeatureToList else feat.id()
+            if geom.isNull() or geom.isEmpty():
+                continue
+            extremities = self.getLineExtremities(
+                geom, wholeGeometry=wholeGeometry, ignoreClosed=ignoreClosed,
+                ignoreMultiPart=ignoreMultiPart
+            )
+            if extremities is None:
+                continue
+            if boundaryRule:
+                extremities = self.getBoundaryExtremities(extremities)
+                if extremities is None:
+                    continue
+            id_ = feat[idField] if idField is not None else feat.id()
+            if featureDict is not None:
+                featureDict[id_] = feat
+            for point, role in extremities:
+                recordIds.append(len(idList))
+                isStart.append(role)
+                coords.extend(
+                    (point.x(), point.y(), point.z() if point.is3D() else 0.) \
+                        if useZ else (point.x(), point.y())
                 )
-            if feedback is not None and recordStepProgress:
-                feedback.setProgress(size*current)
-        return endVerticesDict
+            idList.append(id_)
+            if feedback is not None:
+                feedback.setProgress(size * current)
+        nRecords = len(recordIds)
+        if nRecords == 0:
+            return dict()
+        recordIds = np.frombuffer(recordIds, dtype=np.int64)
+        isStart = np.frombuffer(isStart, dtype=np.int8).astype(bool)
+        points = np.frombuffer(coords, dtype=np.float64).reshape(nRecords, dim)
+        keys = points if tolerance is None else np.round(points / tolerance)
+        order = np.lexsort(keys.T[::-1])
+        sortedKeys = keys[order]
+        newNode = np.ones(nRecords, dtype=bool)
+        newNode[1:] = np.any(sortedKeys[1:] != sortedKeys[:-1], axis=1)
+        nodeMapping = dict()
+        for group in np.split(order, np.flatnonzero(newNode)[1:]):
+            # records are stored in reading order
+            group = np.sort(group)
+            node = QgsPoint(*map(float, points[group[0]])).asWkt() if useZ \
+                else QgsPointXY(*map(float, points[group[0]]))
+            groupIds = recordIds[group]
+            groupIsStart = isStart[group]
+            nodeMapping[node] = {
+                'start': [idList[i] for i in groupIds[groupIsStart]],
+                'end': [idList[i] for i in groupIds[~groupIsStart]],
+                'lines': [idList[i] for i in groupIds]
+            }
+        return nodeMapping
+
+    def getLineExtremities(self, geom, wholeGeometry=False, ignoreClosed=False,
+                           ignoreMultiPart=False):
+        """
+        Gets the extremities of a line geometry.
+        :param geom: (QgsGeometry) line geometry.
+        :param wholeGeometry: (bool) whether only the first and the last
+                              vertices of the whole geometry are considered.
+        :param ignoreClosed: (bool) whether closed lines should be ignored.
+        :param ignoreMultiPart: (bool) whether geometries with more than one
+                                part should be ignored.
+        :return: (list-of-tuple) (QgsPoint, is start point) pairs or None, if
+                 geometry should be ignored.
+        """
+        if wholeGeometry:
+            if ignoreMultiPart and geom.constGet().numGeometries() > 1:
+                return None
+            lines = [(
+                geom.vertexAt(0),
+                geom.vertexAt(geom.constGet().nCoordinates() - 1)
+            )]
+        else:
+            abstractGeom = geom.constGet()
+            parts = [
+                abstractGeom.geometryN(i) \
+                    for i in range(abstractGeom.numGeometries())
+            ] if geom.isMultipart() else [abstractGeom]
+            if ignoreMultiPart and len(parts) > 1:
+                return None
+            lines = [
+                (part.startPoint(), part.endPoint()) \
+                    for part in parts if not part.isEmpty()
+            ]
+        extremities = list()
+        for start, end in lines:
+            if ignoreClosed and start.x() == end.x() and start.y() == end.y():
+                continue
+            extremities.extend(((start, True), (end, False)))
+        return extremities
+
+    def getBoundaryExtremities(self, extremities):
+        """
+        Applies the GEOS mod-2 boundary rule to the extremities of a feature:
+        only points that are the extremity of an odd number of its parts are on
+        its boundary.
+        :param extremities: (list-of-tuple) (QgsPoint, is start point) pairs.
+        :return: (list-of-tuple) (QgsPoint, is start point) pairs on boundary
+                 or None, if boundary is not valid (non-finite coordinates).
+        """
+        countDict = dict()
+        for point, role in extremities:
+            if not (np.isfinite(point.x()) and np.isfinite(point.y())):
+                return None
+            key = (point.x(), point.y())
+            if key in countDict:
+                countDict[key][2] += 1
+            else:
+                countDict[key] = [point, role, 1]
+        return [
+            (point, role) for point, role, count in countDict.values() \
+                if count % 2
+        ]
 
     def getDuplicatedFeaturesDict(self, lyr, onlySelected=False, attributeBlackList=None, ignoreVirtualFields=True, excludePrimaryKeys=True, useAttributes=False, feedback=None):
         """
         returns geomDict = {
-            'bbox_geom' : {geomKey : -list of duplicated feats-}
+            (geometry hash, attribute hash) : -list of duplicated feats-
         }
         """
         geomDict = dict()
         isMulti = QgsWkbTypes.isMultiType(int(lyr.wkbType()))
         iterator, featCount = self.getFeatureList(
             lyr, onlySelected=onlySelected, returnIterator=True)
-        size = 100/featCount if featCount else 0
         columns = self.getAttributesFromBlackList(
             lyr, attributeBlackList=attributeBlackList, ignoreVirtualFields=ignoreVirtualFields, excludePrimaryKeys=excludePrimaryKeys)
         multiStepFeedback = QgsProcessingMultiStepFeedback(
-            2, feedback) if feedback else None
-        multiStepFeedback.setCurrentStep(0)
-        # builds bounding box dict to do a geos comparison for each feat in list
-        bbDict = self.getFeaturesWithSameBoundingBox(
-            iterator, isMulti, featCount, columns=columns, feedback=feedback)
-        multiStepFeedback.setCurrentStep(1)
-        for current, (key, featList) in enumerate(bbDict.items()):
+            3, feedback) if feedback else None
+        if multiStepFeedback is not None:
+            multiStepFeedback.setCurrentStep(0)
+        # builds normalized geometry hash dict: exact duplicates share the
+        # same bucket and only hash collisions need a geos comparison
+        hashDict = self.getFeaturesWithSameGeometryHash(
+            iterator, isMulti, featCount, columns=columns,
+            useAttributes=useAttributes, feedback=multiStepFeedback)
+        if multiStepFeedback is not None:
+            multiStepFeedback.setCurrentStep(1)
+        groupList = []
+        size = 100/len(hashDict) if hashDict else 0
+        for current, (key, featList) in enumerate(hashDict.items()):
             if feedback is not None and feedback.isCanceled():
                 break
-            if len(featList) > 1:
-                duplicatedDict = self.searchDuplicatedFeatures(
+            groupList += [
+                (key, group) for group in self.searchDuplicatedFeatures(
                     featList, columns=columns, useAttributes=useAttributes)
-                geomDict.update(duplicatedDict)
+            ]
+            if multiStepFeedback is not None:
+                multiStepFeedback.setProgress(size * current)
+        if multiStepFeedback is not None:
+            multiStepFeedback.setCurrentStep(2)
+        # topologically equal geometries with different vertices (e.g. an
+        # extra collinear vertex) fall on different buckets
+        for key, group in self.mergeTopologicallyEqualGroups(
+                groupList, feedback=multiStepFeedback):
+            if len(group) < 2:
+                continue
+            if key in geomDict:
+                # groups split by a hash collision
+                key += (len(geomDict), )
+            geomDict[key] = [
+                i['feat'] for i in sorted(group, key=lambda x: x['feat'].id())
+            ]
+        return geomDict
+
+    def mergeTopologicallyEqualGroups(self, groupList, feedback=None):
+        """
+        Merges groups of features whose geometries are topologically equal
+        (GEOS), even though they have different normalized geometries. Only
+        groups with the same bounding box (and attribute hash) are compared.
+        :param groupList: (list-of-tuple) (bucket key, group) pairs, in which
+                          group is a list of {'geom': geom, 'feat': feat,
+                          'attrKey': attrHash}.
+        :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :return: (list-of-tuple) merged (bucket key, group) pairs. Key is the
+                 one from the group with the smallest feature ID.
+        """
+        bboxDict = defaultdict(list)
+        for key, group in groupList:
+            bboxDict[
+                (group[0]['geom'].boundingBox().asWktPolygon(), group[0]['attrKey'])
+            ].append((key, group))
+        mergedList = []
+        size = 100/len(bboxDict) if bboxDict else 0
+        for current, candidates in enumerate(bboxDict.values()):
+            if feedback is not None and feedback.isCanceled():
+                break
+            merged = []
+            for key, group in sorted(candidates, key=lambda x: x[1][0]['feat'].id()):
+                for mergedKey, mergedGroup in merged:
+                    if mergedGroup[0]['geom'].isGeosEqual(group[0]['geom']):
+                        mergedGroup.extend(group)
+                        break
+                else:
+                    merged.append((key, list(group)))
+            mergedList += merged
             if feedback is not None:
                 feedback.setProgress(size * current)
-        return geomDict
+        return mergedList
+
+    def getGeometryHash(self, geom):
+        """
+        Hashes the normalized WKB of a geometry. Normalization sets a canonical
+        vertex order, start point and orientation, hence geometries that only
+        differ on those have the same hash.
+        :param geom: (QgsGeometry) geometry to be hashed. It is not modified.
+        :return: (bytes) geometry digest.
+        """
+        normalized = QgsGeometry(geom)
+        normalized.normalize()
+        return hashlib.blake2b(normalized.asWkb(), digest_size=16).digest()
+
+    def getAttributeHash(self, feat, columns):
+        """
+        Hashes the attribute key of a feature (see appendFeatOnAttrsDict).
+        :param feat: (QgsFeature) feature to have its attributes hashed.
+        :param columns: (list-of-str) names of the attributes to be hashed.
+        :return: (bytes) attribute key digest.
+        """
+        attrKey = ','.join(['{}'.format(feat[column]) for column in columns])
+        return hashlib.blake2b(attrKey.encode('utf-8'), digest_size=16).digest()
 
-    def getFeaturesWithSameBoundingBox(self, iterator, isMulti, size, columns=None, feedback=None):
+    def getFeaturesWithSameGeometryHash(self, iterator, isMulti, size, columns=None, useAttributes=False, feedback=None):
         """
-        Iterates over iterator and gets 
+        Iterates over iterator and groups features by their normalized geometry
+        hash (and by their attribute key hash, if useAttributes is True).
+        :return: (dict) {hash key : [{'geom': geom, 'feat': feat, 'attrKey': attrHash}]}
         """
-        bbDict = defaultdict(list)
+        hashDict = defaultdict(list)
+        columns = columns if columns is not None else []
         if feedback is not None:
             feedback.setProgressText(self.tr("Building duplicated search structure..."))
-        def _buildBBDictEntry(feat, columns):
-            if feedback.isCanceled():
-                return
+        def _buildHashDictEntry(feat):
+            if feedback is not None and feedback.isCanceled():
+                return None
             geom = feat.geometry()
             if isMulti and not geom.isMultipart():
                 geom.convertToMultiType()
-            geomBB_key = geom.boundingBox().asWktPolygon()
-            attrKey = ','.join(['{}'.format(feat[column])
-                                for column in columns]) if columns is not None else ''
-            return (geomBB_key, {'geom': geom, 'feat': feat, 'attrKey': attrKey})
-        futures = set()
-        pool = concurrent.futures.ThreadPoolExecutor(os.cpu_count()-1)
-        func = lambda x: _buildBBDictEntry(x, columns)
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback) if feedback is not None else None
-        multiStepFeedback.setCurrentStep(0)
-        multiStepFeedback.pushInfo(self.tr("Submitting tasks to thread"))
-        for feat in iterator:
-            if feedback is not None and feedback.isCanceled():
-                break
-            futures.add(pool.submit(func, QgsFeature(feat)))
-        multiStepFeedback.setCurrentStep(1)
-        multiStepFeedback.pushInfo(self.tr("Evaluating results"))
-        for current, x in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback is not None and multiStepFeedback.isCanceled():
-                break
-            key, value = x.result()
-            bbDict[key].append(value)
-            if multiStepFeedback is not None:
-                multiStepFeedback.setProgress(size * current)
-        return bbDict
-        # """
-        # Iterates over iterator and gets 
-        # """
-        # bbDict = defaultdict(list)
-        # for current, feat in enumerate(iterator):
-        #     if feedback is not None and feedback.isCanceled():
-        #         break
-        #     geom = feat.geometry()
-        #     if isMulti and not geom.isMultipart():
-        #         geom.convertToMultiType()
-        #     geomKey = geom.asWkb()
-        #     geomBB_key = geom.boundingBox().asWktPolygon()
-        #     attrKey = ','.join(['{}'.format(feat[column])
-        #                         for column in columns]) if columns is not None else ''
-        #     bbDict[geomBB_key].append(
-        #         {'geom': geom, 'feat': feat, 'attrKey': attrKey})
-        #     if feedback is not None:
-        #         feedback.setProgress(size * current)
-        # return bbDict
+            attrKey = self.getAttributeHash(feat, columns) if useAttributes else b''
+            key = (self.getGeometryHash(geom), attrKey)
+            return (key, {'geom': geom, 'feat': feat, 'attrKey': attrKey})
+        for result in ExecutorService.instance().map(
+            _buildHashDictEntry, (QgsFeature(feat) for feat in iterator), feedback=feedback):
+            if result is None:
+                continue
+            key, value = result
+            hashDict[key].append(value)
+        return hashDict
 
     def searchDuplicatedFeatures(self, featList, columns, useAttributes=False):
         """
-        featList = list of {'geom': geom, 'feat':feat}
-        returns {geomKey : -list of duplicated feats-}
-        """
-        duplicatedDict = dict()
-        if featList:
-            fields = [f.name() for f in featList[0]['feat'].fields()]
-        for dict_feat1, dict_feat2 in combinations(featList, 2):
-            geom1 = dict_feat1['geom']
-            geom2 = dict_feat2['geom']
-            feat1 = dict_feat1['feat']
-            feat2 = dict_feat2['feat']
-            wkb1 = geom1.asWkb()
-            wkb2 = geom2.asWkb()
-            if not geom1.isGeosEqual(geom2):
-                continue
-            elif useAttributes:
-                # do things to check attributes
-                try:
-                    for attr in fields:
-                        if attr not in columns:
-                            continue
-                        elif feat1[attr] != feat2[attr]:
-                            raise Exception('Skip outter loop')
-                except:
+        featList = list of {'geom': geom, 'feat':feat, 'attrKey': attrHash}
+        sharing the same hash key. Features are checked against each group's
+        first feature with GEOS, which only splits groups on hash collisions.
+        returns -list of groups of equal feats- (single feature groups
+        included), sorted by feature ID
+        """
+        groups = []
+        for dict_feat in sorted(featList, key=lambda x: x['feat'].id()):
+            for group in groups:
+                ref = group[0]
+                if useAttributes and ref['attrKey'] != dict_feat['attrKey']:
                     continue
-            if wkb1 in duplicatedDict:
-                duplicatedDict[wkb1].append(feat2)
-            elif wkb2 in duplicatedDict:
-                duplicatedDict[wkb2].append(feat1)
+                if ref['geom'].isGeosEqual(dict_feat['geom']):
+                    group.append(dict_feat)
+                    break
             else:
-                duplicatedDict[wkb1] = [feat1, feat2]
-        return duplicatedDict
+                groups.append([dict_feat])
+        return groups
 
     def addFeatToDict(self, endVerticesDict, line, item):
         self.addPointToDict(line[0], endVerticesDict, item)
@@ -948,7 +1126,6 @@ class LayerHandler(QObject):
             inputLyr, onlySelected=onlySelected)
         if featCount == 0:
             return
-        size = 100/featCount
         deleteSet = set()
         inputLyr.startEditing()
         inputLyr.beginEditCommand('Snapping Features')
@@ -970,20 +1147,9 @@ class LayerHandler(QObject):
             if geom is None:
                 return featid
             return featid, outputGeom
-        futures = set()
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()-1)
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback)
+        multiStepFeedback = QgsProcessingMultiStepFeedback(1, feedback)
         multiStepFeedback.setCurrentStep(0)
-        for current, feat in enumerate(iterator):
-            if multiStepFeedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, feat))
-            multiStepFeedback.setProgress(current * size)
-        multiStepFeedback.setCurrentStep(1)
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if multiStepFeedback.isCanceled():
-                break
-            result = future.result()
+        for result in ExecutorService.instance().map(evaluate, iterator, feedback=multiStepFeedback):
             if result is None:
                 continue
             if isinstance(result, int):
@@ -991,8 +1157,6 @@ class LayerHandler(QObject):
                 continue
             featid, outputGeom = result
             inputLyr.changeGeometry(featid, outputGeom)
-            if multiStepFeedback is not None:
-                multiStepFeedback.setProgress(size * current)
         inputLyr.deleteFeatures(list(deleteSet))
         inputLyr.endEditCommand()
 
@@ -1075,13 +1239,6 @@ class LayerHandler(QObject):
     def identifyInvalidGeometries(self, iterator, featCount, inputLyr, ignoreClosed, fixInput, parameterDict, geometryType, feedback=None):
         flagDict = dict()
         newFeatSet = set()
-        stepSize = 100/featCount if featCount else 0
-        futures = set()
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()-1)
-        multiStepFeedback = QgsProcessingMultiStepFeedback(2, feedback) if feedback is not None else None
-        if multiStepFeedback is not None:
-            multiStepFeedback.setCurrentStep(0)
-            multiStepFeedback.pushInfo(self.tr("Submitting tasks to thread..."))
         def evaluate(feat):
             _newFeatSet = set()
             geom = feat.geometry()
@@ -1090,19 +1247,7 @@ class LayerHandler(QObject):
             if fixInput:
                 self.fixGeometryFromInput(inputLyr, parameterDict, geometryType, _newFeatSet, feat, geom, id)
             return flagDict, _newFeatSet
-        for current, feat in enumerate(iterator):
-            if feedback is not None and feedback.isCanceled():
-                break
-            futures.add(pool.submit(evaluate, feat))
-            if feedback is not None:
-                feedback.setProgress(stepSize*current)
-        if multiStepFeedback is not None:
-            multiStepFeedback.setCurrentStep(1)
-            multiStepFeedback.pushInfo(self.tr("Evaluating results..."))
-        for current, future in enumerate(concurrent.futures.as_completed(futures)):
-            if feedback is not None and feedback.isCanceled():
-                break
-            output, _newFeatSet = future.result()
+        for output, _newFeatSet in ExecutorService.instance().map(evaluate, iterator, feedback=feedback):
             if output:
                 for point, errorDict in output.items():
                     if point in flagDict:
@@ -1111,8 +1256,6 @@ class LayerHandler(QObject):
                         flagDict[point] = errorDict
             if _newFeatSet:
                 newFeatSet = newFeatSet.union(_newFeatSet)
-            if feedback is not None:
-                feedback.setProgress(stepSize*current)
         return flagDict, newFeatSet
 
     def checkGeomIsValid(self, geom, ignoreClosed, feedback=None):
@@ -1502,8 +1645,6 @@ class LayerHandler(QObject):
                     if not hasVertex:
                         return geomWkb
             return None
-        pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()-1)
-        futures = set()
         vertexSet = set()
         for feat in pointsLyr.getFeatures():
             # futures.add(pool.submit(compute, feat))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+
+class NestingTree(object):
+    """
+    Nesting tree of regions that never cross each other (e.g. closed contour
+    polygons), independent of any geometry library. Since regions do not
+    cross, a region is nested inside another one whenever any of its interior
+    points is (vertices may lie on a boundary shared by both regions). Hence
+    each region's direct parent (the smallest region that contains it) is
+    found from a single containment test per candidate, taking the candidates
+    from the smallest to the largest.
+    Regions are referred to by their position on the tree, which must follow
+    their order by area, smallest first.
+    """
+    NO_PARENT = -1
+
+    def __init__(self, size):
+        """
+        Class constructor.
+        :param size: (int) number of regions.
+        """
+        self.parents = [self.NO_PARENT] * size
+        self.children = [[] for _ in range(size)]
+
+    def __len__(self):
+        return len(self.parents)
+
+    @staticmethod
+    def bboxContains(outer, inner):
+        """
+        :param outer: (tuple) (xmin, ymin, xmax, ymax) of a bounding box.
+        :param inner: (tuple) (xmin, ymin, xmax, ymax) of a bounding box.
+        :return: (bool) whether outer holds inner.
+        """
+        return outer[0] <= inner[0] and outer[1] <= inner[1] \
+            and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+    def build(self, bboxes, contains, candidates=None, feedback=None):
+        """
+        Finds the direct parent of each region.
+        :param bboxes: (list-of-tuple) (xmin, ymin, xmax, ymax) of each region.
+        :param contains: (callable) receives the positions of a candidate and
+                         of a region and tells whether the candidate contains
+                         the region (e.g. a point on its surface).
+        :param candidates: (callable) receives a region's position and returns
+                           the positions of the regions whose bounding boxes
+                           intersect its own (e.g. from a spatial index). Every
+                           region is a candidate if it is not given.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        """
+        nRegions = len(self)
+        size = 100 / nRegions if nRegions else 0
+        for idx in range(nRegions):
+            if feedback is not None and feedback.isCanceled():
+                break
+            # only larger regions whose bounding boxes hold region's may
+            # contain it, and the first of them (by area) that does is its
+            # direct parent
+            candIds = range(idx + 1, nRegions) if candidates is None \
+                else sorted(candId for candId in candidates(idx) if candId > idx)
+            for candId in candIds:
+                if not self.bboxContains(bboxes[candId], bboxes[idx]):
+                    continue
+                if contains(candId, idx):
+                    self.parents[idx] = candId
+                    self.children[candId].append(idx)
+                    break
+            if feedback is not None:
+                feedback.setProgress(size * idx)
+
+    def roots(self):
+        """
+        :return: (list-of-int) positions of the outermost regions.
+        """
+        return [idx for idx, parent in enumerate(self.parents) if parent == self.NO_PARENT]
+
+    def leaves(self):
+        """
+        :return: (list-of-int) positions of the innermost regions (hilltops
+                 or depression bottoms).
+        """
+        return [idx for idx, children in enumerate(self.children) if not children]
+
+    def ancestors(self, idx):
+        """
+        :param idx: (int) region's position.
+        :return: (list-of-int) positions of the regions that contain it,
+                 from the innermost to the outermost.
+        """
+        ancestorList = []
+        parent = self.parents[idx]
+        while parent != self.NO_PARENT:
+            ancestorList.append(parent)
+            parent = self.parents[parent]
+        return ancestorList
+
+    def edges(self):
+        """
+        :return: (generator) (child, parent) pairs of positions of each nested
+                 region and its direct parent.
+        """
+        return (
+            (idx, parent) for idx, parent in enumerate(self.parents) \
+                if parent != self.NO_PARENT
+        )
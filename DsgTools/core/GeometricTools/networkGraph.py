@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+from array import array
+
+
+class Bitset(object):
+    """
+    Set of non-negative integers stored as bits.
+    """
+    def __init__(self, size=0):
+        self._bits = bytearray((size + 7) >> 3)
+
+    def __contains__(self, idx):
+        byte = idx >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (idx & 7)))
+
+    def add(self, idx):
+        """
+        :param idx: (int) value to be added.
+        :return: (bool) whether value was not on the set yet.
+        """
+        byte = idx >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytearray(byte - len(self._bits) + 1))
+        mask = 1 << (idx & 7)
+        isNew = not self._bits[byte] & mask
+        self._bits[byte] |= mask
+        return isNew
+
+    def discard(self, idx):
+        byte = idx >> 3
+        if byte < len(self._bits):
+            self._bits[byte] &= ~(1 << (idx & 7)) & 0xFF
+
+
+class ValidatedLinesView(object):
+    """
+    Read-only view of the validated lines of a NetworkGraph. It may be used
+    wherever a collection of validated lines (QgsFeature) is expected and
+    membership tests are O(1).
+    """
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __contains__(self, line):
+        return self.graph.isValidated(line)
+
+    def __iter__(self):
+        validated = self.graph.validatedLines
+        return (
+            line for idx, line in enumerate(self.graph.lines) if idx in validated
+        )
+
+    def __len__(self):
+        return self.graph.validatedCount
+
+
+class NetworkGraph(object):
+    """
+    Compact representation of a line network built from a node dictionary in
+    the format returned by NetworkHandler.identifyAllNodes. Nodes and lines are
+    mapped to integer IDs, the lines starting/ending at each node are stored on
+    adjacency arrays and the visited nodes and validated lines are stored on
+    bitsets.
+    """
+    def __init__(self, nodeDict):
+        """
+        :param nodeDict: (dict) { (QgsPoint) node : { 'start' : [QgsFeature],
+                         'end' : [QgsFeature] } }.
+        """
+        self.nodes = list(nodeDict.keys())
+        self.nodeIds = {node: idx for idx, node in enumerate(self.nodes)}
+        self.lines, self.lineIds = list(), dict()
+        self.startLines, self.endLines = list(), list()
+        for node in self.nodes:
+            self.startLines.append(
+                array('l', map(self.addLine, nodeDict[node]['start']))
+            )
+            self.endLines.append(
+                array('l', map(self.addLine, nodeDict[node]['end']))
+            )
+        self.visitedNodes = Bitset(len(self.nodes))
+        self.validatedLines = Bitset(len(self.lines))
+        self.validatedCount = 0
+        self.validLines = ValidatedLinesView(self)
+
+    def addLine(self, line):
+        """
+        Registers a line into the graph.
+        :param line: (QgsFeature) network line.
+        :return: (int) line's graph ID.
+        """
+        featId = line.id()
+        if featId not in self.lineIds:
+            self.lineIds[featId] = len(self.lines)
+            self.lines.append(line)
+        return self.lineIds[featId]
+
+    def replaceLine(self, line):
+        """
+        Updates the feature stored for a line (e.g. after its geometry is
+        modified on a merge).
+        :param line: (QgsFeature) updated network line.
+        """
+        self.lines[self.addLine(line)] = line
+
+    def nodeId(self, node):
+        """
+        :param node: (QgsPoint) network node.
+        :return: (int) node's graph ID or None if node is not on the graph.
+        """
+        return self.nodeIds.get(node)
+
+    def nodeStartLines(self, nodeId):
+        """
+        :param nodeId: (int) node's graph ID.
+        :return: (list-of-QgsFeature) lines starting at node.
+        """
+        return [self.lines[idx] for idx in self.startLines[nodeId]]
+
+    def nodeEndLines(self, nodeId):
+        """
+        :param nodeId: (int) node's graph ID.
+        :return: (list-of-QgsFeature) lines ending at node.
+        """
+        return [self.lines[idx] for idx in self.endLines[nodeId]]
+
+    def changeLineDirection(self, nodeId, line):
+        """
+        Moves a line from the start adjacency array of a node to its end
+        adjacency array and vice-versa. Mirrors NetworkHandler.changeLineDict.
+        :param nodeId: (int) node's graph ID.
+        :param line: (QgsFeature) flipped line.
+        :return: (bool) whether line was connected to node.
+        """
+        idx = self.lineIds.get(line.id())
+        if idx is None:
+            return False
+        start, end = self.startLines[nodeId], self.endLines[nodeId]
+        if idx in start:
+            start.remove(idx)
+            end.append(idx)
+        elif idx in end:
+            end.remove(idx)
+            start.append(idx)
+        else:
+            return False
+        return True
+
+    def visit(self, nodeId):
+        self.visitedNodes.add(nodeId)
+
+    def isVisited(self, nodeId):
+        return nodeId in self.visitedNodes
+
+    def validate(self, lineDict):
+        """
+        Marks lines as validated.
+        :param lineDict: (dict) { (int) feature ID : (QgsFeature) line }.
+        """
+        for line in lineDict.values():
+            if self.validatedLines.add(self.addLine(line)):
+                self.validatedCount += 1
+
+    def isValidated(self, line):
+        """
+        :param line: (QgsFeature) network line.
+        :return: (bool) whether line was validated.
+        """
+        idx = self.lineIds.get(line.id())
+        return idx is not None and idx in self.validatedLines
@@ -23,10 +23,12 @@
 from __future__ import absolute_import
 from builtins import range
 from itertools import combinations, chain
+from collections import OrderedDict
 import math
 from math import pi
 from .geometryHandler import GeometryHandler
 from .layerHandler import LayerHandler
+from .networkGraph import NetworkGraph
 from qgis.core import QgsMessageLog, QgsVectorLayer, QgsGeometry, QgsField, \
                       QgsVectorDataProvider, QgsFeatureRequest, QgsExpression, \
                       QgsFeature, QgsSpatialIndex, Qgis, QgsCoordinateTransform, \
@@ -47,6 +49,7 @@ class NetworkHandler(QObject):
         self.layerHandler = LayerHandler()
         self.nodeDict = None
         self.nodeTypeDict = None
+        self.networkGraph = None
         self.nodeTypeNameDict = {
             NetworkHandler.Flag : self.tr("Flag"),#0
             NetworkHandler.Sink : self.tr("Sink"),#1
@@ -82,42 +85,21 @@ class NetworkHandler(QObject):
                 }
             }
         """
-        nodeDict = dict()
-        isMulti = QgsWkbTypes.isMultiType(int(networkLayer.wkbType()))
-        iterator = networkLayer.getFeatures() if not onlySelected else networkLayer.getSelectedFeatures()
-        featCount = networkLayer.featureCount() if not onlySelected else networkLayer.selectedFeatureCount()
-        size = 100/featCount if featCount else 0
-        for current, feat in enumerate(iterator):
-            if feedback is not None and feedback.isCanceled():
-                break
-            nodes = self.geometryHandler.getFeatureNodes(networkLayer, feat)
-            if nodes != []:
-                if isMulti:
-                    if len(nodes) > 1:
-                        # if feat is multipart and has more than one part, a flag should be raised
-                        continue # CHANGE TO RAISE FLAG
-                    elif len(nodes) == 0:
-                        # if no part is found, skip feature
-                        continue
-                    else:
-                        # if feat is multipart, "nodes" is a list of list
-                        nodes = nodes[0]                
-                # initial node
-                pInit, pEnd = nodes[0], nodes[-1]
-                # filling starting node information into dictionary
-                if pInit not in nodeDict:
-                    # if the point is not already started into dictionary, it creates a new item
-                    nodeDict[pInit] = { 'start' : [], 'end' : [] }
-                if feat not in nodeDict[pInit]['start']:
-                    nodeDict[pInit]['start'].append(feat)                            
-                # filling ending node information into dictionary
-                if pEnd not in nodeDict:
-                    nodeDict[pEnd] = { 'start' : [], 'end' : [] }
-                if feat not in nodeDict[pEnd]['end']:
-                    nodeDict[pEnd]['end'].append(feat)
-            if feedback is not None:
-                feedback.setProgress(size * current)
-        return nodeDict
+        featureDict = dict()
+        # multipart features with more than one part are not handled
+        nodeMapping = self.layerHandler.buildLineEndpointNodeMapping(
+            networkLayer,
+            onlySelected=onlySelected,
+            ignoreMultiPart=True,
+            featureDict=featureDict,
+            feedback=feedback
+        )
+        return {
+            node : {
+                'start' : [featureDict[i] for i in nodeLines['start']],
+                'end' : [featureDict[i] for i in nodeLines['end']]
+            } for node, nodeLines in nodeMapping.items()
+        }
 
     def changeLineDict(self, nodeList, line):
         """
@@ -140,6 +122,11 @@ class NetworkHandler(QObject):
             else:
                 # if line is not found for some reason
                 return False
+            if self.networkGraph is not None:
+                # keeps graph's adjacency arrays in sync
+                self.networkGraph.changeLineDirection(
+                    self.networkGraph.nodeId(node), line
+                )
         # if a nodeList is not found, method doesn't change anything
         return bool(nodeList)
 
@@ -872,7 +859,10 @@ class NetworkHandler(QObject):
         flow = flowType[int(nodeType)]
         nodePointDict = self.nodeDict[node]
         # getting all connected lines to node that are not already validated
-        linesNotValidated = set( nodePointDict['start']  + nodePointDict['end'] ) - set(connectedValidLines)
+        linesNotValidated = {
+            line.id() : line for line in nodePointDict['start'] + nodePointDict['end'] \
+                if line not in connectedValidLines
+        }.values()
         # starting dicts of valid and invalid lines
         validLines, invalidLines = dict(), dict()
         if not flow:
@@ -1003,11 +993,16 @@ class NetworkHandler(QObject):
         if not geomType:
             geomType = networkLayer.geometryType()
         nextNodes = []
-        nodePointDict = self.nodeDict[node]
-        for line in nodePointDict['start']:
+        nodeId = self.networkGraph.nodeId(node) if self.networkGraph is not None else None
+        if nodeId is not None:
+            startLines = self.networkGraph.nodeStartLines(nodeId)
+            endLines = self.networkGraph.nodeEndLines(nodeId)
+        else:
+            startLines, endLines = self.nodeDict[node]['start'], self.nodeDict[node]['end']
+        for line in startLines:
             # if line starts at target node, the other extremity is a final node
             nextNodes.append(self.getLastNode(lyr=networkLayer, feat=line, geomType=geomType))
-        for line in nodePointDict['end']:
+        for line in endLines:
             # if line ends at target node, the other extremity is a initial node
             nextNodes.append(self.getFirstNode(lyr=networkLayer, feat=line, geomType=geomType))
         return nextNodes
@@ -1093,36 +1088,39 @@ class NetworkHandler(QObject):
                 return None, None, self.tr("No network starting point was found")
         # to avoid unnecessary calculations
         geomType = networkLayer.geometryType()
-        # initiating the list of nodes already checked and the list of nodes to be checked next iteration
-        visitedNodes, newNextNodes = [], []
+        # integer node IDs, adjacency arrays and visited/validated bitsets
+        self.networkGraph = graph = NetworkGraph(self.nodeDict)
         nodeFlags = dict()
         # starting dict of (in)valid lines to be returned by the end of method
         validLines, invalidLines = dict(), dict()
+        # O(1) membership view over validated lines
+        validLinesList = graph.validLines
         # initiate relation of modified features
         flippedLinesIds, mergedLinesString = set([]), ""
         while nodeList:
+            # nodes to be checked next iteration, kept in discovery order
+            newNextNodes = OrderedDict()
             for node in nodeList:
                 # first thing to be done: check if there are more than one non-validated line (hence, enough information for a decision)
-                if node in self.nodeDict:
-                    startLines = self.nodeDict[node]['start']
-                    endLines = self.nodeDict[node]['end']
-                    if node not in self.nodeTypeDict:
-                        # in case node is not classified
-                        self.nodeTypeDict[node] = self.classifyNode([node, nodeLayer])
-                        self.reclassifyNodeType[node] = self.nodeTypeDict[node]
-                else:
-                    # ignore node for possible next iterations by adding it to visited nodes
-                    visitedNodes.append(node)
+                nodeId = graph.nodeId(node)
+                if nodeId is None:
+                    # ignore node for possible next iterations
                     continue
+                startLines = graph.nodeStartLines(nodeId)
+                endLines = graph.nodeEndLines(nodeId)
+                if node not in self.nodeTypeDict:
+                    # in case node is not classified
+                    self.nodeTypeDict[node] = self.classifyNode([node, nodeLayer])
+                    self.reclassifyNodeType[node] = self.nodeTypeDict[node]
                 nodeLines = startLines + endLines
-                validLinesList = validLines.values()
-                if len(set(nodeLines) - set(validLinesList)) > 1:
+                notValidatedIds = {line.id() for line in nodeLines if line not in validLinesList}
+                if len(notValidatedIds) > 1:
                     hasStartCondition, flippedLines = self.checkForStartConditions(node=node, validLines=validLinesList, networkLayer=networkLayer, nodeLayer=nodeLayer, geomType=geomType)
                     if hasStartCondition:
                         flippedLinesIds |= set(flippedLines)
                     else:
                         # if it is not connected to a start condition, check if node has a valid line connected to it
-                        if (set(nodeLines) & set(validLinesList)):
+                        if len(notValidatedIds) < len({line.id() for line in nodeLines}):
                             # if it does and, check if it is a valid node
                             val, inval, reason = self.checkNodeValidity(node=node, connectedValidLines=validLinesList,\
                                                                         networkLayer=networkLayer, deltaLinesCheckList=deltaLinesCheckList, geomType=geomType)
@@ -1159,30 +1157,34 @@ class NetworkHandler(QObject):
                     # if node is still invalid, add to nodeFlagList and add/update its reason
                     if reason:
                         nodeFlags[node] = reason
-                    # get next nodes connected to invalid lines
+                    # get next nodes connected to invalid lines. Lines may
+                    # have been flipped while fixing the node, hence its end
+                    # lines are read again from the graph
+                    endLineIds = {line.id() for line in graph.nodeEndLines(nodeId)}
                     for line in inval.values():
-                        if line in endLines:
+                        if line.id() in endLineIds:
                             removeNode.append(self.getFirstNode(lyr=networkLayer, feat=line))
                         else:
                             removeNode.append(self.getLastNode(lyr=networkLayer, feat=line))
                 # set node as visited
-                if node not in visitedNodes:
-                    visitedNodes.append(node)
+                graph.visit(nodeId)
                 # update general dictionaries with final values
                 validLines.update(val)
+                graph.validate(val)
                 invalidLines.update(inval)
                 # get next iteration nodes
-                newNextNodes += self.getNextNodes(node=node, networkLayer=networkLayer, geomType=geomType)
+                for nextNode in self.getNextNodes(node=node, networkLayer=networkLayer, geomType=geomType):
+                    nextNodeId = graph.nodeId(nextNode)
+                    if nextNodeId is not None:
+                        newNextNodes[nextNodeId] = None
                 # remove next nodes connected to invalid lines
-                if removeNode:
-                    newNextNodes = list( set(newNextNodes) - set(removeNode) )
-            # remove nodes that were already visited
-            newNextNodes = list( set(newNextNodes) - set(visitedNodes) )
-            # if new nodes are detected, repeat for those
-            nodeList = newNextNodes
-            newNextNodes = []
+                for removedNode in removeNode:
+                    newNextNodes.pop(graph.nodeId(removedNode), None)
+            # remove nodes that were already visited and repeat for new nodes, if any
+            nodeList = [graph.nodes[idx] for idx in newNextNodes if not graph.isVisited(idx)]
         # log all features that were merged and/or flipped
         self.logAlteredFeatures(flippedLines=flippedLinesIds, mergedLinesString=mergedLinesString)
+        self.networkGraph = None
         return nodeFlags, invalidLines, validLines
 
     # method for automatic fix
@@ -1257,12 +1259,12 @@ class NetworkHandler(QObject):
         # it is considered that 
         if endDict:
             # get invalid line connected to node
-            invalidLine = list(set(endDict) - set(validLines))
+            invalidLine = [line for line in endDict if line not in validLines]
             if invalidLine:
                 invalidLine = invalidLine[0]
         else:
             # get invalid line connected to node
-            invalidLine = list(set(startDict) - set(validLines))
+            invalidLine = [line for line in startDict if line not in validLines]
             if invalidLine:
                 invalidLine = invalidLine[0]
         # if no invalid lines are identified, something else is wrong and flipping won't be the solution
@@ -1290,6 +1292,8 @@ class NetworkHandler(QObject):
                 if line.id() == line_b.id():
                     self.nodeDict[nn]['end'].remove(line)
                     self.nodeDict[nn]['end'].append(line_b)
+                    if self.networkGraph is not None:
+                        self.networkGraph.replaceLine(line_b)
         # remove attribute change flag node (there are no lines connected to it anymore)
         self.nodesToPop.append(node)
         return self.tr('{0} to {1}').format(line_a.id(), line_b.id())
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import numpy as np
+
+
+class PointMatchingEngine(object):
+    """
+    Matches point sets to their nearest reference point within a tolerance.
+    Reference points are bucketed on a regular grid (with cells at least as
+    large as the tolerance) and sorted by their cell keys, so that the
+    candidates of every query point are found with binary searches over its
+    3x3 neighbour cells. Every step is vectorized with numpy.
+    """
+    # cells per axis are capped to keep cell keys within int64
+    MAX_CELLS_PER_AXIS = 2 ** 20
+    # number of query points matched at once (bounds memory usage)
+    DEFAULT_BATCH_SIZE = 100000
+
+    def __init__(self, referenceCoords, tolerance, batchSize=None):
+        """
+        Class constructor. Builds the grid of reference points.
+        :param referenceCoords: (np.ndarray) (n, 2) reference coordinates.
+        :param tolerance: (float) maximum matching distance.
+        :param batchSize: (int) number of query points matched at once.
+        """
+        self.referenceCoords = np.asarray(referenceCoords, dtype=np.float64).reshape(-1, 2)
+        self.tolerance = float(tolerance)
+        self.batchSize = batchSize or self.DEFAULT_BATCH_SIZE
+        if len(self.referenceCoords) == 0:
+            return
+        self.origin = self.referenceCoords.min(axis=0)
+        span = float((self.referenceCoords.max(axis=0) - self.origin).max())
+        self.cellSize = max(
+            self.tolerance, span / (self.MAX_CELLS_PER_AXIS - 3), np.finfo(np.float64).tiny
+        )
+        # one spare cell on each side for the neighbour offsets
+        self.width = int(span // self.cellSize) + 3
+        cells = self.cells(self.referenceCoords)
+        keys = self.cellKeys(cells[:, 0], cells[:, 1])
+        self.order = np.argsort(keys, kind='stable')
+        self.sortedKeys = keys[self.order]
+
+    def cells(self, coords):
+        """
+        :param coords: (np.ndarray) (n, 2) coordinates.
+        :return: (np.ndarray) (n, 2) grid cell of each point, shifted by one.
+        """
+        return np.floor((coords - self.origin) / self.cellSize).astype(np.int64) + 1
+
+    def cellKeys(self, col, row):
+        return col * self.width + row
+
+    def _matchBatch(self, coords):
+        cells = self.cells(coords)
+        # points outside the grid (plus its spare cells) have no candidates
+        inside = np.all((cells >= 0) & (cells < self.width), axis=1)
+        queryIdx = np.flatnonzero(inside)
+        cells = cells[inside]
+        pairQuery, pairReference = [], []
+        for dc in (-1, 0, 1):
+            for dr in (-1, 0, 1):
+                keys = self.cellKeys(cells[:, 0] + dc, cells[:, 1] + dr)
+                start = np.searchsorted(self.sortedKeys, keys, side='left')
+                counts = np.searchsorted(self.sortedKeys, keys, side='right') - start
+                total = int(counts.sum())
+                if not total:
+                    continue
+                # expands each query's [start, end) range into candidate pairs
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                pairQuery.append(np.repeat(queryIdx, counts))
+                pairReference.append(self.order[np.repeat(start, counts) + offsets])
+        matches = np.full(len(coords), -1, dtype=np.int64)
+        distances = np.full(len(coords), np.nan)
+        if not pairQuery:
+            return matches, distances
+        pairQuery = np.concatenate(pairQuery)
+        pairReference = np.concatenate(pairReference)
+        delta = coords[pairQuery] - self.referenceCoords[pairReference]
+        squared = np.einsum('ij,ij->i', delta, delta)
+        within = squared <= self.tolerance ** 2
+        pairQuery, pairReference, squared = \
+            pairQuery[within], pairReference[within], squared[within]
+        # nearest candidate (ties broken by reference order) of each query
+        sortIdx = np.lexsort((pairReference, squared, pairQuery))
+        _, first = np.unique(pairQuery[sortIdx], return_index=True)
+        best = sortIdx[first]
+        matches[pairQuery[best]] = pairReference[best]
+        distances[pairQuery[best]] = np.sqrt(squared[best])
+        return matches, distances
+
+    def match(self, coords, feedback=None):
+        """
+        Finds the nearest reference point of each point within tolerance.
+        :param coords: (np.ndarray) (m, 2) query coordinates.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        :return: (tuple) arrays with the index of the matched reference point
+                 of each query point (-1 when there is none) and the distance
+                 to it (NaN when there is none).
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        matches = np.full(len(coords), -1, dtype=np.int64)
+        distances = np.full(len(coords), np.nan)
+        if len(self.referenceCoords) == 0:
+            return matches, distances
+        for start in range(0, len(coords), self.batchSize):
+            if feedback is not None and feedback.isCanceled():
+                break
+            end = start + self.batchSize
+            matches[start:end], distances[start:end] = self._matchBatch(coords[start:end])
+            if feedback is not None:
+                feedback.setProgress(100 * min(end, len(coords)) / len(coords))
+        return matches, distances
+
+    @staticmethod
+    def statistics(distances, frequency=0.9):
+        """
+        Computes the accuracy statistics of matched distances.
+        :param distances: (np.ndarray) distances (NaN values are ignored).
+        :param frequency: (float) percentile frequency, from 0 to 1.
+        :return: (dict) 'count', 'mean', 'rms' and 'percentile' values (None
+                 when there is no distance).
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        distances = distances[~np.isnan(distances)]
+        if not len(distances):
+            return {'count': 0, 'mean': None, 'rms': None, 'percentile': None}
+        return {
+            'count': int(len(distances)),
+            'mean': float(distances.mean()),
+            'rms': float(np.sqrt(np.mean(distances ** 2))),
+            'percentile': float(np.percentile(distances, 100 * frequency)),
+        }
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import threading
+
+import numpy as np
+from osgeo import gdal
+
+
+class RasterBlockReader(object):
+    """
+    Reads a raster band window by window, following the raster's native block
+    layout, so that memory is bounded by the window size. GDAL datasets must
+    not be shared between threads, hence each thread reading windows opens
+    its own dataset.
+    """
+    # windows are made of whole native blocks up to about that many pixels
+    DEFAULT_WINDOW_PIXELS = 4 * 1024 ** 2
+
+    def __init__(self, filePath, band=1, windowPixels=None):
+        """
+        Class constructor.
+        :param filePath: (str) raster's path (any GDAL-readable source).
+        :param band: (int) band number, from 1.
+        :param windowPixels: (int) approximate number of pixels per window.
+        """
+        self.filePath = filePath
+        self.bandNumber = band
+        self.windowPixels = windowPixels or self.DEFAULT_WINDOW_PIXELS
+        # datasets by thread id
+        self._datasets = dict()
+        self._lock = threading.Lock()
+        ds = self.dataset()
+        rasterBand = ds.GetRasterBand(band)
+        self.xSize, self.ySize = ds.RasterXSize, ds.RasterYSize
+        self.blockXSize, self.blockYSize = rasterBand.GetBlockSize()
+        self.noDataValue = rasterBand.GetNoDataValue()
+
+    def dataset(self):
+        """
+        :return: (gdal.Dataset) current thread's dataset.
+        """
+        threadId = threading.get_ident()
+        ds = self._datasets.get(threadId)
+        if ds is None:
+            ds = gdal.Open(self.filePath, gdal.GA_ReadOnly)
+            if ds is None:
+                raise Exception('Unable to open {0}'.format(self.filePath))
+            with self._lock:
+                self._datasets[threadId] = ds
+        return ds
+
+    def band(self):
+        """
+        :return: (gdal.Band) current thread's band.
+        """
+        return self.dataset().GetRasterBand(self.bandNumber)
+
+    def windows(self, region=None):
+        """
+        Splits the raster (or a region of it) into windows of whole native
+        blocks. Windows span whole block columns (or as many as fit) and as
+        many block rows as fit into windowPixels. Windows of a region are
+        still aligned to the block grid and are clipped to the region.
+        :param region: (tuple) (xOff, yOff, xSize, ySize) region to be split.
+                       Defaults to the whole raster.
+        :return: (generator) (xOff, yOff, xSize, ySize) of each window.
+        """
+        xMin, yMin, xSize, ySize = region or (0, 0, self.xSize, self.ySize)
+        xMax, yMax = xMin + xSize, yMin + ySize
+        blockPixels = max(1, self.blockXSize * self.blockYSize)
+        blocksPerWindow = max(1, self.windowPixels // blockPixels)
+        xBlocks = max(1, min(blocksPerWindow, -(-xSize // self.blockXSize)))
+        yBlocks = max(1, blocksPerWindow // xBlocks)
+        width, height = xBlocks * self.blockXSize, yBlocks * self.blockYSize
+        # first window starts at the block that holds region's origin
+        xStart = (xMin // self.blockXSize) * self.blockXSize
+        yStart = (yMin // self.blockYSize) * self.blockYSize
+        for yOff in range(yStart, yMax, height):
+            for xOff in range(xStart, xMax, width):
+                x0, y0 = max(xOff, xMin), max(yOff, yMin)
+                yield (
+                    x0,
+                    y0,
+                    min(xOff + width, xMax) - x0,
+                    min(yOff + height, yMax) - y0
+                )
+
+    def read(self, window):
+        """
+        Reads a window of the band.
+        :param window: (tuple) (xOff, yOff, xSize, ySize).
+        :return: (np.ndarray) window's values.
+        """
+        return self.band().ReadAsArray(*window)
+
+    def validMask(self, values):
+        """
+        :param values: (np.ndarray) band values.
+        :return: (np.ndarray) boolean mask of the values that are not nodata.
+        """
+        mask = np.ones(values.shape, dtype=bool)
+        if np.issubdtype(values.dtype, np.floating):
+            mask &= ~np.isnan(values)
+        if self.noDataValue is not None and not np.isnan(self.noDataValue):
+            mask &= values != self.noDataValue
+        return mask
+
+    def readValid(self, window):
+        """
+        Reads the valid (not nodata) values of a window.
+        :param window: (tuple) (xOff, yOff, xSize, ySize).
+        :return: (np.ndarray) flat array of valid values.
+        """
+        values = self.read(window)
+        return values[self.validMask(values)]
+
+    def close(self):
+        """
+        Closes the datasets of every thread. Must not be called while windows
+        are being read.
+        """
+        with self._lock:
+            self._datasets = dict()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import numpy as np
+
+from DsgTools.core.Utils.executorService import ExecutorService
+from .rasterBlockReader import RasterBlockReader
+
+
+class RasterHistogram(object):
+    """
+    Histogram of a raster band's valid (not nodata) values, accumulated
+    window by window on the shared worker pool, so that memory is bounded by
+    the window size instead of the raster size. Bins are either of a fixed
+    width (exact counts for rasters of discrete values, e.g. sliced DEMs) or
+    adapted to the band's value range.
+    """
+    DEFAULT_NUMBER_OF_BINS = 4096
+
+    def __init__(self, filePath=None, band=1, binWidth=None, numberOfBins=None,
+        windowPixels=None, reader=None):
+        """
+        Class constructor. Nothing is read until compute is called.
+        :param filePath: (str) raster's path.
+        :param band: (int) band number, from 1.
+        :param binWidth: (float) fixed bin width. Bins are aligned to
+                         multiples of it.
+        :param numberOfBins: (int) number of bins spanning the band's value
+                             range, when binWidth is not given.
+        :param windowPixels: (int) approximate number of pixels per window.
+        :param reader: (object) source of values used instead of filePath's
+                       band. Must provide windows(), readValid(window) and
+                       close(), like RasterBlockReader.
+        """
+        self.reader = reader or RasterBlockReader(
+            filePath, band=band, windowPixels=windowPixels)
+        self.binWidth = binWidth or None
+        self.numberOfBins = numberOfBins or self.DEFAULT_NUMBER_OF_BINS
+        self.minValue = None
+        self.maxValue = None
+        self.origin = None
+        self.counts = None
+
+    def _windowMinMax(self, window):
+        values = self.reader.readValid(window)
+        if not values.size:
+            return None
+        return values.min(), values.max()
+
+    def _windowCounts(self, window):
+        values = self.reader.readValid(window)
+        idx = np.floor((values - self.origin) / self.binWidth).astype(np.int64)
+        # maximum value falls on the last bin
+        np.clip(idx, 0, len(self.counts) - 1, out=idx)
+        return np.bincount(idx, minlength=len(self.counts))
+
+    def compute(self, feedback=None):
+        """
+        Reads the band twice: once for its value range and once for the
+        counts.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation.
+        :return: (RasterHistogram) self.
+        """
+        executor = ExecutorService.instance()
+        windows = list(self.reader.windows())
+        for result in executor.map(self._windowMinMax, windows, chunkSize=1, feedback=feedback):
+            if result is None:
+                continue
+            self.minValue = result[0] if self.minValue is None else min(self.minValue, result[0])
+            self.maxValue = result[1] if self.maxValue is None else max(self.maxValue, result[1])
+        if self.minValue is None:
+            # no valid pixel
+            self.counts = np.zeros(0, dtype=np.int64)
+            return self
+        if self.binWidth is None:
+            span = float(self.maxValue) - float(self.minValue)
+            self.binWidth = span / self.numberOfBins if span > 0 else 1.0
+            self.origin = float(self.minValue)
+        else:
+            self.origin = np.floor(float(self.minValue) / self.binWidth) * self.binWidth
+        nBins = int(np.floor((float(self.maxValue) - self.origin) / self.binWidth)) + 1
+        self.counts = np.zeros(nBins, dtype=np.int64)
+        for counts in executor.map(self._windowCounts, windows, chunkSize=1, feedback=feedback):
+            self.counts += counts
+        return self
+
+    def total(self):
+        return int(self.counts.sum()) if self.counts is not None else 0
+
+    def binValue(self, idx):
+        """
+        :param idx: (int) bin index.
+        :return: (float) lower edge of the bin.
+        """
+        return self.origin + idx * self.binWidth
+
+    def quantiles(self, frequencies):
+        """
+        Gets the values at which the cumulative distribution reaches each
+        frequency (lower edges of the bins where it does).
+        :param frequencies: (iterable-of-float) frequencies, from 0 to 1.
+        :return: (list-of-float) value of each frequency.
+        """
+        if not self.total():
+            return []
+        cumulative = np.cumsum(self.counts) / self.total()
+        idx = np.searchsorted(cumulative, np.asarray(list(frequencies)))
+        idx = np.clip(idx, 0, len(self.counts) - 1)
+        return [self.binValue(i) for i in idx.tolist()]
+
+    def close(self):
+        self.reader.close()
@@ -22,7 +22,8 @@
 """
 from __future__ import absolute_import
 
-from itertools import tee, combinations
+import concurrent.futures
+from itertools import combinations
 from collections import defaultdict, OrderedDict
 
 from qgis.core import (Qgis,
@@ -33,6 +34,7 @@ from qgis.core import (Qgis,
                        QgsVectorLayer,
                        QgsSpatialIndex,
                        QgsFeatureRequest,
+                       QgsVectorLayerFeatureSource,
                        QgsProcessingContext,
                        QgsProcessingFeedback,
                        QgsProcessingMultiStepFeedback)
@@ -44,7 +46,10 @@ from qgis.PyQt.QtGui import QRegExpValidator
 from .featureHandler import FeatureHandler
 from .geometryHandler import GeometryHandler
 from .layerHandler import LayerHandler
+from .filteredLayerCache import FilteredLayerCache
+from .contourNestingTree import ContourNestingTree
 from DsgTools.core.DSGToolsProcessingAlgs.algRunner import AlgRunner
+from DsgTools.core.Utils.executorService import getWorkerCount
 
 class SpatialRelationsHandler(QObject):
     __predicates = (
@@ -78,6 +83,7 @@ class SpatialRelationsHandler(QObject):
         self.featureHandler = FeatureHandler(iface)
         self.geometryHandler = GeometryHandler(iface)
         self.algRunner = AlgRunner()
+        self.layerCache = FilteredLayerCache()
 
     def validateTerrainModel(self, contourLyr, heightFieldName, threshold,\
         onlySelected=False, geoBoundsLyr=None, context=None, feedback=None):
@@ -636,66 +642,86 @@ class SpatialRelationsHandler(QObject):
                 validatedIdsDict.pop(id)
         return validatedIdsDict, invalidatedIdsDict
     
-    def validateContourPolygons(self, contourPolygonDict, contourPolygonIdx, threshold, heightFieldName, depressionValueDict=None):
-        hilltopDict = self.buildHilltopDict(
+    def validateContourPolygons(self, contourPolygonDict, contourPolygonIdx=None,
+        threshold=None, heightFieldName=None, depressionValueDict=None, feedback=None):
+        """
+        Checks the height difference between each contour polygon and the
+        polygon that directly contains it, which must match the equidistance.
+        :param contourPolygonDict: (dict) map of feature id to contour polygon.
+        :param contourPolygonIdx: (QgsSpatialIndex) unused, kept for
+                                  compatibility (the nesting tree builds its own).
+        :param threshold: (int) contour equidistance.
+        :param heightFieldName: (str) contour height field name.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        :return: (dict) map of flagged geometry (WKB) to its list of messages.
+        """
+        nestingTree = self.buildContourNestingTree(
             contourPolygonDict,
-            contourPolygonIdx
-            )
-        invalidDict = dict()
-        for hilltopGeom, hilltop in hilltopDict.items():
-            localFlagList = []
-            polygonList = hilltop['downhill']
-            feat = hilltop['feat']
-            if len(polygonList) < 2:
+            feedback=feedback
+        )
+        invalidDict = defaultdict(list)
+        for childIdx, parentIdx in nestingTree.edges():
+            if feedback is not None and feedback.isCanceled():
                 break
-            # sort polygons by area, from minimum to max
-            polygonList.sort(key=lambda x: x.geometry().area())
-            #pair comparison
-            a, b = tee([feat]+polygonList)
-            next(b, None)
-            for elem1, elem2 in zip(a, b):
-                if abs(elem1[heightFieldName]-elem2[heightFieldName]) != threshold:
-                    elem1GeomKey = elem1.geometry().asWkb()
-                    if elem1GeomKey not in invalidDict:
-                        invalidDict[elem1GeomKey] = []
-                    invalidDict[elem1GeomKey] += [self.tr(
-                        'Difference between contour with values {id1} \
-                        and {id2} do not match equidistance {equidistance}.\
-                        Probably one contour is \
-                        missing or one of the contours have wrong value.\n'
-                    ).format(
-                        id1=elem1[heightFieldName],
-                        id2=elem2[heightFieldName],
-                        equidistance=threshold
-                    )]
-        return invalidDict
-    
-    def buildHilltopDict(self, contourPolygonDict, contourPolygonIdx):
-        hilltopDict = dict()
-        buildDictAlias = lambda x: self.initiateHilltopDict(x, hilltopDict)
-        # c loop to build contourPolygonDict
-        list(map(buildDictAlias, contourPolygonDict.values()))
-        # iterate over contour polygon dict and build hilltopDict
-        for idx, feat in contourPolygonDict.items():
-            geom = feat.geometry()
-            bbox = geom.boundingBox()
-            geomWkb = geom.asWkb()
-            for candId in contourPolygonIdx.intersects(bbox):
-                candFeat = contourPolygonDict[candId]
-                candGeom = candFeat.geometry()
-                if candId != idx and candGeom.within(geom):
-                    hilltopDict.pop(geomWkb.asWkb())
-                    break
-                if candId != idx and candGeom.contains(geom) \
-                    and candFeat not in hilltopDict[geomWkb]['donwhill']:
-                    hilltopDict[geomWkb]['donwhill'].append(candFeat)
-            return hilltopDict
-    
-    def initiateHilltopDict(self, feat, hilltopDict):
-        hilltopDict[feat.geometry().asWkb()] = {
-                'feat' : feat,
-                'downhill': []
+            h1 = nestingTree.features[childIdx][heightFieldName]
+            h2 = nestingTree.features[parentIdx][heightFieldName]
+            difference = abs(h1 - h2)
+            if difference == threshold:
+                continue
+            geomKey = nestingTree.geometries[childIdx].asWkb()
+            if difference > threshold and difference % threshold == 0:
+                invalidDict[geomKey].append(self.tr(
+                    'Missing contour between contour lines of values {v1} and {v2}'
+                ).format(v1=min(h1, h2), v2=max(h1, h2)))
+                continue
+            invalidDict[geomKey].append(self.tr(
+                'Difference between contour with values {id1} \
+                and {id2} do not match equidistance {equidistance}.\
+                Probably one contour is \
+                missing or one of the contours have wrong value.\n'
+            ).format(
+                id1=h1,
+                id2=h2,
+                equidistance=threshold
+            ))
+        return dict(invalidDict)
+
+    def buildContourNestingTree(self, contourPolygonDict, feedback=None):
+        """
+        Builds the nesting tree of contour polygons.
+        :param contourPolygonDict: (dict) map of feature id to contour polygon.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking.
+        :return: (ContourNestingTree) nesting tree.
+        """
+        return ContourNestingTree(
+            contourPolygonDict.values(),
+            feedback=feedback
+        )
+
+    def buildHilltopDict(self, contourPolygonDict, contourPolygonIdx=None, feedback=None):
+        """
+        Builds a dict in the following format:
+        {
+            hilltop feature id : {
+                'feat' : hilltop feature,
+                'downhill' : [polygons that contain it, from the smallest]
             }
+        }
+        """
+        nestingTree = self.buildContourNestingTree(
+            contourPolygonDict,
+            feedback=feedback
+        )
+        return {
+            nestingTree.features[idx].id() : {
+                'feat' : nestingTree.features[idx],
+                'downhill' : [
+                    nestingTree.features[i] for i in nestingTree.ancestors(idx)
+                ]
+            } for idx in nestingTree.leaves()
+        }
     
     def buildTerrainPolygons(self, featList):
         pass
@@ -1002,8 +1028,44 @@ class SpatialRelationsHandler(QObject):
                 positives.add(test_fid)
         return positives
 
+    def buildInMemorySpatialIndex(self, layer, feedback=None):
+        """
+        Loads all geometries from a layer at once into a read-only spatial
+        index. The index is bulk loaded (STR packed) and stores the feature
+        geometries, so that bounding box probes are answered from memory
+        instead of issuing a provider request for each probe.
+        :param layer: (QgsVectorLayer) layer to have its geometries indexed.
+        :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :return: (QgsSpatialIndex) spatial index with stored geometries.
+        """
+        request = QgsFeatureRequest().setNoAttributes()
+        return QgsSpatialIndex(
+            layer.getFeatures(request),
+            feedback,
+            QgsSpatialIndex.FlagStoreFeatureGeometries
+        )
+
+    def getCandidateGeometries(self, layer, bbox, spatialIdx=None):
+        """
+        Retrieves the geometries from a layer that intersect a bounding box.
+        :param layer: (QgsVectorLayer) layer to be probed.
+        :param bbox: (QgsRectangle) bounding box to be used on the probe.
+        :param spatialIdx: (QgsSpatialIndex) in-memory index of layer with
+                           stored geometries. If it is not provided, the layer
+                           provider is queried instead.
+        :return: (dict) a map from feature IDs to their geometries.
+        """
+        if spatialIdx is None:
+            return {
+                f.id(): f.geometry() for f in layer.getFeatures(QgsFeatureRequest(bbox))
+            }
+        return {
+            fid: spatialIdx.geometry(fid) \
+                for fid in sorted(spatialIdx.intersects(bbox))
+        }
+
     def checkPredicate(self, layerA, layerB, predicate, cardinality, ctx=None,
-                       feedback=None):
+                       feedback=None, useInMemoryIndex=True, spatialIdx=None):
         """
         Checks if a duo of layers comply with a spatial predicate at a given
         cardinality.
@@ -1016,11 +1078,18 @@ class SpatialRelationsHandler(QObject):
         :param ctx: (QgsProcessingContext) processing context in which algorithm
                     should be executed.
         :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :param useInMemoryIndex: (bool) whether layer B should be loaded once
+                                 into an in-memory spatial index instead of
+                                 being queried for each feature of layer A.
+        :param spatialIdx: (QgsSpatialIndex) a previously built in-memory index
+                           of layer B (see buildInMemorySpatialIndex).
         :return: (dict) a map from offended feature IDs to the list of its
                 offending features.
         """
         ctx = ctx or QgsProcessingContext()
         feedback = feedback or QgsProcessingFeedback()
+        if spatialIdx is None and useInMemoryIndex:
+            spatialIdx = self.buildInMemorySpatialIndex(layerB)
         size = layerA.featureCount()
         stepSize = 100 / size if size else 0
         flags = defaultdict(list)
@@ -1066,10 +1135,9 @@ class SpatialRelationsHandler(QObject):
             geomA = featA.geometry()
             engine = QgsGeometry.createGeometryEngine(geomA.constGet())
             engine.prepareGeometry()
-            geometriesB = {
-                f.id(): f.geometry() \
-                    for f in layerB.getFeatures(geomA.boundingBox())
-            }
+            geometriesB = self.getCandidateGeometries(
+                layerB, geomA.boundingBox(), spatialIdx
+            )
             positives = self.testPredicate(predicate, engine, geometriesB)
             if predicate == self.DISJOINT:
                 # disjoint comparison wants those that are NOT disjoint to flag
@@ -1099,11 +1167,11 @@ class SpatialRelationsHandler(QObject):
         return {fid: flag for fid, flag in flags.items() if flag}
 
     def checkDE9IM(self, layerA, layerB, mask, cardinality, ctx=None,
-                   feedback=None):
+                   feedback=None, useInMemoryIndex=True, spatialIdx=None):
         """
         Applies a DE-9IM mask to compare the features of between and checks
         whether the occurrence limits are respected.
-        :param layerA: (QgsVectorLayer | iterator) reference layer.
+        :param layerA: (QgsVectorLayer | RuleLayerSource) reference layer.
         :param layerB: (QgsVectorLayer) layer to have its features spatially
                     compared to reference layer.
         :param mask: (str) a linearized DE-9IM mask to be used for the spatial
@@ -1113,10 +1181,17 @@ class SpatialRelationsHandler(QObject):
         :param ctx: (QgsProcessingContext) processing context in which algorithm
                     should be executed.
         :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :param useInMemoryIndex: (bool) whether layer B should be loaded once
+                                 into an in-memory spatial index instead of
+                                 being queried for each feature of layer A.
+        :param spatialIdx: (QgsSpatialIndex) a previously built in-memory index
+                           of layer B (see buildInMemorySpatialIndex).
         :return: (dict) a map from offended to flag text and its geometry.
         """
         ctx = ctx or QgsProcessingContext()
         feedback = feedback or QgsProcessingFeedback()
+        if spatialIdx is None and useInMemoryIndex:
+            spatialIdx = self.buildInMemorySpatialIndex(layerB)
         testingMethod = self.getCardinalityTest(cardinality)
         candidates = defaultdict(list)
         flags = defaultdict(list)
@@ -1129,16 +1204,19 @@ class SpatialRelationsHandler(QObject):
                                         layer_b=layerB.name())
         size = layerA.featureCount()
         stepSize = 100 / size if size else 0
-        iteratorA = layerA.getFeatures() if isinstance(layerA, QgsVectorLayer) else layerA
-        for step, featA in enumerate(iteratorA):
+        for step, featA in enumerate(layerA.getFeatures()):
             if feedback.isCanceled():
                 break
             fidA = featA.id()
             geomA = featA.geometry()
             engine = QgsGeometry.createGeometryEngine(geomA.constGet())
-            for featB in layerB.getFeatures(geomA.boundingBox()):
-                if engine.relatePattern(featB.geometry().constGet(), mask):
-                    candidates[fidA].append(featB.id())
+            engine.prepareGeometry()
+            geometriesB = self.getCandidateGeometries(
+                layerB, geomA.boundingBox(), spatialIdx
+            )
+            for fidB, geomB in geometriesB.items():
+                if engine.relatePattern(geomB.constGet(), mask):
+                    candidates[fidA].append(fidB)
             if not testingMethod(candidates[fidA]):
                 # if the mask has an 'invalid' count of occurrences, it is a flag!
                 size = len(candidates[fidA])
@@ -1197,6 +1275,46 @@ class SpatialRelationsHandler(QObject):
             layer.setName(layerName)
         return layer
 
+    def getFilteredLayer(self, layerName, exp, ctx=None, feedback=None,
+                         buildIndex=True):
+        """
+        Retrieves a layer ready to be compared (see setupLayer) and its
+        in-memory spatial index. Filtered layers are cached for as long as
+        their source layer is not edited, so rules sharing a layer/filter pair
+        do not filter it again.
+        :param layerName: (str) layer's name on canvas.
+        :param exp: (str) filtering expression to be applied to target layer.
+        :param ctx: (QgsProcessingContext) processing context in which algorithm
+                    should be executed.
+        :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :param buildIndex: (bool) whether the spatial index is needed (only
+                           layers probed by the rules, i.e. their layer B).
+        :return: (tuple) layer ready to be compared, materialized in memory,
+                 and its in-memory QgsSpatialIndex (None, if not needed and
+                 not yet built).
+        """
+        ctx = ctx or QgsProcessingContext()
+        sourceLayer = ctx.getMapLayer(layerName)
+        if not sourceLayer:
+            raise Exception(self.tr("Layer not found on canvas."))
+        key = self.layerCache.key(sourceLayer, exp)
+        cached = self.layerCache.get(key)
+        if cached is not None:
+            layer, spatialIdx = cached
+        else:
+            layer = self.setupLayer(layerName, exp, ctx, feedback)
+            if layer.providerType() != "memory":
+                # memory copies are safely read by worker threads
+                layer = layer.materialize(QgsFeatureRequest())
+                layer.setName(layerName)
+            spatialIdx = None
+        if buildIndex and spatialIdx is None:
+            spatialIdx = self.buildInMemorySpatialIndex(layer)
+        elif cached is not None:
+            return layer, spatialIdx
+        self.layerCache.put(key, layer, spatialIdx)
+        return layer, spatialIdx
+
     def enforceRule(self, rule, ctx=None, feedback=None):
         """
         Applies a given set of spatial restrictions to a duo of layers.
@@ -1212,45 +1330,193 @@ class SpatialRelationsHandler(QObject):
         ctx = ctx or QgsProcessingContext()
         feedback = feedback or QgsProcessingFeedback()
         # setup step is ignored for the enforcing rule progress tracking
-        layerA = self.setupLayer(rule.layerA(), rule.filterA(), ctx, None)
-        layerB = self.setupLayer(rule.layerB(), rule.filterB(), ctx, None)
+        layerA, _ = self.getFilteredLayer(
+            rule.layerA(), rule.filterA(), ctx, buildIndex=False
+        )
+        layerB, spatialIdx = self.getFilteredLayer(
+            rule.layerB(), rule.filterB(), ctx
+        )
         method = self.checkDE9IM if rule.useDE9IM() else self.checkPredicate
         return method(
-            layerA, layerB, rule.predicate(), rule.cardinality(), ctx, feedback
+            layerA, layerB, rule.predicate(), rule.cardinality(), ctx, feedback,
+            spatialIdx=spatialIdx
+        )
+
+    def ruleLayerKeys(self, rule):
+        """
+        Gets the identifiers of the (filtered) layers touched by a rule.
+        :param rule: (SpatialRule) rule to have its layers identified.
+        :return: (tuple) layer A's and layer B's (layer name, filter) pairs.
+        """
+        return (
+            (rule.layerA(), rule.filterA() or ""),
+            (rule.layerB(), rule.filterB() or "")
         )
 
-    def enforceRules(self, ruleList, ctx=None, feedback=None):
+    def groupRulesByLayers(self, ruleDict):
+        """
+        Groups rules that touch the same pair of (filtered) layers. Rules from
+        different groups are independent from each other.
+        :param ruleDict: (dict) a map from rule's index to SpatialRule.
+        :return: (OrderedDict) a map from layer keys pair to a list of rule
+                 indexes, sorted by the first rule of each group.
+        """
+        groups = OrderedDict()
+        for idx in sorted(ruleDict):
+            key = self.ruleLayerKeys(ruleDict[idx])
+            if key not in groups:
+                groups[key] = []
+            groups[key].append(idx)
+        return groups
+
+    def setupRuleLayers(self, ruleDict, ctx=None, feedback=None):
+        """
+        Loads and filters every layer touched by a set of rules only once and
+        builds their in-memory spatial indexes (see getFilteredLayer).
+        :param ruleDict: (dict) a map from rule's index to SpatialRule.
+        :param ctx: (QgsProcessingContext) processing context in which
+                    algorithm should be executed.
+        :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :return: (tuple) a map from layer key to its QgsVectorLayer and a map
+                 from layer key to its in-memory QgsSpatialIndex.
+        """
+        layerDict, spatialIdxDict = dict(), dict()
+        # only layers B are probed, hence only they are indexed
+        indexedKeys = {self.ruleLayerKeys(rule)[1] for rule in ruleDict.values()}
+        for rule in ruleDict.values():
+            if feedback is not None and feedback.isCanceled():
+                break
+            for layerName, exp in self.ruleLayerKeys(rule):
+                if (layerName, exp) in layerDict:
+                    continue
+                layer, spatialIdx = self.getFilteredLayer(
+                    layerName, exp, ctx,
+                    buildIndex=(layerName, exp) in indexedKeys
+                )
+                layerDict[(layerName, exp)] = layer
+                spatialIdxDict[(layerName, exp)] = spatialIdx
+        return layerDict, spatialIdxDict
+
+    def enforceRuleGroup(self, ruleDict, ruleIdxList, layerDict,
+                         spatialIdxDict, ctx=None, feedback=None):
+        """
+        Applies a group of rules that touch the same duo of layers. This method
+        only reads the feature sources it is given (never the layers
+        themselves) and it is meant to be run on a worker thread.
+        :param ruleDict: (dict) a map from rule's index to SpatialRule.
+        :param ruleIdxList: (list-of-int) indexes of the rules to be applied.
+        :param layerDict: (dict) a map from layer key to a RuleLayerSource of
+                          its loaded layer, exclusive to this group.
+        :param spatialIdxDict: (dict) a map from layer key to its in-memory
+                               spatial index.
+        :param ctx: (QgsProcessingContext) processing context in which
+                    algorithm should be executed.
+        :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :return: (dict) a map from rule's index to its flags.
+        """
+        results = dict()
+        for idx in ruleIdxList:
+            if feedback is not None and feedback.isCanceled():
+                break
+            rule = ruleDict[idx]
+            keyA, keyB = self.ruleLayerKeys(rule)
+            method = self.checkDE9IM if rule.useDE9IM() else self.checkPredicate
+            results[idx] = method(
+                layerDict[keyA],
+                layerDict[keyB],
+                rule.predicate(),
+                rule.cardinality(),
+                ctx,
+                feedback,
+                spatialIdx=spatialIdxDict[keyB]
+            )
+        return results
+
+    def enforceRules(self, ruleList, ctx=None, feedback=None, maxWorkers=None):
         """
         Applies a set of spatial rules to current active layers on canvas.
+        Each layer is loaded and filtered once and rules that touch different
+        layers are applied concurrently.
         :param ruleList: (list-of-SpatialRule) all rules that should be applied
                          to canvas.
         :param ctx: (QgsProcessingContext) processing context in which algorithm
                     should be executed.
         :param feedback: (QgsFeedback) QGIS progress tracking component.
+        :param maxWorkers: (int) maximum number of rule groups to be applied
+                           simultaneously. Defaults to the plugin's worker
+                           count (see getWorkerCount).
         :return: (dict) a map of offended rules to its flags.
         """
         out = dict()
         ctx = ctx or QgsProcessingContext()
         size = len(ruleList)
         feedback = feedback or QgsProcessingFeedback()
-        multiStepFeedback = QgsProcessingMultiStepFeedback(size, feedback)
+        ruleDict = dict()
         for idx, rule in enumerate(ruleList):
-            ruleName = rule.ruleName()
-            if multiStepFeedback.isCanceled():
-                break
+            if rule.isValid():
+                ruleDict[idx] = rule
+                continue
+            feedback.pushInfo(
+                self.tr('Rule {0} is invalid and will be skipped. '
+                        'Error: {1}').format(
+                            rule.ruleName(), rule.validate(checkLoaded=True))
+            )
+        # layers loading step + one step for each valid rule
+        multiStepFeedback = QgsProcessingMultiStepFeedback(len(ruleDict) + 1, feedback)
+        multiStepFeedback.setCurrentStep(0)
+        groups = self.groupRulesByLayers(ruleDict)
+        maxWorkers = maxWorkers or getWorkerCount()
+        futures, groupFeedbacks = dict(), list()
+        results, done = dict(), 1
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(maxWorkers, len(groups) or 1))
+        )
+        try:
+            multiStepFeedback.pushInfo(self.tr("Loading rules' layers..."))
+            layerDict, spatialIdxDict = self.setupRuleLayers(
+                ruleDict, ctx, multiStepFeedback
+            )
+            for ruleIdxList in groups.values():
+                if multiStepFeedback.isCanceled():
+                    break
+                # feature sources are created on current thread, one for each
+                # group, so that workers never read a layer directly
+                groupLayerDict = {
+                    key: RuleLayerSource(layerDict[key]) \
+                        for key in self.ruleLayerKeys(ruleDict[ruleIdxList[0]])
+                }
+                groupFeedback = QgsProcessingFeedback()
+                groupFeedbacks.append(groupFeedback)
+                future = pool.submit(
+                    self.enforceRuleGroup, ruleDict, ruleIdxList, groupLayerDict,
+                    spatialIdxDict, ctx, groupFeedback
+                )
+                futures[future] = ruleIdxList
+            for future in concurrent.futures.as_completed(futures):
+                if multiStepFeedback.isCanceled():
+                    break
+                results.update(future.result())
+                done += len(futures[future])
+                multiStepFeedback.setCurrentStep(done)
+        finally:
+            # stops running groups (on cancelation or on a failed group) and
+            # drops the ones not yet started
+            for groupFeedback in groupFeedbacks:
+                groupFeedback.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+            # filtered layers and their indexes are released even if a rule
+            # group failed
+            self.layerCache.clear()
+        # results are merged following the rule list order, regardless of the
+        # order in which the rule groups were finished
+        for idx in sorted(results):
+            ruleName = ruleDict[idx].ruleName()
+            flags = results[idx]
             multiStepFeedback.pushInfo(
                 self.tr('Checking rule "{0}"... [{1}/{2}]').format(
                     ruleName, idx + 1, size
                 )
             )
-            if not rule.isValid():
-                multiStepFeedback.pushInfo(
-                    self.tr('Rule {0} is invalid and will be skipped. '
-                            'Error: {1}').format(
-                                ruleName, rule.validate(checkLoaded=True))
-                )
-                continue
-            flags = self.enforceRule(rule, ctx, multiStepFeedback)
             if flags:
                 if ruleName in out:
                     previous = out[ruleName]
@@ -1271,10 +1537,34 @@ class SpatialRelationsHandler(QObject):
                     self.tr('Rule "{0}" did not raise any flags\n')
                     .format(ruleName)
                 )
-            multiStepFeedback.setCurrentStep(idx + 1)
         return out
 
 
+class RuleLayerSource(object):
+    """
+    Read-only view of a loaded rule layer meant to be handed to worker
+    threads: it must be created on the layer's thread and exposes only what
+    the rule checks read from their layers.
+    """
+    def __init__(self, layer):
+        """
+        Class constructor.
+        :param layer: (QgsVectorLayer) loaded (filtered) layer.
+        """
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self._name = layer.name()
+        self._featureCount = layer.featureCount()
+
+    def name(self):
+        return self._name
+
+    def featureCount(self):
+        return self._featureCount
+
+    def getFeatures(self, request=None):
+        return self.source.getFeatures(request or QgsFeatureRequest())
+
+
 class SpatialRule(QObject):
     """
     Wrapper class around a map of spatial rule attributes. This object handles
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import math
+
+import numpy as np
+from osgeo import gdal, ogr
+
+from DsgTools.core.Utils.executorService import ExecutorService
+from .rasterBlockReader import RasterBlockReader
+
+
+class TerrainSlicingPipeline(object):
+    """
+    Slices a DEM into elevation classes in process: the DEM is read window by
+    window only once per stage, masked by the geographic bounds, sliced and
+    classified on numpy arrays (on the shared worker pool) and written to a
+    single classified raster, which is then sieved by GDAL in place.
+    Only the region that covers the (buffered) geographic bounds is handled,
+    and no intermediate raster is written besides the bounds mask.
+    """
+    # values of the bounds mask
+    OUTSIDE, BUFFER, BOUNDS = 0, 1, 2
+    CLASS_NODATA = 255
+    CREATION_OPTIONS = ['TILED=YES', 'COMPRESS=DEFLATE', 'BIGTIFF=IF_SAFER']
+
+    def __init__(self, inputPath, threshold, band=1, windowPixels=None):
+        """
+        Class constructor.
+        :param inputPath: (str) DEM path.
+        :param threshold: (int) slicing interval (contour equidistance).
+        :param band: (int) DEM band number.
+        :param windowPixels: (int) approximate number of pixels per window.
+        """
+        self.reader = RasterBlockReader(inputPath, band=band, windowPixels=windowPixels)
+        self.threshold = threshold
+        self.region = None
+        self.maskReader = None
+        ds = self.reader.dataset()
+        self.geoTransform = ds.GetGeoTransform()
+        self.projection = ds.GetProjection()
+        if self.geoTransform[2] != 0 or self.geoTransform[4] != 0:
+            raise Exception('Rotated rasters are not supported.')
+
+    def regionFromBounds(self, xMin, yMin, xMax, yMax):
+        """
+        Gets the pixel region of the DEM that covers an extent.
+        :return: (tuple) (xOff, yOff, xSize, ySize) or None, if the extent does
+                 not overlap the DEM.
+        """
+        x0, dx, _, y0, _, dy = self.geoTransform
+        cols = sorted(((xMin - x0) / dx, (xMax - x0) / dx))
+        rows = sorted(((yMin - y0) / dy, (yMax - y0) / dy))
+        col0 = max(0, int(math.floor(cols[0])))
+        row0 = max(0, int(math.floor(rows[0])))
+        col1 = min(self.reader.xSize, int(math.ceil(cols[1])))
+        row1 = min(self.reader.ySize, int(math.ceil(rows[1])))
+        if col1 <= col0 or row1 <= row0:
+            return None
+        return (col0, row0, col1 - col0, row1 - row0)
+
+    def regionGeoTransform(self):
+        x0, dx, rx, y0, ry, dy = self.geoTransform
+        return (x0 + self.region[0] * dx, dx, rx, y0 + self.region[1] * dy, ry, dy)
+
+    def createRaster(self, outputPath, dataType, noDataValue=None):
+        """
+        Creates a GeoTIFF aligned to the region.
+        :return: (gdal.Dataset) created dataset.
+        """
+        ds = gdal.GetDriverByName('GTiff').Create(
+            outputPath, self.region[2], self.region[3], 1, dataType,
+            options=self.CREATION_OPTIONS
+        )
+        if ds is None:
+            raise Exception('Unable to create {0}'.format(outputPath))
+        ds.SetGeoTransform(self.regionGeoTransform())
+        ds.SetProjection(self.projection)
+        if noDataValue is not None:
+            ds.GetRasterBand(1).SetNoDataValue(noDataValue)
+        return ds
+
+    def setBounds(self, boundsWkbList, bufferedWkbList, maskPath):
+        """
+        Sets the region to be processed and rasterizes the bounds mask: pixels
+        inside the bounds are BOUNDS, pixels only inside the buffered bounds
+        are BUFFER and the others are OUTSIDE.
+        :param boundsWkbList: (list-of-bytes) bounds polygons (WKB) on DEM's
+                              CRS.
+        :param bufferedWkbList: (list-of-bytes) buffered bounds polygons (WKB)
+                                on DEM's CRS.
+        :param maskPath: (str) path of the mask GeoTIFF to be written.
+        """
+        memDs = ogr.GetDriverByName('Memory').CreateDataSource('')
+        layers = []
+        for name, wkbList in (('buffer', bufferedWkbList), ('bounds', boundsWkbList)):
+            layer = memDs.CreateLayer(name, geom_type=ogr.wkbUnknown)
+            for wkb in wkbList:
+                feature = ogr.Feature(layer.GetLayerDefn())
+                feature.SetGeometry(ogr.CreateGeometryFromWkb(bytes(wkb)))
+                layer.CreateFeature(feature)
+            layers.append(layer)
+        xMin, xMax, yMin, yMax = layers[0].GetExtent()
+        self.region = self.regionFromBounds(xMin, yMin, xMax, yMax)
+        if self.region is None:
+            raise Exception('Geographic bounds do not overlap the input raster.')
+        maskDs = self.createRaster(maskPath, gdal.GDT_Byte)
+        gdal.RasterizeLayer(maskDs, [1], layers[0], burn_values=[self.BUFFER])
+        gdal.RasterizeLayer(maskDs, [1], layers[1], burn_values=[self.BOUNDS])
+        maskDs.FlushCache()
+        maskDs = None
+        self.maskReader = RasterBlockReader(maskPath)
+
+    def windows(self):
+        """
+        :return: (generator) DEM windows of the region, aligned to DEM's blocks.
+        """
+        return self.reader.windows(region=self.region)
+
+    def readMasked(self, window, maskValue):
+        """
+        Reads a DEM window along with its mask.
+        :param window: (tuple) DEM window.
+        :param maskValue: (int) minimum mask value of the wanted pixels.
+        :return: (tuple) DEM values and boolean mask of wanted valid pixels.
+        """
+        xOff, yOff, xSize, ySize = window
+        values = self.reader.read(window)
+        mask = self.maskReader.read(
+            (xOff - self.region[0], yOff - self.region[1], xSize, ySize)
+        ) >= maskValue
+        return values, mask & self.reader.validMask(values)
+
+    def slice(self, values):
+        return self.threshold * np.floor(values / self.threshold)
+
+    def readValid(self, window):
+        """
+        Reads the sliced values of the pixels inside the bounds, so that the
+        pipeline may feed a RasterHistogram.
+        :param window: (tuple) DEM window.
+        :return: (np.ndarray) flat array of sliced values.
+        """
+        values, mask = self.readMasked(window, self.BOUNDS)
+        return self.slice(values[mask].astype(np.float64))
+
+    def classifyWindow(self, window, upperLimits):
+        values, mask = self.readMasked(window, self.BUFFER)
+        classes = np.searchsorted(upperLimits, np.floor(values[mask]), side='left')
+        output = np.full(values.shape, self.CLASS_NODATA, dtype=np.uint8)
+        output[mask] = np.clip(classes, 0, len(upperLimits) - 1)
+        return window, output
+
+    def classify(self, classDict, outputPath, feedback=None):
+        """
+        Writes the classified DEM (pixels inside the buffered bounds). Each
+        pixel gets the first class whose upper limit is not below its value
+        (values out of the classes' range get the nearest class).
+        :param classDict: (dict) map of class (int, from 0) to (min, max).
+        :param outputPath: (str) path of the classified GeoTIFF.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation.
+        """
+        upperLimits = np.array([classDict[i][1] for i in sorted(classDict)], dtype=np.float64)
+        outputDs = self.createRaster(outputPath, gdal.GDT_Byte, self.CLASS_NODATA)
+        outputBand = outputDs.GetRasterBand(1)
+        outputBand.Fill(self.CLASS_NODATA)
+        windows = list(self.windows())
+        step = 100 / len(windows) if windows else 0
+        results = ExecutorService.instance().map(
+            lambda window: self.classifyWindow(window, upperLimits),
+            windows,
+            chunkSize=1,
+            feedback=feedback
+        )
+        # datasets must only be written by one thread
+        for current, (window, output) in enumerate(results):
+            outputBand.WriteArray(
+                output, window[0] - self.region[0], window[1] - self.region[1])
+            if feedback is not None:
+                feedback.setProgress(current * step)
+        outputDs.FlushCache()
+        outputDs = None
+
+    def sieve(self, outputPath, threshold, eightConnectedness=False):
+        """
+        Replaces the pixel groups smaller than threshold by their largest
+        neighbour group, in place.
+        :param outputPath: (str) classified GeoTIFF.
+        :param threshold: (int) minimum pixel group size.
+        :param eightConnectedness: (bool) whether diagonal pixels are
+                                   connected.
+        """
+        if not threshold:
+            return
+        ds = gdal.Open(outputPath, gdal.GA_Update)
+        band = ds.GetRasterBand(1)
+        gdal.SieveFilter(
+            band, band.GetMaskBand(), band, threshold, 8 if eightConnectedness else 4)
+        ds.FlushCache()
+        ds = None
+
+    def close(self):
+        self.reader.close()
+        if self.maskReader is not None:
+            self.maskReader.close()
@@ -25,6 +25,8 @@ from builtins import str
 from osgeo import ogr
 from uuid import uuid4
 import codecs, os, json, binascii
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 #DSG Tools imports
 from DsgTools.core.Factories.DbFactory.dbFactory import DbFactory 
@@ -38,9 +40,14 @@ class GenericDbManager(QObject):
     """
     This class manages the permissions on dsgtools databases.
     """
-    def __init__(self, serverAbstractDb, dbDict, edgvVersion, parentWidget = None):
+    # maximum number of databases handled at the same time by batch operations
+    DEFAULT_MAX_CONNECTIONS = 8
+
+    def __init__(self, serverAbstractDb, dbDict, edgvVersion, parentWidget = None, maxConnections = None):
         super(GenericDbManager,self).__init__()
         self.parentWidget = parentWidget
+        self.maxConnections = maxConnections or self.DEFAULT_MAX_CONNECTIONS
+        self._executor = None
         self.dbDict = dbDict
         self.serverAbstractDb = serverAbstractDb
         self.adminDb = self.instantiateAdminDb(serverAbstractDb)
@@ -260,44 +267,152 @@ class GenericDbManager(QObject):
         self.createSetting(configName, edgvVersion, newJsonDict)
         return self.installSetting(configName,dbNameList = dbList)
 
+    def connectWorkerDb(self, dbName, connectionParameters):
+        """
+        Connects to a database on the server (reusing pooled connections of current thread).
+        Unlike instantiateAbstractDb, it does not ask for credentials, so that it can be
+        called from worker threads.
+        :param dbName: (str) database name.
+        :param connectionParameters: (tuple) database's (host, port, user, password).
+        :return: (PostgisDb) connected database.
+        """
+        (host, port, user, password) = connectionParameters
+        abstractDb = DbFactory().createDbFactory(DsgEnums.DriverPostGIS)
+        if not abstractDb.connectDatabaseFromPool(host, port, dbName, user, password):
+            raise Exception(self.tr('Unable to connect to database ') + dbName)
+        return abstractDb
+
+    @contextmanager
+    def databaseTransaction(self, *abstractDbs):
+        """
+        Runs the wrapped block of code inside a transaction on each given database. All
+        of them are commited if the block succeeds and rolled back otherwise.
+        :param abstractDbs: (AbstractDb) databases.
+        """
+        for abstractDb in abstractDbs:
+            abstractDb.db.transaction()
+        try:
+            yield
+        except Exception:
+            for abstractDb in abstractDbs:
+                abstractDb.db.rollback()
+            raise
+        for abstractDb in abstractDbs:
+            abstractDb.db.commit()
+
+    def getConnectionParameters(self, dbName):
+        """
+        Gets the parameters used to connect to a database. Databases given on dbDict are
+        connected with their own credentials and any other one with the server's.
+        Must be called from the main thread.
+        :param dbName: (str) database name.
+        :return: (tuple) database's (host, port, user, password).
+        """
+        if dbName in self.dbDict:
+            return self.dbDict[dbName].getParamsFromConectedDb()
+        return self.serverAbstractDb.getParamsFromConectedDb()
+
+    def runOnDatabase(self, dbName, method, connectionParameters, adminConnectionParameters):
+        """
+        Runs method on a database, using its own connections to it and to dsgtools_admindb.
+        :param dbName: (str) database name.
+        :param method: (callable) method that receives a database and an admin database.
+        :param connectionParameters: (tuple) database's (host, port, user, password).
+        :param adminConnectionParameters: (tuple) server's (host, port, user, password).
+        :return: (tuple) dbName and error message (None if method succeeded).
+        """
+        abstractDb, adminDb = None, None
+        try:
+            abstractDb = self.connectWorkerDb(dbName, connectionParameters)
+            adminDb = self.connectWorkerDb('dsgtools_admindb', adminConnectionParameters)
+            method(abstractDb, adminDb)
+            return dbName, None
+        except Exception as e:
+            return dbName, ':'.join(map(str, e.args))
+        finally:
+            for db in (abstractDb, adminDb):
+                if db is not None:
+                    db.closeDatabase()
+
+    def executor(self):
+        """
+        Gets the thread pool used by batch operations. It is kept alive along with this
+        manager, so that pooled connections opened by its threads are reused.
+        :return: (ThreadPoolExecutor) thread pool.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.maxConnections)
+        return self._executor
+
+    def close(self, wait=True):
+        """
+        Shuts down the thread pool used by batch operations. Its threads end once
+        they are idle, closing the connections they have pooled.
+        :param wait: (bool) whether to wait for the threads to end.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __del__(self):
+        try:
+            self.close(wait=False)
+        except Exception:
+            pass
+
+    def runOnDatabases(self, dbNameList, method):
+        """
+        Runs method on each database concurrently. At most self.maxConnections databases are
+        handled at the same time and each one is handled on its own connections, hence
+        method should apply its changes inside its own transactions.
+        :param dbNameList: (list-of-str) names of the databases.
+        :param method: (callable) method that receives a database and an admin database and
+                       raises an exception if it fails.
+        :return: (tuple) list of databases that succeeded and dict of failed databases
+                 to their error messages.
+        """
+        successList, errorDict = [], dict()
+        if not dbNameList:
+            return (successList, errorDict)
+        # credentials are read on the main thread, where the connections were opened
+        adminConnectionParameters = self.serverAbstractDb.getParamsFromConectedDb()
+        connectionParameters = {
+            dbName: self.getConnectionParameters(dbName) for dbName in dbNameList
+        }
+        results = self.executor().map(
+            lambda dbName: self.runOnDatabase(
+                dbName, method, connectionParameters[dbName], adminConnectionParameters),
+            dbNameList
+        )
+        for dbName, error in results:
+            if error is None:
+                successList.append(dbName)
+            else:
+                errorDict[dbName] = error
+        return (successList, errorDict)
+
     def installSetting(self, configName, dbNameList = []):
         """
         Generic install. Can be reimplenented in child methods.
+        Databases are handled concurrently (see runOnDatabases).
         """
-        errorDict = dict()
         settingType = self.getManagerType()
         if dbNameList == []:
             dbNameList = list(self.dbDict.keys())
-        successList = []
         configEdgvVersion = self.getSettingVersion(configName)
-        for dbName in dbNameList:
-            abstractDb = self.instantiateAbstractDb(dbName)
+        recDict = self.adminDb.getRecordFromAdminDb(settingType, configName, configEdgvVersion)
+        def install(abstractDb, adminDb):
             edgvVersion = abstractDb.getDatabaseVersion()
             if edgvVersion != configEdgvVersion:
-                errorDict[dbName] = self.tr('Database version missmatch.')
-                continue
-            recDict = self.adminDb.getRecordFromAdminDb(settingType, configName, edgvVersion)
-            try:
-                if not abstractDb.checkIfExistsConfigTable(settingType):
-                    abstractDb.createPropertyTable(settingType, useTransaction = True)
-            except Exception as e:
-                errorDict[dbName] = ':'.join(e.args)
-                continue
-            try:
-                abstractDb.db.transaction()
-                self.adminDb.db.transaction()
+                raise Exception(self.tr('Database version missmatch.'))
+            if not abstractDb.checkIfExistsConfigTable(settingType):
+                abstractDb.createPropertyTable(settingType, useTransaction = True)
+            with self.databaseTransaction(abstractDb, adminDb):
                 self.materializeIntoDatabase(abstractDb, recDict)  #step done when property management involves changing database structure
                 abstractDb.insertRecordInsidePropertyTable(settingType, recDict, edgvVersion)
                 dbOid = abstractDb.getDbOID()
-                self.adminDb.insertInstalledRecordIntoAdminDb(settingType, recDict, dbOid)
-                abstractDb.db.commit()
-                self.adminDb.db.commit()
-            except Exception as e:
-                abstractDb.db.rollback()
-                self.adminDb.db.rollback()
-                errorDict[dbName] = ':'.join(e.args)
-            successList.append(dbName)
-        return (successList, errorDict)
+                adminDb.insertInstalledRecordIntoAdminDb(settingType, recDict, dbOid)
+        return self.runOnDatabases(dbNameList, install)
     
     def deleteSetting(self, configName, dbNameList = []):
         """
@@ -308,33 +423,30 @@ class GenericDbManager(QObject):
         successList = []
         settingType = self.getManagerType()
         propertyDict = self.adminDb.getPropertyPerspectiveDict(settingType, DsgEnums.Property)
-        if configName in list(propertyDict.keys()):
-            for dbName in propertyDict[configName]:
-                if not dbName:
-                    try:
-                        self.adminDb.db.transaction()
-                        self.adminDb.removeRecordFromPropertyTable(settingType, configName, None)
-                        self.adminDb.db.commit()
-                        successList.append(dbName)
-                    except Exception as e:
-                        self.adminDb.db.rollback()
-                        errorDict[dbName] = ':'.join(e.args)
-                else:
-                    abstractDb = self.instantiateAbstractDb(dbName)
-                    edgvVersion = abstractDb.getDatabaseVersion()
-                    try:
-                        abstractDb.db.transaction()
-                        self.adminDb.db.transaction()
-                        self.undoMaterializationFromDatabase(abstractDb, configName, settingType, edgvVersion) #step done when property management involves changing database structure
-                        abstractDb.removeRecordFromPropertyTable(settingType, configName, edgvVersion)
-                        self.adminDb.removeRecordFromPropertyTable(settingType, configName, edgvVersion)
-                        abstractDb.db.commit()
-                        self.adminDb.db.commit()
-                        successList.append(dbName)
-                    except Exception as e:
-                        abstractDb.db.rollback()
-                        self.adminDb.db.rollback()
-                        errorDict[dbName] = ':'.join(e.args)
+        if configName not in list(propertyDict.keys()):
+            return (successList, errorDict)
+        def delete(abstractDb, adminDb):
+            edgvVersion = abstractDb.getDatabaseVersion()
+            with self.databaseTransaction(abstractDb, adminDb):
+                self.undoMaterializationFromDatabase(abstractDb, configName, settingType, edgvVersion) #step done when property management involves changing database structure
+                abstractDb.removeRecordFromPropertyTable(settingType, configName, edgvVersion)
+                adminDb.removeRecordFromPropertyTable(settingType, configName, edgvVersion)
+        dbList = []
+        for dbName in propertyDict[configName]:
+            if dbName:
+                dbList.append(dbName)
+                continue
+            try:
+                self.adminDb.db.transaction()
+                self.adminDb.removeRecordFromPropertyTable(settingType, configName, None)
+                self.adminDb.db.commit()
+                successList.append(dbName)
+            except Exception as e:
+                self.adminDb.db.rollback()
+                errorDict[dbName] = ':'.join(e.args)
+        dbSuccessList, dbErrorDict = self.runOnDatabases(dbList, delete)
+        successList += dbSuccessList
+        errorDict.update(dbErrorDict)
         return (successList, errorDict)
 
     def uninstallSetting(self, configName, dbNameList = []):
@@ -342,32 +454,22 @@ class GenericDbManager(QObject):
         Generic uninstall. Can be reimplenented in child methods.
         This can uninstall setting on a list of databases or in all databases (if dbNameList == [])
         """
-        errorDict = dict()
-        successList = []
         settingType = self.getManagerType()
         propertyDict = self.adminDb.getPropertyPerspectiveDict(settingType, DsgEnums.Property)
-        if configName in list(propertyDict.keys()):
-            if dbNameList == []: #builds filter dbList to uninstall in all installed databases
-                dbList = propertyDict[configName]
-            else: #builds filter dbList to uninstall in databases in dbNameList
-                dbList = [i for i in propertyDict[configName] if i in dbNameList]
-            for dbName in dbList:
-                abstractDb = self.instantiateAbstractDb(dbName)
-                edgvVersion = abstractDb.getDatabaseVersion()
-                try:
-                    abstractDb.db.transaction()
-                    self.adminDb.db.transaction()
-                    self.undoMaterializationFromDatabase(abstractDb, configName, settingType, edgvVersion) #step done when property management involves changing database structure
-                    abstractDb.removeRecordFromPropertyTable(settingType, configName, edgvVersion)
-                    self.adminDb.uninstallPropertyOnAdminDb(settingType, configName, edgvVersion, dbName = dbName)
-                    abstractDb.db.commit()
-                    self.adminDb.db.commit()
-                except Exception as e:
-                    abstractDb.db.rollback()
-                    self.adminDb.db.rollback()
-                    errorDict[dbName] = ':'.join(e.args)
-                successList.append(dbName)
-        return (successList, errorDict)
+        if configName not in list(propertyDict.keys()):
+            return ([], dict())
+        if dbNameList == []: #builds filter dbList to uninstall in all installed databases
+            dbList = propertyDict[configName]
+        else: #builds filter dbList to uninstall in databases in dbNameList
+            dbList = [i for i in propertyDict[configName] if i in dbNameList]
+        def uninstall(abstractDb, adminDb):
+            edgvVersion = abstractDb.getDatabaseVersion()
+            dbName = abstractDb.getDatabaseName()
+            with self.databaseTransaction(abstractDb, adminDb):
+                self.undoMaterializationFromDatabase(abstractDb, configName, settingType, edgvVersion) #step done when property management involves changing database structure
+                abstractDb.removeRecordFromPropertyTable(settingType, configName, edgvVersion)
+                adminDb.uninstallPropertyOnAdminDb(settingType, configName, edgvVersion, dbName = dbName)
+        return self.runOnDatabases(dbList, uninstall)
     
     def materializeIntoDatabase(self, abstractDb, propertyDict):
         """
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import concurrent.futures
+import math
+import os
+import threading
+from collections import deque
+from itertools import islice
+
+from qgis.PyQt.QtCore import QSettings
+
+# plugin setting holding the number of worker threads (empty or 0 for default)
+WORKER_COUNT_SETTING = 'PythonPlugins/DsgTools/Options/maxWorkers'
+
+
+def getWorkerCount():
+    """
+    Gets the number of worker threads. It is read from the plugin settings
+    and, if not set, it defaults to one less than the number of CPUs, so that
+    the main thread keeps a core, but never less than one.
+    :return: (int) number of workers.
+    """
+    try:
+        maxWorkers = int(QSettings().value(WORKER_COUNT_SETTING) or 0)
+    except (TypeError, ValueError):
+        maxWorkers = 0
+    if maxWorkers > 0:
+        return maxWorkers
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+class ExecutorService(object):
+    """
+    Lazily created thread pool shared by DsgTools' tools. Work is submitted in
+    chunks (one task per chunkSize items) instead of one future per feature.
+    """
+    DEFAULT_CHUNK_SIZE = 500
+    THREAD_NAME_PREFIX = "DsgToolsWorker"
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self, maxWorkers=None):
+        """
+        Instantiates the service. The thread pool is only created when work is
+        first submitted.
+        :param maxWorkers: (int) number of worker threads.
+        """
+        self._maxWorkers = maxWorkers or getWorkerCount()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """
+        Gets the service shared by DsgTools.
+        :return: (ExecutorService) shared service.
+        """
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def maxWorkers(self):
+        return self._maxWorkers
+
+    def setMaxWorkers(self, maxWorkers):
+        """
+        Sets the number of worker threads. Current pool is released once its
+        running tasks are finished and a new one is created on demand.
+        :param maxWorkers: (int) number of worker threads (None for default).
+        """
+        with self._lock:
+            self._maxWorkers = maxWorkers or getWorkerCount()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def executor(self):
+        """
+        Gets the service's thread pool, creating it if needed.
+        :return: (concurrent.futures.ThreadPoolExecutor) thread pool.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._maxWorkers,
+                    thread_name_prefix=self.THREAD_NAME_PREFIX
+                )
+            return self._executor
+
+    def isWorkerThread(self):
+        """
+        :return: (bool) whether current thread belongs to the service's pool.
+        """
+        return threading.current_thread().name.startswith(self.THREAD_NAME_PREFIX)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _chunks(self, iterable, chunkSize):
+        iterator = iter(iterable)
+        chunk = list(islice(iterator, chunkSize))
+        while chunk:
+            yield chunk
+            chunk = list(islice(iterator, chunkSize))
+
+    def _runChunk(self, func, chunk, feedback):
+        output = []
+        for item in chunk:
+            if feedback is not None and feedback.isCanceled():
+                break
+            output.append(func(item))
+        return output
+
+    def map(self, func, iterable, chunkSize=None, feedback=None, ordered=False,
+            maxPendingChunks=None):
+        """
+        Applies func to every item of iterable on the pool and yields the
+        results. Items are sent to the pool in chunks and workers stop taking
+        items as soon as feedback is canceled. Only a bounded number of chunks
+        is pending at a time, hence iterable is consumed as results are taken
+        and may be a (lazy) generator. When called from one of the pool's
+        threads, items are processed on the calling thread to avoid waiting on
+        tasks that can never be run.
+        :param func: (callable) function of a single argument.
+        :param iterable: (iterable) items to be processed.
+        :param chunkSize: (int) number of items on each task.
+        :param feedback: (QgsFeedback) QGIS object used for cancelation and
+                         progress tracking (from 0 to 100 over the chunks, if
+                         iterable's size is known).
+        :param ordered: (bool) whether results should follow the input order.
+                        Otherwise, results are yielded as chunks are finished.
+        :param maxPendingChunks: (int) maximum number of chunks submitted and
+                                 not yet consumed. Defaults to twice the
+                                 number of workers.
+        :return: (generator) results of func.
+        """
+        chunkSize = chunkSize or self.DEFAULT_CHUNK_SIZE
+        if self.isWorkerThread():
+            for chunk in self._chunks(iterable, chunkSize):
+                yield from self._runChunk(func, chunk, feedback)
+            return
+        try:
+            stepSize = 100 / max(1, math.ceil(len(iterable) / chunkSize))
+        except TypeError:
+            # size of generators is not known
+            stepSize = None
+        pool = self.executor()
+        chunks = self._chunks(iterable, chunkSize)
+        pending = deque()
+        def submitNext():
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(self._runChunk, func, chunk, feedback))
+        for _ in range(maxPendingChunks or 2 * self._maxWorkers):
+            submitNext()
+        current = 0
+        try:
+            while pending:
+                if feedback is not None and feedback.isCanceled():
+                    break
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    future = next(f for f in pending if f in done)
+                    pending.remove(future)
+                output = future.result()
+                # keeps workers busy while results are consumed
+                submitNext()
+                yield from output
+                current += 1
+                if feedback is not None and stepSize is not None:
+                    feedback.setProgress(current * stepSize)
+        finally:
+            for future in pending:
+                future.cancel()
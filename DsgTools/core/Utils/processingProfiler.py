@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import csv
+import json
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from qgis.core import (QgsProcessingFeatureSourceDefinition,
+                       QgsProcessingMultiStepFeedback,
+                       QgsProcessingUtils, QgsVectorLayer)
+
+
+def peakRss():
+    """
+    Gets the peak resident set size of QGIS' process.
+    :return: (int) peak RSS in bytes or None, if it can't be measured.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # reported in bytes on macOS and in kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None:
+        # only reported on Windows
+        return getattr(psutil.Process().memory_info(), "peak_wset", None)
+    return None
+
+
+class ProcessingProfiler(object):
+    """
+    Collects wall time, CPU time, memory and feature counts of processing runs.
+    CPU time is measured on the calling thread only, so that models running
+    concurrently do not account for each other's work. Memory is measured as
+    the growth of the process' peak RSS during the run, which is shared by
+    the whole process: runs overlapping in time (e.g. concurrent models) are
+    accounted for each other's allocations, and a run that stays below an
+    earlier peak reports no growth. A profiler may be activated on the
+    current thread (with statement), so that nested runs (e.g. AlgRunner
+    calls) are also recorded.
+    """
+    MODEL, CHILD_ALGORITHM, ALG_RUNNER = "model", "child_algorithm", "alg_runner"
+    CSV_COLUMNS = [
+        "model", "kind", "name", "wallTime", "cpuTime", "peakRssDelta",
+        "featuresIn", "featuresOut"
+    ]
+    _local = threading.local()
+
+    def __init__(self, name):
+        """
+        Class constructor.
+        :param name: (str) name of the profiled object (e.g. model's name).
+        """
+        self.name = name
+        self.records = []
+
+    def __enter__(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        self._local.stack.append(self)
+        return self
+
+    def __exit__(self, *args):
+        self._local.stack.pop()
+
+    @classmethod
+    def active(cls):
+        """
+        Gets the profiler active on the current thread.
+        :return: (ProcessingProfiler) active profiler or None.
+        """
+        stack = getattr(cls._local, "stack", None)
+        return stack[-1] if stack else None
+
+    @staticmethod
+    def featureCount(value, context=None):
+        """
+        Counts the features of a processing parameter or output value.
+        :param value: (QgsVectorLayer/str/QgsProcessingFeatureSourceDefinition)
+                      value referencing a layer.
+        :param context: (QgsProcessingContext) context used to resolve layers.
+        :return: (int) feature count or None, if value is not a vector layer.
+        """
+        selectedOnly = False
+        if isinstance(value, QgsProcessingFeatureSourceDefinition):
+            selectedOnly = value.selectedFeaturesOnly
+            value = value.source.staticValue()
+        if isinstance(value, str) and value:
+            try:
+                value = QgsProcessingUtils.mapLayerFromString(value, context) \
+                    if context is not None else None
+            except Exception:
+                value = None
+        if not isinstance(value, QgsVectorLayer):
+            return None
+        return value.selectedFeatureCount() if selectedOnly else value.featureCount()
+
+    def startRecord(self, kind, name, featuresIn=None):
+        """
+        Starts measuring a run.
+        :param kind: (str) kind of run (MODEL, CHILD_ALGORITHM or ALG_RUNNER).
+        :param name: (str) name of the run (e.g. algorithm's ID).
+        :param featuresIn: (int) number of input features.
+        :return: (dict) run's record.
+        """
+        record = {
+            "model": self.name,
+            "kind": kind,
+            "name": name,
+            "wallTime": None,
+            "cpuTime": None,
+            "peakRssDelta": None,
+            "featuresIn": featuresIn,
+            "featuresOut": None,
+            "_start": (time.perf_counter(), time.thread_time(), peakRss())
+        }
+        self.records.append(record)
+        return record
+
+    def finishRecord(self, record):
+        """
+        Finishes measuring a run. Finished records are not modified. It must
+        be called from the thread that started the record.
+        :param record: (dict) run's record.
+        """
+        if "_start" not in record:
+            return
+        wallStart, cpuStart, peakStart = record.pop("_start")
+        record["wallTime"] = time.perf_counter() - wallStart
+        record["cpuTime"] = time.thread_time() - cpuStart
+        peakEnd = peakRss()
+        if peakStart is not None and peakEnd is not None:
+            record["peakRssDelta"] = peakEnd - peakStart
+
+    @contextmanager
+    def measure(self, kind, name, featuresIn=None):
+        """
+        Measures the run of the wrapped block of code.
+        :param kind: (str) kind of run (MODEL, CHILD_ALGORITHM or ALG_RUNNER).
+        :param name: (str) name of the run.
+        :param featuresIn: (int) number of input features.
+        :return: (dict) run's record, to be filled by the wrapped block.
+        """
+        record = self.startRecord(kind, name, featuresIn)
+        try:
+            yield record
+        finally:
+            self.finishRecord(record)
+
+    def asList(self):
+        """
+        :return: (list-of-dict) finished records.
+        """
+        return [r for r in self.records if "_start" not in r]
+
+    @classmethod
+    def exportJson(cls, records, filepath):
+        """
+        Exports a list of records as a JSON file.
+        :param records: (list-of-dict) profiling records.
+        :param filepath: (str) output file path.
+        """
+        with open(filepath, "w", encoding="utf-8") as fp:
+            json.dump(records, fp, indent=4)
+
+    @classmethod
+    def exportCsv(cls, records, filepath):
+        """
+        Exports a list of records as a CSV file.
+        :param records: (list-of-dict) profiling records.
+        :param filepath: (str) output file path.
+        """
+        with open(filepath, "w", encoding="utf-8", newline="") as fp:
+            writer = csv.DictWriter(
+                fp, fieldnames=cls.CSV_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(records)
+
+
+class ProfilingFeedback(QgsProcessingMultiStepFeedback):
+    """
+    Feedback proxy that detects which of a model's child algorithms is running,
+    so that each child algorithm run is recorded by a profiler. Models report
+    the ID of each child they are about to prepare, which, unlike the rest of
+    their messages, is not translated.
+    """
+    def __init__(self, profiler, children, feedback=None):
+        """
+        Class constructor.
+        :param profiler: (ProcessingProfiler) profiler to record the runs.
+        :param children: (dict) map of model's child algorithms' IDs to their
+                         descriptions.
+        :param feedback: (QgsFeedback) feedback to forward messages to.
+        """
+        super(ProfilingFeedback, self).__init__(1, feedback)
+        self.setCurrentStep(0)
+        self.profiler = profiler
+        self.children = dict(children)
+        # child IDs are matched as whole tokens, so that an ID that is a
+        # prefix of another one (e.g. alg_1 and alg_10) is not mistaken
+        self.childIdRegex = re.compile(
+            r"(?<![\w:])(?:{0})(?![\w:])".format(
+                "|".join(
+                    re.escape(childId) for childId in \
+                        sorted(self.children, key=len, reverse=True)
+                )
+            )
+        ) if self.children else None
+        self.childRecords = dict()
+        self.currentRecord = None
+
+    def _checkChild(self, text):
+        if self.childIdRegex is None or not text:
+            return
+        for match in self.childIdRegex.finditer(text):
+            childId = match.group(0)
+            if childId in self.childRecords:
+                continue
+            self.finish()
+            self.currentRecord = self.profiler.startRecord(
+                ProcessingProfiler.CHILD_ALGORITHM, self.children[childId])
+            self.childRecords[childId] = self.currentRecord
+            return
+
+    def finish(self):
+        """
+        Finishes measuring current child algorithm.
+        """
+        if self.currentRecord is not None:
+            self.profiler.finishRecord(self.currentRecord)
+            self.currentRecord = None
+
+    def setProgressText(self, text):
+        self._checkChild(text)
+        super(ProfilingFeedback, self).setProgressText(text)
+
+    def pushInfo(self, info):
+        self._checkChild(info)
+        super(ProfilingFeedback, self).pushInfo(info)
+
+    def pushDebugInfo(self, info):
+        self._checkChild(info)
+        super(ProfilingFeedback, self).pushDebugInfo(info)
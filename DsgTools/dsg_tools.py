@@ -41,6 +41,7 @@ from qgis.core import QgsApplication
 from .gui.guiManager import GuiManager
 from .core.DSGToolsProcessingAlgs.dsgtoolsProcessingAlgorithmProvider import DSGToolsProcessingAlgorithmProvider
 from .Modules.acquisitionMenu.controllers.acquisitionMenuCtrl import AcquisitionMenuCtrl
+from .core.Factories.DbFactory.postgisConnectionPool import PostgisConnectionPool
 
 class DsgTools(object):
     """QGIS Plugin Implementation."""
@@ -110,6 +111,7 @@ class DsgTools(object):
         QgsApplication.processingRegistry().removeProvider(self.provider)
         del self.dsgTools
         del self.toolbar
+        PostgisConnectionPool.instance().clear()
 
     def initGui(self):
         """
@@ -50,6 +50,8 @@ class CustomizationManagerWidget(GenericManagerWidget):
         if serverAbstractDb:
             self.setComponentsEnabled(True)
             self.serverAbstractDb = serverAbstractDb
+            if self.genericDbManager is not None:
+                self.genericDbManager.close()
             self.genericDbManager = CustomizationManager(serverAbstractDb, dbsDict, edgvVersion)
             self.refresh()
         else:
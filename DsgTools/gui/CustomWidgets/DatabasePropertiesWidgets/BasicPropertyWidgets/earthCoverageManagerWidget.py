@@ -51,6 +51,8 @@ class EarthCoverageManagerWidget(GenericManagerWidget):
         if serverAbstractDb:
             self.setComponentsEnabled(True)
             self.serverAbstractDb = serverAbstractDb
+            if self.genericDbManager is not None:
+                self.genericDbManager.close()
             self.genericDbManager = EarthCoverageManager(serverAbstractDb, dbsDict, edgvVersion)
             self.refresh()
         else:
@@ -115,6 +115,8 @@ class PermissionWidget(QtWidgets.QWidget, FORM_CLASS):
     def setParameters(self, serverAbstractDb, dbDict, edgvVersion):
         self.serverAbstractDb = serverAbstractDb
         self.dbDict = dbDict
+        if self.permissionManager is not None:
+            self.permissionManager.close()
         self.permissionManager = PermissionManager(self.serverAbstractDb, self.dbDict, edgvVersion)
         self.refresh()
 
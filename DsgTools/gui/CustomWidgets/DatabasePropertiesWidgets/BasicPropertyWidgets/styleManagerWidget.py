@@ -49,6 +49,8 @@ class StyleManagerWidget(GenericManagerWidget):
         if serverAbstractDb:
             self.setComponentsEnabled(True)
             self.serverAbstractDb = serverAbstractDb
+            if self.genericDbManager is not None:
+                self.genericDbManager.close()
             self.genericDbManager = StyleManager(serverAbstractDb, dbsDict, edgvVersion)
             self.refresh()
         else:
@@ -89,6 +89,8 @@ class GenericCompactPropertyManagerWidget(QtWidgets.QWidget, FORM_CLASS):
         2. Instantiate manager object
         """
         self.abstractDb = abstractDb
+        if self.genericDbManager is not None:
+            self.genericDbManager.close()
         self.genericDbManager = self.instantiateManagerObject(abstractDb, {self.abstractDb.db.databaseName():self.abstractDb}, self.abstractDb.getDatabaseVersion())
         self.refresh()
 
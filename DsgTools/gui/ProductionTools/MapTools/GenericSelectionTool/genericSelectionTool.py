@@ -27,13 +27,14 @@ import os
 from functools import partial
 
 from qgis.gui import QgsMapTool, QgsRubberBand
-from qgis.core import QgsPointXY, QgsRectangle, QgsFeatureRequest, QgsVectorLayer, \
+from qgis.core import QgsPointXY, QgsRectangle, QgsVectorLayer, \
                         QgsProject, QgsWkbTypes, QgsRasterLayer
 from qgis.PyQt.QtCore import Qt, QSettings
 from qgis.PyQt.QtGui import QColor, QCursor
 from qgis.PyQt.QtWidgets import QMenu, QApplication
 
 from DsgTools.core.GeometricTools.geometryHandler import GeometryHandler
+from .layerHitTestService import LayerHitTestService
 
 class GenericSelectionTool(QgsMapTool):
     def __init__(self, iface):
@@ -64,6 +65,7 @@ class GenericSelectionTool(QgsMapTool):
         self.cursorChangingHotkey = Qt.Key_Alt
         self.menuHovered = False # indicates hovering actions over context menu
         self.geometryHandler = GeometryHandler(iface=self.iface)
+        self.hitTestService = LayerHitTestService(self.canvas, self.geometryHandler)
     
     def addTool(self, manager, callback, parentMenu, iconBasePath):
         icon_path = iconBasePath + '/genericSelect.png'
@@ -646,34 +648,23 @@ class GenericSelectionTool(QgsMapTool):
         if layers:
             rect = self.getCursorRect(e)
             lyrFeatDict = dict()
-            for layer in layers:
-                if not isinstance(layer, QgsVectorLayer):
-                    continue
+            # features that intersect the mouse bounding box, by layer
+            hits = self.hitTestService.featuresAt(
+                [lyr for lyr in layers if isinstance(lyr, QgsVectorLayer)],
+                rect
+            )
+            for layer, features in hits.items():
                 geomType = layer.geometryType()
-                # iterate over features inside the mouse bounding box
-                bbRect = self.canvas.mapSettings().mapToLayerCoordinates(layer, rect)
-                for feature in layer.getFeatures(QgsFeatureRequest(bbRect)):
-                    geom = feature.geometry()
-                    if geom:
-                        searchRect = self.geometryHandler.reprojectSearchArea(layer, rect)
-                        if selected:
-                            # if Control was held, appending behaviour is different
-                            if not firstGeom:
-                                firstGeom = geomType
-                            elif firstGeom > geomType:
-                                firstGeom = geomType
-                            if geomType == firstGeom and geom.intersects(searchRect):
-                                # only appends features if it has the same geometry as first selected feature
-                                if layer in lyrFeatDict:
-                                    lyrFeatDict[layer].append(feature)
-                                else:
-                                    lyrFeatDict[layer] = [feature]
-                        else:
-                            if geom.intersects(searchRect):
-                                if layer in lyrFeatDict:
-                                    lyrFeatDict[layer].append(feature)
-                                else:
-                                    lyrFeatDict[layer] = [feature]
+                if selected:
+                    # if Control was held, appending behaviour is different
+                    if not firstGeom:
+                        firstGeom = geomType
+                    elif firstGeom > geomType:
+                        firstGeom = geomType
+                    if geomType != firstGeom:
+                        # only appends features if it has the same geometry as first selected feature
+                        continue
+                lyrFeatDict[layer] = features
             lyrFeatDict = self.filterStrongestGeometry(lyrFeatDict)
             #rasters = self.getSelectedRasters(e)
             if lyrFeatDict:
@@ -707,3 +698,4 @@ class GenericSelectionTool(QgsMapTool):
 
     def unload(self):
         self.deactivate()
+        self.hitTestService.clear()
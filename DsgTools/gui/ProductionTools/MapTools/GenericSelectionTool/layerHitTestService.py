@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import threading
+
+from qgis.core import (QgsFeature, QgsFeatureRequest, QgsGeometry,
+                       QgsProject, QgsSpatialIndex,
+                       QgsVectorLayerFeatureSource)
+from qgis.PyQt.QtCore import QObject
+
+from DsgTools.core.Utils.executorService import ExecutorService
+
+
+class LayerHitIndex(QObject):
+    """
+    In-memory spatial index of a layer's geometries on canvas' CRS. It is
+    kept up to date from the layer's edition signals. A new index may be built
+    on any thread from a snapshot of the layer (a feature source), but it is
+    only swapped in on the main thread and only if the layer has not changed
+    since that snapshot was taken.
+    """
+    def __init__(self, layer, destinationCrs, parent=None):
+        """
+        Class constructor.
+        :param layer: (QgsVectorLayer) layer to be indexed.
+        :param destinationCrs: (QgsCoordinateReferenceSystem) canvas' CRS.
+        :param parent: (QObject) parent object.
+        """
+        super(LayerHitIndex, self).__init__(parent)
+        self.layer = layer
+        self.destinationCrs = destinationCrs
+        self.transformContext = QgsProject.instance().transformContext()
+        self.spatialIdx = None
+        self._dirty = True
+        # increased on every layer change, so that outdated snapshots are
+        # not swapped in
+        self._generation = 0
+        # guards the index against being edited while it is queried
+        self._lock = threading.Lock()
+        self._connections = [
+            (layer.featureAdded, self.featureAdded),
+            (layer.featuresDeleted, self.featuresDeleted),
+            (layer.geometryChanged, self.geometryChanged),
+            # feature IDs change when features are committed
+            (layer.afterCommitChanges, self.setDirty),
+            (layer.afterRollBack, self.setDirty),
+            (layer.dataChanged, self.setDirty),
+            (layer.subsetStringChanged, self.setDirty),
+            (layer.crsChanged, self.setDirty),
+        ]
+        for signal, slot in self._connections:
+            signal.connect(slot)
+
+    def stopWatching(self):
+        """
+        Stops keeping the index up to date.
+        """
+        for signal, slot in self._connections:
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                # layer might have already been deleted
+                pass
+        self._connections = []
+
+    def isDirty(self):
+        return self._dirty
+
+    def generation(self):
+        """
+        :return: (int) layer's current snapshot generation.
+        """
+        return self._generation
+
+    def setDirty(self, *args):
+        """
+        Sets the index to be rebuilt on its next query.
+        """
+        with self._lock:
+            self._dirty = True
+            self._generation += 1
+            self.spatialIdx = None
+
+    def request(self):
+        """
+        :return: (QgsFeatureRequest) request used to read layer's geometries.
+        """
+        return QgsFeatureRequest().setNoAttributes().setDestinationCrs(
+            self.destinationCrs, self.transformContext)
+
+    @staticmethod
+    def buildIndex(source, request):
+        """
+        Builds a spatial index from a layer snapshot. It does not touch any
+        shared state and may be called from a worker thread.
+        :param source: (QgsVectorLayerFeatureSource) layer's feature source.
+        :param request: (QgsFeatureRequest) request used to read geometries.
+        :return: (QgsSpatialIndex) new spatial index.
+        """
+        return QgsSpatialIndex(
+            source.getFeatures(request),
+            flags=QgsSpatialIndex.FlagStoreFeatureGeometries
+        )
+
+    def swap(self, spatialIdx, generation):
+        """
+        Replaces the index by one built from a snapshot of the layer. Must be
+        called from the main thread.
+        :param spatialIdx: (QgsSpatialIndex) index built from the snapshot.
+        :param generation: (int) generation of the snapshot.
+        :return: (bool) whether the index was swapped in. It is not if the
+                 layer has changed since the snapshot was taken.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self.spatialIdx = spatialIdx
+            self._dirty = False
+            return True
+
+    def rebuild(self):
+        """
+        Builds the index from scratch on the calling (main) thread.
+        """
+        self.swap(
+            self.buildIndex(QgsVectorLayerFeatureSource(self.layer), self.request()),
+            self._generation
+        )
+
+    def _addFeature(self, featId):
+        for feature in self.layer.getFeatures(self.request().setFilterFid(featId)):
+            if feature.hasGeometry():
+                self.spatialIdx.addFeature(feature)
+
+    def _deleteFeature(self, featId):
+        geom = self.spatialIdx.geometry(featId)
+        if geom.isNull():
+            return
+        feature = QgsFeature(featId)
+        feature.setGeometry(geom)
+        self.spatialIdx.deleteFeature(feature)
+
+    def featureAdded(self, featId):
+        with self._lock:
+            self._generation += 1
+            if not self._dirty:
+                self._addFeature(featId)
+
+    def featuresDeleted(self, featIds):
+        with self._lock:
+            self._generation += 1
+            if self._dirty:
+                return
+            for featId in featIds:
+                self._deleteFeature(featId)
+
+    def geometryChanged(self, featId, geom):
+        with self._lock:
+            self._generation += 1
+            if self._dirty:
+                return
+            self._deleteFeature(featId)
+            self._addFeature(featId)
+
+    @staticmethod
+    def hits(spatialIdx, searchGeom):
+        """
+        Gets the IDs of the features of a spatial index that intersect a
+        geometry.
+        :param spatialIdx: (QgsSpatialIndex) index storing features' geometries.
+        :param searchGeom: (QgsGeometry) search area on index's CRS.
+        :return: (list-of-int) IDs of the intersecting features.
+        """
+        return [
+            featId for featId in spatialIdx.intersects(searchGeom.boundingBox()) \
+                if spatialIdx.geometry(featId).intersects(searchGeom)
+        ]
+
+    def intersects(self, searchGeom):
+        """
+        Gets the IDs of the indexed features that intersect a geometry.
+        :param searchGeom: (QgsGeometry) search area on canvas' CRS.
+        :return: (list-of-int) IDs of the intersecting features or None, if
+                 the index is outdated.
+        """
+        with self._lock:
+            if self._dirty:
+                return None
+            return self.hits(self.spatialIdx, searchGeom)
+
+
+class LayerHitTestService(QObject):
+    """
+    Finds the features of several layers under a search area on canvas. Each
+    layer is queried on its own task from a cached LayerHitIndex, while
+    layers that are too large to be cached are requested from their providers
+    with the search area reprojected once per layer CRS.
+    """
+    # layers with more features than that are not kept in memory
+    MAX_INDEXED_FEATURES = 200000
+
+    def __init__(self, canvas, geometryHandler, parent=None):
+        """
+        Class constructor.
+        :param canvas: (QgsMapCanvas) canvas whose CRS is used on the indexes.
+        :param geometryHandler: (GeometryHandler) handler used to reproject
+                                the search area.
+        :param parent: (QObject) parent object.
+        """
+        super(LayerHitTestService, self).__init__(parent)
+        self.canvas = canvas
+        self.geometryHandler = geometryHandler
+        self.hitIndexes = dict()
+        self.canvas.destinationCrsChanged.connect(self.clear)
+
+    def isIndexable(self, layer):
+        return 0 <= layer.featureCount() <= self.MAX_INDEXED_FEATURES
+
+    def hitIndex(self, layer):
+        """
+        Gets the cached index of a layer, creating it if needed. It is not
+        built here, though.
+        :param layer: (QgsVectorLayer) layer to be indexed.
+        :return: (LayerHitIndex) layer's index or None, if layer is too large.
+        """
+        if not self.isIndexable(layer):
+            self.dropLayer(layer.id())
+            return None
+        layerId = layer.id()
+        if layerId not in self.hitIndexes:
+            self.hitIndexes[layerId] = LayerHitIndex(
+                layer, self.canvas.mapSettings().destinationCrs())
+            layer.willBeDeleted.connect(lambda: self.dropLayer(layerId))
+        return self.hitIndexes[layerId]
+
+    def dropLayer(self, layerId):
+        """
+        Drops the cached index of a layer.
+        :param layerId: (str) layer's ID.
+        """
+        hitIndex = self.hitIndexes.pop(layerId, None)
+        if hitIndex is not None:
+            hitIndex.stopWatching()
+
+    def clear(self):
+        """
+        Drops every cached index.
+        """
+        for layerId in list(self.hitIndexes):
+            self.dropLayer(layerId)
+
+    def _queryLayer(self, job):
+        """
+        Queries a layer on a worker thread.
+        :param job: (tuple) search area, layer's index, layer's feature source,
+                    reprojected search area and index request, if the index
+                    should be rebuilt.
+        :return: (tuple) intersecting features and the rebuilt spatial index
+                 (None, if it was not rebuilt).
+        """
+        rect, hitIndex, source, layerRect, indexRequest = job
+        spatialIdx = None
+        if hitIndex is None:
+            searchGeom = QgsGeometry.fromRect(layerRect)
+            return [
+                feature for feature in source.getFeatures(QgsFeatureRequest(layerRect)) \
+                    if feature.hasGeometry() and feature.geometry().intersects(searchGeom)
+            ], spatialIdx
+        searchGeom = QgsGeometry.fromRect(rect)
+        featIds = hitIndex.intersects(searchGeom) if indexRequest is None else None
+        if featIds is None:
+            # shared index is only replaced on the main thread
+            spatialIdx = LayerHitIndex.buildIndex(
+                source, indexRequest or hitIndex.request())
+            featIds = LayerHitIndex.hits(spatialIdx, searchGeom)
+        if not featIds:
+            return [], spatialIdx
+        return list(
+            source.getFeatures(QgsFeatureRequest().setFilterFids(featIds))
+        ), spatialIdx
+
+    def featuresAt(self, layers, rect):
+        """
+        Gets the features of each layer that intersect a search area.
+        :param layers: (list-of-QgsVectorLayer) layers to be queried.
+        :param rect: (QgsRectangle) search area on canvas' CRS.
+        :return: (dict) map of layer to its intersecting features (on layer's
+                 CRS), following the order of layers. Layers without any hit
+                 are not mapped.
+        """
+        # reprojected search areas, by layer CRS
+        layerRects = dict()
+        jobs, generations = [], []
+        for layer in layers:
+            hitIndex = self.hitIndex(layer)
+            layerRect, indexRequest = None, None
+            generations.append(None if hitIndex is None else hitIndex.generation())
+            if hitIndex is not None and hitIndex.isDirty():
+                indexRequest = hitIndex.request()
+            elif hitIndex is None:
+                authid = layer.crs().authid()
+                if authid not in layerRects:
+                    layerRects[authid] = self.geometryHandler.reprojectSearchArea(layer, rect)
+                layerRect = layerRects[authid]
+            # feature sources are created on the main thread and are safe to
+            # be iterated on the workers
+            jobs.append((
+                rect, hitIndex, QgsVectorLayerFeatureSource(layer), layerRect,
+                indexRequest
+            ))
+        results = ExecutorService.instance().map(
+            self._queryLayer, jobs, chunkSize=1, ordered=True)
+        hits = dict()
+        for layer, job, generation, (features, spatialIdx) in zip(
+            layers, jobs, generations, results
+        ):
+            if spatialIdx is not None:
+                job[1].swap(spatialIdx, generation)
+            if features:
+                hits[layer] = features
+        return hits
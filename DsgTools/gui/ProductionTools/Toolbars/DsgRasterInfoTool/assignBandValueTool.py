@@ -27,7 +27,7 @@ from qgis.gui import QgsMapTool, QgsRubberBand, QgsMapToolEmitPoint, \
                      QgsAttributeDialog, QgsAttributeForm, QgsMessageBar
 from qgis import core
 from qgis.core import QgsPointXY, QgsRectangle, QgsVectorLayer, QgsGeometry, \
-                      QgsEditFormConfig, QgsRaster, QgsFeature, QgsWkbTypes, \
+                      QgsEditFormConfig, QgsFeature, QgsWkbTypes, \
                       QgsProject, QgsVectorLayerUtils, Qgis
 from qgis.PyQt.QtCore import QSettings
 from qgis.PyQt import QtCore, QtGui
@@ -36,9 +36,10 @@ from qgis.PyQt.QtWidgets import QMenu, QApplication
 
 from qgis.PyQt.QtCore import Qt
 from DsgTools.core.GeometricTools.geometryHandler import GeometryHandler
+from DsgTools.gui.ProductionTools.Toolbars.DsgRasterInfoTool.rasterSamplingService import RasterSamplingService
 
 class AssignBandValueTool(QgsMapTool):
-    def __init__(self, iface, rasterLayer):
+    def __init__(self, iface, rasterLayer, samplingService=None):
         """
         Tool Behaviours: (all behaviours start edition, except for rectangle one)
         1- Left Click: Creates a new point feature with the value from raster, according to selected attribute. 
@@ -52,6 +53,7 @@ class AssignBandValueTool(QgsMapTool):
         self.qgsMapToolEmitPoint = QgsMapToolEmitPoint(self.canvas)
         self.geometryHandler = GeometryHandler(iface)
         self.rasterLayer = rasterLayer
+        self.samplingService = samplingService or RasterSamplingService(parent=self)
         self.setRubberbandParameters()
         self.reset()
         self.auxList = []
@@ -279,15 +281,13 @@ class AssignBandValueTool(QgsMapTool):
         mousePosGeom = QgsGeometry(mousePosGeom)
         self.geometryHandler.reprojectFeature(mousePosGeom, rasterCrs, self.canvas.currentLayer().crs())
         mousePos = mousePosGeom.asMultiPoint()[0] if mousePosGeom.isMultipart() else mousePosGeom.asPoint()
-        # identify pixel(s) information
-        i = rasterLayer.dataProvider().identify( mousePos, QgsRaster.IdentifyFormatValue )
-        if i.isValid():
-            value = list(i.results().values())[0]
-            if value:
-                value = int(value) if self.decimals == 0 else round(value, self.decimals)
-            return value
-        else:
+        values = self.samplingService.values(rasterLayer, mousePos, wait=True)
+        if not values:
             return None
+        value = values[0]
+        if value:
+            value = int(value) if self.decimals == 0 else round(value, self.decimals)
+        return value
     
     def getPixelValueFromPointDict(self, pointDict, rasterLayer):
         """
@@ -26,7 +26,6 @@ from functools import partial
 
 from qgis.core import (
     QgsGeometry,
-    QgsRaster,
     QgsVectorLayer,
     QgsRasterLayer,
     QgsWkbTypes,
@@ -45,6 +44,9 @@ from DsgTools.core.GeometricTools.geometryHandler import GeometryHandler
 from DsgTools.gui.ProductionTools.Toolbars.DsgRasterInfoTool.assignBandValueTool import (
     AssignBandValueTool,
 )
+from DsgTools.gui.ProductionTools.Toolbars.DsgRasterInfoTool.rasterSamplingService import (
+    RasterSamplingService,
+)
 
 # FORM_CLASS, _ = uic.loadUiType(os.path.join(os.path.dirname(__file__), 'dsgRasterInfoTool.ui'))
 from .dsgRasterInfoTool_ui import Ui_DsgRasterInfoTool
@@ -79,6 +81,10 @@ class DsgRasterInfoTool(QWidget, Ui_DsgRasterInfoTool):
         self.iface = iface
         self.timerMapTips = QTimer(self.canvas)
         self.geometryHandler = GeometryHandler(iface)
+        # shared by the tooltip and the value setter
+        self.samplingService = RasterSamplingService(parent=self)
+        self.samplingService.tileLoaded.connect(self.refreshToolTip)
+        self.lastToolTipPoint = None
         self.addShortcuts()
         self.valueSetterButton.setEnabled(False)
         self.iface.mapCanvas().currentLayerChanged.connect(self.enableAssignValue)
@@ -291,7 +297,9 @@ class DsgRasterInfoTool(QWidget, Ui_DsgRasterInfoTool):
 
     def loadTool(self, iface, raster):
         self.disconnectAllSignals()
-        self.assignBandValueTool = AssignBandValueTool(self.iface, raster)
+        self.assignBandValueTool = AssignBandValueTool(
+            self.iface, raster, samplingService=self.samplingService
+        )
         self.assignBandValueTool.activate()
         self.iface.mapCanvas().setMapTool(self.assignBandValueTool)
         self.connectAllSignals()
@@ -306,33 +314,46 @@ class DsgRasterInfoTool(QWidget, Ui_DsgRasterInfoTool):
         self.connectAllSignals()
 
     def getPixelValue(self, mousePos, rasterLayer):
-        """ """
+        """
+        Gets the band values of the pixel under a canvas position.
+        :return: (str) band values text or None, if pixel's tile is still
+                 being read (tooltip is refreshed once it is loaded).
+        """
         rasterCrs = rasterLayer.crs()
         mousePosGeom = QgsGeometry.fromPointXY(mousePos)
         canvasCrs = self.canvas.mapSettings().destinationCrs()
         self.geometryHandler.reprojectFeature(mousePosGeom, rasterCrs, canvasCrs)
         mousePos = mousePosGeom.asPoint()
-        # identify pixel(s) information
-        i = rasterLayer.dataProvider().identify(mousePos, QgsRaster.IdentifyFormatValue)
-        if i.isValid():
-            text = ", ".join(
-                ["{0:g}".format(r) for r in list(i.results().values()) if r is not None]
-            )
-        else:
-            text = ""
-        return text
+        values = self.samplingService.values(rasterLayer, mousePos)
+        if values is None:
+            return None
+        return ", ".join(["{0:g}".format(r) for r in values if r is not None])
 
     def showToolTip(self, qgsPoint):
         """ """
         self.timerMapTips.stop()
         self.timerMapTips.start(6000)  # time in milliseconds
+        self.lastToolTipPoint = qgsPoint
         if self.canvas.underMouse():
             raster = self.rasterComboBox.currentLayer()
             if raster:
                 text = self.getPixelValue(qgsPoint, raster)
+                if text is None:
+                    return
                 p = self.canvas.mapToGlobal(self.canvas.mouseLastXY())
                 QToolTip.showText(p, text, self.canvas)
 
+    def refreshToolTip(self, key=None):
+        """
+        Shows the tooltip of the last hovered position once its tile is loaded.
+        :param key: (tuple) key of the loaded tile. Tiles other than the one
+                    last sampled (e.g. prefetched neighbours) are ignored.
+        """
+        if key is not None and key != self.samplingService.cursor:
+            return
+        if self.bandTooltipButton.isChecked() and self.lastToolTipPoint is not None:
+            self.showToolTip(self.lastToolTipPoint)
+
     @pyqtSlot(bool)
     def on_refreshPushButton_clicked(self):
         activeLayer = self.iface.activeLayer()
@@ -356,6 +377,7 @@ class DsgRasterInfoTool(QWidget, Ui_DsgRasterInfoTool):
             self.iface.mapCanvas().xyCoordinates.disconnect(self.showToolTip)
         except:
             pass
+        self.samplingService.setLayer(None)
         self.iface.unregisterMainWindowAction(self.activateToolAction)
         self.iface.unregisterMainWindowAction(self.valueSetterButtonAction)
         self.iface.unregisterMainWindowAction(self.bandTooltipButtonAction)
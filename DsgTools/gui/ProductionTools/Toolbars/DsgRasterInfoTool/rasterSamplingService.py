@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import math
+import threading
+from collections import OrderedDict
+
+from qgis.core import QgsRaster, QgsRasterDataProvider, QgsRectangle
+from qgis.PyQt.QtCore import QObject, pyqtSignal
+
+from DsgTools.core.Utils.executorService import ExecutorService
+
+
+class RasterSamplingService(QObject):
+    """
+    Samples a raster layer's band values from an LRU cache of tiles (blocks
+    of TILE_SIZE x TILE_SIZE pixels at raster's native resolution). Missing
+    tiles and their neighbours are read on the shared worker pool, each read
+    through its own clone of layer's data provider, and tileLoaded is emitted
+    once a tile is cached, so that callers may sample again. Only a few reads
+    run at once: further requests wait in a queue, from which requests far
+    from the last sampled tile (the cursor) are dropped.
+    """
+    # emitted (on the thread the service lives on) when a tile is cached,
+    # along with its (column, row) key
+    tileLoaded = pyqtSignal(object)
+    # emitted by workers whenever a read ends, so that queued reads start
+    readFinished = pyqtSignal()
+    TILE_SIZE = 256
+    DEFAULT_MAX_TILES = 64
+    # maximum number of tiles being read at the same time
+    MAX_PENDING_READS = 4
+    # queued requests farther than that (in tiles) from the cursor are dropped
+    MAX_QUEUED_DISTANCE = 1
+
+    def __init__(self, maxTiles=None, parent=None):
+        """
+        Class constructor.
+        :param maxTiles: (int) maximum number of cached tiles.
+        :param parent: (QObject) parent object.
+        """
+        super(RasterSamplingService, self).__init__(parent)
+        self.maxTiles = maxTiles or self.DEFAULT_MAX_TILES
+        self.layer = None
+        self.tiles = OrderedDict()
+        self.pending = set()
+        # requests waiting for a read slot, oldest first
+        self.queued = []
+        # key of the last sampled tile
+        self.cursor = None
+        # provider clones not being used by any read
+        self._idleProviders = []
+        # tiles read for a previous layer (or data) are dropped
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.readFinished.connect(self.startQueued)
+
+    def setLayer(self, layer):
+        """
+        Sets the sampled layer. Cache is cleared whenever it changes.
+        :param layer: (QgsRasterLayer) layer to be sampled.
+        """
+        if layer is self.layer:
+            return
+        if self.layer is not None:
+            try:
+                self.layer.dataChanged.disconnect(self.clear)
+                self.layer.willBeDeleted.disconnect(self.unsetLayer)
+            except (TypeError, RuntimeError):
+                pass
+        self.clear()
+        self.layer = layer
+        if layer is not None:
+            layer.dataChanged.connect(self.clear)
+            layer.willBeDeleted.connect(self.unsetLayer)
+
+    def unsetLayer(self):
+        self.setLayer(None)
+
+    def clear(self):
+        """
+        Drops every cached tile. Reads in progress are discarded.
+        """
+        with self._lock:
+            self._generation += 1
+            self.tiles = OrderedDict()
+            self.pending = set()
+            self.queued = []
+            self.cursor = None
+            self._idleProviders = []
+
+    def isTileable(self):
+        """
+        :return: (bool) whether layer's provider has a native size (e.g. WMS
+                 does not), which is required to read tiles.
+        """
+        provider = self.layer.dataProvider()
+        return bool(provider.capabilities() & QgsRasterDataProvider.Size) \
+            and provider.xSize() > 0 and provider.ySize() > 0
+
+    def resolution(self):
+        provider = self.layer.dataProvider()
+        extent = provider.extent()
+        return extent.width() / provider.xSize(), extent.height() / provider.ySize()
+
+    def pixel(self, point):
+        """
+        :param point: (QgsPointXY) point on raster's CRS.
+        :return: (tuple) (column, row) of the pixel under point or None.
+        """
+        provider = self.layer.dataProvider()
+        extent = provider.extent()
+        xRes, yRes = self.resolution()
+        col = int(math.floor((point.x() - extent.xMinimum()) / xRes))
+        row = int(math.floor((extent.yMaximum() - point.y()) / yRes))
+        if not (0 <= col < provider.xSize() and 0 <= row < provider.ySize()):
+            return None
+        return col, row
+
+    def tileKey(self, col, row):
+        return col // self.TILE_SIZE, row // self.TILE_SIZE
+
+    def isValidTile(self, key):
+        provider = self.layer.dataProvider()
+        return 0 <= key[0] * self.TILE_SIZE < provider.xSize() and \
+            0 <= key[1] * self.TILE_SIZE < provider.ySize()
+
+    def readTile(self, provider, key, extent, resolution):
+        """
+        Reads a tile's blocks. Layer is not accessed, hence it may run on any
+        thread with a provider that is not used elsewhere.
+        :param provider: (QgsRasterDataProvider) provider to be read.
+        :param key: (tuple) tile's (column, row).
+        :param extent: (QgsRectangle) provider's extent.
+        :param resolution: (tuple) pixel's width and height.
+        :return: (list-of-QgsRasterBlock) tile's block of each band.
+        """
+        xRes, yRes = resolution
+        col0, row0 = key[0] * self.TILE_SIZE, key[1] * self.TILE_SIZE
+        width = min(self.TILE_SIZE, provider.xSize() - col0)
+        height = min(self.TILE_SIZE, provider.ySize() - row0)
+        xMin = extent.xMinimum() + col0 * xRes
+        yMax = extent.yMaximum() - row0 * yRes
+        tileExtent = QgsRectangle(xMin, yMax - height * yRes, xMin + width * xRes, yMax)
+        return [
+            provider.block(band, tileExtent, width, height) \
+                for band in range(1, provider.bandCount() + 1)
+        ]
+
+    def _storeTile(self, key, blocks, generation):
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self.pending.discard(key)
+            if blocks is None:
+                return False
+            self.tiles[key] = blocks
+            while len(self.tiles) > self.maxTiles:
+                self.tiles.popitem(last=False)
+        return True
+
+    def _readTileJob(self, provider, key, extent, resolution, generation):
+        blocks = None
+        try:
+            blocks = self.readTile(provider, key, extent, resolution)
+        finally:
+            stored = self._storeTile(key, blocks, generation)
+            with self._lock:
+                if generation == self._generation:
+                    self._idleProviders.append(provider)
+            self.readFinished.emit()
+        if stored:
+            self.tileLoaded.emit(key)
+
+    @staticmethod
+    def tileDistance(key, otherKey):
+        """
+        :return: (int) distance between two tiles, in tiles (Chebyshev).
+        """
+        return max(abs(key[0] - otherKey[0]), abs(key[1] - otherKey[1]))
+
+    def setCursor(self, key):
+        """
+        Sets the last sampled tile. Queued requests far from it are dropped.
+        :param key: (tuple) tile's (column, row).
+        """
+        with self._lock:
+            self.cursor = key
+            self.queued = [
+                queuedKey for queuedKey in self.queued \
+                    if self.tileDistance(queuedKey, key) <= self.MAX_QUEUED_DISTANCE
+            ]
+
+    def startQueued(self):
+        """
+        Starts the queued requests nearest to the cursor while there are free
+        read slots. Must be called from the thread the layer lives on.
+        """
+        while True:
+            with self._lock:
+                if not self.queued or len(self.pending) >= self.MAX_PENDING_READS:
+                    return
+                cursor = self.cursor
+                key = min(
+                    self.queued,
+                    key=lambda k: self.tileDistance(k, cursor) if cursor is not None else 0
+                )
+                self.queued.remove(key)
+            if self.layer is None:
+                return
+            self.requestTile(key)
+
+    def requestTile(self, key):
+        """
+        Reads a tile on the worker pool, unless it is cached or being read.
+        If too many tiles are being read, the request is queued. Must be called
+        from the thread the layer lives on.
+        :param key: (tuple) tile's (column, row).
+        """
+        if not self.isValidTile(key):
+            return
+        with self._lock:
+            if key in self.tiles or key in self.pending:
+                return
+            if len(self.pending) >= self.MAX_PENDING_READS:
+                if key not in self.queued:
+                    self.queued.append(key)
+                return
+            self.pending.add(key)
+            generation = self._generation
+            provider = self._idleProviders.pop() if self._idleProviders else None
+        if provider is None:
+            # providers must be cloned on layer's thread
+            provider = self.layer.dataProvider().clone()
+        ExecutorService.instance().executor().submit(
+            self._readTileJob,
+            provider,
+            key,
+            self.layer.dataProvider().extent(),
+            self.resolution(),
+            generation
+        )
+
+    def prefetch(self, key):
+        """
+        Requests the tiles around a tile.
+        :param key: (tuple) tile's (column, row).
+        """
+        for dc in (-1, 0, 1):
+            for dr in (-1, 0, 1):
+                if dc or dr:
+                    self.requestTile((key[0] + dc, key[1] + dr))
+
+    def cachedValues(self, key, col, row):
+        """
+        :return: (list) band values of a pixel (None for nodata) or None, if
+                 its tile is not cached.
+        """
+        with self._lock:
+            blocks = self.tiles.get(key)
+            if blocks is None:
+                return None
+            self.tiles.move_to_end(key)
+        return self.blockValues(blocks, key, col, row)
+
+    def blockValues(self, blocks, key, col, row):
+        """
+        :return: (list) band values of a pixel of a tile (None for nodata).
+        """
+        r, c = row - key[1] * self.TILE_SIZE, col - key[0] * self.TILE_SIZE
+        return [
+            None if block.isNoData(r, c) else block.value(r, c) for block in blocks
+        ]
+
+    def identify(self, point):
+        """
+        Samples the layer without the cache (for providers without a native
+        size).
+        :param point: (QgsPointXY) point on raster's CRS.
+        :return: (list) band values.
+        """
+        i = self.layer.dataProvider().identify(point, QgsRaster.IdentifyFormatValue)
+        return list(i.results().values()) if i.isValid() else []
+
+    def values(self, layer, point, wait=False):
+        """
+        Samples a layer's band values at a point.
+        :param layer: (QgsRasterLayer) layer to be sampled.
+        :param point: (QgsPointXY) point on raster's CRS.
+        :param wait: (bool) whether a missing tile should be read right away
+                     (on current thread) instead of in the background.
+        :return: (list) band values of the pixel (None for nodata), an empty
+                 list if point is outside the raster or None if its tile is
+                 still being read (tileLoaded is emitted once it is cached).
+        """
+        self.setLayer(layer)
+        if not self.isTileable():
+            return self.identify(point)
+        pixel = self.pixel(point)
+        if pixel is None:
+            return []
+        key = self.tileKey(*pixel)
+        self.setCursor(key)
+        values = self.cachedValues(key, *pixel)
+        if values is None and wait:
+            provider = self.layer.dataProvider()
+            with self._lock:
+                generation = self._generation
+            blocks = self.readTile(provider, key, provider.extent(), self.resolution())
+            self._storeTile(key, blocks, generation)
+            values = self.blockValues(blocks, key, *pixel)
+        elif values is None:
+            self.requestTile(key)
+        self.prefetch(key)
+        return values
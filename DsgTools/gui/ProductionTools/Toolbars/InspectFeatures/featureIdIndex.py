@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+from bisect import bisect_left, insort
+
+from qgis.core import (QgsExpression, QgsExpressionContext,
+                       QgsExpressionContextUtils, QgsFeatureRequest)
+from qgis.PyQt.QtCore import QObject, QVariant
+
+
+class FeatureIdIndex(QObject):
+    """
+    Ordered list of the IDs of a layer's features that satisfy a filter
+    expression, sorted by an attribute and then by feature ID (the same order
+    used by Inspect Features' requests, with NULL values last). The list is
+    sorted by the layer's provider, so that text values follow its collation,
+    and it is kept up to date from the layer's edition signals. Edits that
+    can't change the list are ignored, while commits, roll backs and bulk
+    edits make it be rebuilt on its next access. As the provider's collation
+    is not known here, lists sorted by a text field are also rebuilt after an
+    edit moves one of their features.
+    It behaves as a read-only list of feature IDs.
+    """
+    # edits within a single edit command (e.g. field calculator) after which
+    # the index stops following them and is rebuilt on its next access
+    BULK_EDIT_THRESHOLD = 100
+
+    def __init__(self, layer, expression="", sortField=None, ascending=True, parent=None):
+        """
+        Class constructor.
+        :param layer: (QgsVectorLayer) layer to be indexed.
+        :param expression: (str) filter expression.
+        :param sortField: (str) name of the field used for sorting. IDs are
+                          sorted by feature ID only if it is not given.
+        :param ascending: (bool) sorting direction.
+        :param parent: (QObject) parent object.
+        """
+        super(FeatureIdIndex, self).__init__(parent)
+        self.layer = layer
+        self.expression = expression or ""
+        self.sortField = sortField or None
+        self.ascending = ascending
+        self._dirty = True
+        self._commandEdits = None
+        self._keys, self._nullIds, self._keyById = [], [], dict()
+        self._positions = dict()
+        fields = layer.fields()
+        self._sortIdx = fields.indexFromName(self.sortField) \
+            if self.sortField is not None else -1
+        # text values can't be placed without the provider's collation
+        self._providerOrder = self._sortIdx >= 0 and \
+            fields.at(self._sortIdx).type() == QVariant.String
+        if self.expression:
+            exp = QgsExpression(self.expression)
+            columns = exp.referencedColumns()
+            self._filterIdxs = None if QgsFeatureRequest.ALL_ATTRIBUTES in columns \
+                else {fields.indexFromName(c) for c in columns}
+            self._filterGeometry = exp.needsGeometry()
+        else:
+            self._filterIdxs, self._filterGeometry = set(), False
+        self._connections = [
+            (layer.featureAdded, self.featureAdded),
+            (layer.featuresDeleted, self.featuresDeleted),
+            (layer.attributeValueChanged, self.attributeValueChanged),
+            (layer.geometryChanged, self.geometryChanged),
+            (layer.editCommandStarted, self.editCommandStarted),
+            (layer.editCommandEnded, self.editCommandEnded),
+            (layer.editCommandDestroyed, self.editCommandEnded),
+            # feature IDs change when features are committed
+            (layer.afterCommitChanges, self.setDirty),
+            (layer.afterRollBack, self.setDirty),
+            (layer.subsetStringChanged, self.setDirty),
+            (layer.willBeDeleted, self.stopWatching),
+        ]
+        for signal, slot in self._connections:
+            signal.connect(slot)
+
+    def key(self):
+        """
+        :return: (tuple) the parameters this index was built for.
+        """
+        return (self.expression, self.sortField, self.ascending)
+
+    def stopWatching(self):
+        """
+        Stops keeping the index up to date.
+        """
+        for signal, slot in self._connections:
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        self._connections = []
+
+    def setDirty(self, *args):
+        """
+        Sets the index to be rebuilt on its next access.
+        """
+        self._dirty = True
+
+    def _isWatching(self):
+        """
+        Checks whether an edit should be applied to the index. Edits of a
+        command that changes too many features are not followed one by one.
+        :return: (bool) whether the index is kept up to date.
+        """
+        if self._dirty:
+            return False
+        if self._commandEdits is not None:
+            self._commandEdits += 1
+            if self._commandEdits > self.BULK_EDIT_THRESHOLD:
+                self.setDirty()
+                return False
+        return True
+
+    def _expressionContext(self):
+        context = QgsExpressionContext()
+        context.appendScopes(
+            QgsExpressionContextUtils.globalProjectLayerScopes(self.layer))
+        return context
+
+    def _sortValue(self, value):
+        if self.sortField is None:
+            return 0
+        if value is None or isinstance(value, QVariant):
+            # NULL values are placed last
+            return None
+        return value
+
+    def _request(self):
+        request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+        if self.expression:
+            request.setFilterExpression(self.expression)
+        if self.sortField is not None and not self.expression:
+            request.setSubsetOfAttributes([self.sortField], self.layer.fields())
+        if self.sortField is not None:
+            request.addOrderBy(
+                QgsExpression.quotedColumnRef(self.sortField), True, False)
+        return request.addOrderBy("$id", True)
+
+    def rebuild(self):
+        """
+        Builds the index from scratch, as sorted by the layer's provider.
+        """
+        self._keys, self._nullIds, self._keyById = [], [], dict()
+        for feature in self.layer.getFeatures(self._request()):
+            value = feature[self.sortField] if self.sortField is not None else None
+            self._add(feature.id(), self._sortValue(value), sort=False)
+        self._positions = {
+            featId: pos for pos, featId in enumerate(
+                [key[1] for key in self._keys] + self._nullIds)
+        } if self._providerOrder else dict()
+        self._dirty = False
+
+    def _add(self, featId, value, sort=True):
+        if sort and self._providerOrder:
+            # positions are only known for the provider's order
+            self.setDirty()
+            return
+        if value is None:
+            key = None
+            container, item = self._nullIds, featId
+        else:
+            key = (value, featId)
+            container, item = self._keys, key
+        self._keyById[featId] = key
+        if sort:
+            insort(container, item)
+        else:
+            container.append(item)
+
+    def _remove(self, featId):
+        if featId not in self._keyById:
+            return
+        if self._providerOrder:
+            self.setDirty()
+            return
+        key = self._keyById.pop(featId)
+        container, item = (self._nullIds, featId) if key is None \
+            else (self._keys, key)
+        pos = bisect_left(container, item)
+        if pos < len(container) and container[pos] == item:
+            container.pop(pos)
+
+    def _update(self, featId):
+        self._remove(featId)
+        feature = self.layer.getFeature(featId)
+        if not feature.isValid():
+            return
+        if self.expression:
+            exp = QgsExpression(self.expression)
+            context = self._expressionContext()
+            context.setFeature(feature)
+            if not exp.evaluate(context):
+                return
+        value = feature[self.sortField] if self.sortField is not None else None
+        self._add(featId, self._sortValue(value))
+
+    def editCommandStarted(self, text=None):
+        self._commandEdits = 0
+
+    def editCommandEnded(self):
+        self._commandEdits = None
+
+    def featureAdded(self, featId):
+        if self._isWatching():
+            self._update(featId)
+
+    def featuresDeleted(self, featIds):
+        if not any(featId in self._keyById for featId in featIds):
+            return
+        if not self._isWatching():
+            return
+        for featId in featIds:
+            self._remove(featId)
+
+    def attributeValueChanged(self, featId, idx, value):
+        filterChanged = self._filterIdxs is None or idx in self._filterIdxs
+        if idx != self._sortIdx and not filterChanged:
+            return
+        if not self._isWatching():
+            return
+        if filterChanged:
+            self._update(featId)
+        elif featId in self._keyById:
+            # only the sort key changed, its new value is the signal's
+            self._remove(featId)
+            self._add(featId, self._sortValue(value))
+
+    def geometryChanged(self, featId, geometry):
+        if self._filterGeometry and self._isWatching():
+            self._update(featId)
+
+    def _checkDirty(self):
+        if self._dirty:
+            self.rebuild()
+
+    def __len__(self):
+        self._checkDirty()
+        return len(self._keys) + len(self._nullIds)
+
+    def __getitem__(self, idx):
+        self._checkDirty()
+        size = len(self)
+        if idx < 0:
+            idx += size
+        if not 0 <= idx < size:
+            raise IndexError("feature index out of range")
+        nValues, nNulls = len(self._keys), len(self._nullIds)
+        if idx < nValues:
+            return self._keys[idx if self.ascending else nValues - 1 - idx][1]
+        idx -= nValues
+        return self._nullIds[idx if self.ascending else nNulls - 1 - idx]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __contains__(self, featId):
+        self._checkDirty()
+        return featId in self._keyById
+
+    def index(self, featId):
+        """
+        Gets the position of a feature on the ordered list.
+        :param featId: (int) feature ID.
+        :return: (int) feature's position.
+        """
+        self._checkDirty()
+        if featId not in self._keyById:
+            raise ValueError("{0} is not indexed".format(featId))
+        key = self._keyById[featId]
+        nValues = len(self._keys)
+        if self._providerOrder:
+            pos = self._positions[featId]
+            if self.ascending:
+                return pos
+            # values and NULL values are reversed separately
+            return nValues - 1 - pos if pos < nValues \
+                else 2 * nValues + len(self._nullIds) - 1 - pos
+        if key is None:
+            pos = bisect_left(self._nullIds, featId)
+            return nValues + (pos if self.ascending else len(self._nullIds) - 1 - pos)
+        pos = bisect_left(self._keys, key)
+        return pos if self.ascending else nValues - 1 - pos
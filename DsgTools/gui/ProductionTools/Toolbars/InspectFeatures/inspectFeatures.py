@@ -27,10 +27,11 @@ from qgis.PyQt.QtCore import QSettings, pyqtSignal, pyqtSlot, QObject, Qt
 from qgis.PyQt import QtGui, uic, QtCore
 from qgis.PyQt.Qt import QObject
 
-from qgis.core import QgsMapLayer, Qgis, QgsVectorLayer, QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsFeatureRequest, QgsWkbTypes, QgsProject
+from qgis.core import QgsMapLayer, Qgis, QgsVectorLayer, QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsWkbTypes, QgsProject
 from qgis.gui import QgsMessageBar
 
 from .inspectFeatures_ui import Ui_Form
+from .featureIdIndex import FeatureIdIndex
 # FORM_CLASS, _ = uic.loadUiType(os.path.join(
 #     os.path.dirname(__file__), 'inspectFeatures.ui'))
 
@@ -46,6 +47,8 @@ class InspectFeatures(QWidget,Ui_Form):
         self.splitter.hide()
         self.splitter2.hide()
         self.iface = iface
+        # ordered feature ID index of the inspected layer's last request
+        self.featIdIndex = None
         # self.iface.currentLayerChanged.connect(self.enableScale)
         self.mMapLayerComboBox.layerChanged.connect(self.enableScale)
         self.mMapLayerComboBox.layerChanged.connect(self.mFieldExpressionWidget.setLayer)
@@ -54,6 +57,8 @@ class InspectFeatures(QWidget,Ui_Form):
             self.enableTool(False)
         # self.iface.currentLayerChanged.connect(self.enableTool)
         self.mMapLayerComboBox.layerChanged.connect(self.enableTool)
+        # only the inspected layer is watched by the feature ID index
+        self.mMapLayerComboBox.layerChanged.connect(lambda layer: self.dropFeatIdIndex())
         self.zoomPercentageSpinBox.setMinimum(0)
         self.zoomPercentageSpinBox.setMaximum(100)
         self.zoomPercentageSpinBox.setDecimals(3)
@@ -197,32 +202,42 @@ class InspectFeatures(QWidget,Ui_Form):
                 self.makeZoom(zoom, currentLayer, oldIndex)
 
     def getFeatIdList(self, currentLayer):
+        """
+        Gets the ordered feature IDs to be inspected. The list of the inspected
+        layer is cached and kept up to date while the layer is edited, hence
+        the layer is only requested again if filter or sorting are changed.
+        Only the inspected layer is watched.
+        :param currentLayer: (QgsVectorLayer) layer to be inspected.
+        :return: (FeatureIdIndex) a list-like object of feature IDs.
+        """
         #getting all features ids
         if self.mFieldExpressionWidget.currentText() != '' and not self.mFieldExpressionWidget.isValidExpression():
             self.iface.messageBar().pushMessage(self.tr('Warning!'), self.tr('Invalid attribute filter!'), level=Qgis.Warning, duration=2)
             return []
-        request = QgsFeatureRequest()
-        request.setFlags(QgsFeatureRequest.NoGeometry)
-        if self.mFieldExpressionWidget.currentText() != '':
-            request.setFilterExpression(self.mFieldExpressionWidget.asExpression())
-        clauseList = []
-        if self.sortPushButton.isChecked():
-            #order by some attribute                
-            clause = QgsFeatureRequest.OrderByClause(
-                self.mFieldComboBox.currentField(),
-                self.ascRadioButton.isChecked(),
-                False,
+        expression = self.mFieldExpressionWidget.asExpression() \
+            if self.mFieldExpressionWidget.currentText() != '' else ''
+        sortField = self.mFieldComboBox.currentField() \
+            if self.sortPushButton.isChecked() else None
+        ascending = self.ascRadioButton.isChecked()
+        featIdIndex = self.featIdIndex
+        if featIdIndex is None or featIdIndex.layer is not currentLayer or \
+            featIdIndex.key() != (expression, sortField or None, ascending):
+            self.dropFeatIdIndex()
+            self.featIdIndex = FeatureIdIndex(
+                currentLayer,
+                expression=expression,
+                sortField=sortField,
+                ascending=ascending
             )
-            clauseList.append(clause)
-        clauseId = QgsFeatureRequest.OrderByClause(
-            "$id", ascending=self.ascRadioButton.isChecked()
-        )
-        clauseList.append(clauseId)
-        orderby = QgsFeatureRequest.OrderBy(clauseList)
-        request.setOrderBy(orderby)
-        featIdList = [i.id() for i in currentLayer.getFeatures(request)]
-        #sort is faster than sorted (but sort is just available for lists)
-        return featIdList
+        return self.featIdIndex
+
+    def dropFeatIdIndex(self):
+        """
+        Drops the cached feature ID index, which stops watching its layer.
+        """
+        featIdIndex, self.featIdIndex = self.featIdIndex, None
+        if featIdIndex is not None:
+            featIdIndex.stopWatching()
     
     def iterateFeature(self, method):
         """
@@ -417,6 +432,7 @@ class InspectFeatures(QWidget,Ui_Form):
         self.mFieldExpressionWidget.setExpression('')
     
     def unload(self):
+        self.dropFeatIdIndex()
         self.iface.unregisterMainWindowAction(self.activateToolAction)
         self.iface.unregisterMainWindowAction(self.backButtonAction)
         self.iface.unregisterMainWindowAction(self.nextButtonAction)
@@ -33,9 +33,13 @@ from qgis.core import (Qgis,
 from qgis.PyQt.QtGui import QBrush, QColor
 from qgis.PyQt.QtCore import Qt, pyqtSlot
 from qgis.PyQt.QtWidgets import (QLineEdit,
+                                 QDialog,
                                  QFileDialog,
                                  QDockWidget,
                                  QMessageBox,
+                                 QPushButton,
+                                 QVBoxLayout,
+                                 QTableWidget,
                                  QProgressBar,
                                  QTableWidgetItem)
 
@@ -43,6 +47,7 @@ from DsgTools.gui.ProductionTools.Toolboxes.QualityAssuranceToolBox\
     .workflowSetupDialog import WorkflowSetupDialog
 from DsgTools.core.DSGToolsProcessingAlgs.Models.qualityAssuranceWorkflow\
     import QualityAssuranceWorkflow
+from DsgTools.core.Utils.processingProfiler import ProcessingProfiler
 
 
 FORM_CLASS, _ = uic.loadUiType(
@@ -452,6 +457,25 @@ class QualityAssuranceDockWidget(QDockWidget, FORM_CLASS):
                 }[code]
             )
 
+    def setModelFromCache(self, row, fromCache):
+        """
+        Indicates on model's status cell whether its output was reused from its
+        last successful run.
+        :param row: (int) model's row on GUI.
+        :param fromCache: (bool) whether model's output was reused.
+        """
+        statusCell = self.tableWidget.cellWidget(row, 1)
+        if not fromCache:
+            statusCell.setToolTip("")
+            return
+        statusCell.setText(
+            self.tr("{0} (cached)").format(statusCell.text())
+        )
+        statusCell.setToolTip(self.tr(
+            "Model's inputs were not modified since its last successful run, "
+            "hence its previous output was reused."
+        ))
+
     def customLineWidget(self, text, tooltip=None):
         """
         Retrieves a QLineEdit widget ready to be added to the model's table.
@@ -580,6 +604,7 @@ class QualityAssuranceDockWidget(QDockWidget, FORM_CLASS):
         self.prepareOutputTreeNodes()
         if workflow is not None:
             self.setGuiState(True)
+            self.__modelSlots = dict()
             # these methods are defined locally as they are not supposed to be
             # outside thread execution setup and should all be handled from
             # within this method - at runtime
@@ -608,69 +633,85 @@ class QualityAssuranceDockWidget(QDockWidget, FORM_CLASS):
                     model.HaltedOnFlags : self.HALTED
                 }[status]
                 if status == model.Terminated and \
-                   model.output["finishStatus"] != "halt":
-                    if self.__workflowCanceled:
-                        code = self.CANCELED
-                    # if workflow was canceled (through the cancel push button),
-                    # workflowFinished signal will not be emited...
-                    postProcessing()
-                    self.__workflowCanceled = False
+                   model.output["finishStatus"] != "halt" and \
+                   self.__workflowCanceled:
+                    # other models may still be running: workflowFinished is
+                    # emitted once every model is settled
+                    code = self.CANCELED
                 if code != self.INITIAL:
                     self.setModelStatus(row, code, model.displayName())
             def begin(model):
                 for row in range(self.tableWidget.rowCount()):
                     if self.tableWidget.cellWidget(row, 0).text() != model.name():
                         continue
-                    self.__progressFunc = partial(
+                    progressFunc = partial(
                         intWrapper, self.tableWidget.cellWidget(row, 2)
                     )
-                    model.feedback.progressChanged.connect(self.__progressFunc)
-                    self.__statusFunc = partial(statusChangedWrapper, row, model)
-                    model.statusChanged.connect(self.__statusFunc)
+                    model.feedback.progressChanged.connect(progressFunc)
+                    statusFunc = partial(statusChangedWrapper, row, model)
+                    model.statusChanged.connect(statusFunc)
+                    # models may run concurrently, hence slots are kept per model
+                    self.__modelSlots[model.name()] = (progressFunc, statusFunc)
                     self.setModelStatus(
                         row, self.RUNNING, model.displayName()
                     )
                     return
+            def disconnectModel(model):
+                if model.name() not in self.__modelSlots:
+                    return
+                progressFunc, statusFunc = self.__modelSlots.pop(model.name())
+                model.feedback.progressChanged.disconnect(progressFunc)
+                model.statusChanged.disconnect(statusFunc)
             def end(model):
                 for row in range(self.tableWidget.rowCount()):
                     if self.tableWidget.cellWidget(row, 0).text() != model.name():
                         continue
-                    model.feedback.progressChanged.disconnect(self.__progressFunc)
-                    model.statusChanged.disconnect(self.__statusFunc)
+                    disconnectModel(model)
+                    self.setModelFromCache(row, model.output.get("fromCache", False))
                     return
             def stopOnFlags(model):
-                refreshFeedback()
+                # only models that were not started are reset: the ones that
+                # run concurrently keep their own status
+                pendingNames = {m.name() for m in workflow.pendingModels()}
                 isAfter = False
                 for row in range(self.tableWidget.rowCount()):
-                    if self.tableWidget.cellWidget(row, 0).text() != model.name() and not isAfter:
+                    rowName = self.tableWidget.cellWidget(row, 0).text()
+                    if rowName != model.name() and not isAfter:
                         continue
                     if isAfter:
+                        if rowName not in pendingNames:
+                            continue
                         code = self.INITIAL
                         self.tableWidget.cellWidget(row, 2).setValue(0)
                     else:
-                        model.feedback.progressChanged.disconnect(self.__progressFunc)
-                        model.statusChanged.disconnect(self.__statusFunc)
+                        disconnectModel(model)
                         code = self.HALTED
-                    isAfter = True
                     self.setModelStatus(
                         row, code, model.displayName()
                     )
-                postProcessing()
+                    if not isAfter:
+                        self.setModelFromCache(row, model.output.get("fromCache", False))
+                    isAfter = True
             def warningFlags(model):
                 for row in range(self.tableWidget.rowCount()):
                     if self.tableWidget.cellWidget(row, 0).text() != model.name():
                         continue
-                    model.feedback.progressChanged.disconnect(self.__progressFunc)
-                    model.statusChanged.disconnect(self.__statusFunc)
+                    disconnectModel(model)
                     self.setModelStatus(
                         row, self.FINISHED_WITH_FLAGS, model.displayName()
                     )
+                    self.setModelFromCache(row, model.output.get("fromCache", False))
                     return
+            postProcessed = []
             def postProcessing():
                 """
                 When workflow finishes, its signals are kept connected and that
                 might cause missbehaviour on next executions.
                 """
+                if postProcessed:
+                    return
+                postProcessed.append(True)
+                self.__workflowCanceled = False
                 workflow.modelStarted.disconnect(begin)
                 workflow.modelFinished.disconnect(end)
                 workflow.haltedOnFlags.disconnect(stopOnFlags)
@@ -720,6 +761,67 @@ class QualityAssuranceDockWidget(QDockWidget, FORM_CLASS):
         groupNode = rootNode.findGroup(groupName)
         groupNode = groupNode if groupNode else rootNode.addGroup(groupName)
 
+    @pyqtSlot(bool, name="on_profilePushButton_clicked")
+    def showProfile(self):
+        """
+        Shows the profiling summary of current workflow's last run: the time,
+        memory and feature counts of each model, child algorithm and AlgRunner
+        call. Memory is the growth of QGIS' peak RSS, which is shared by runs
+        overlapping in time (see ProcessingProfiler). Summary may be exported
+        as JSON or CSV.
+        """
+        workflow = self.currentWorkflow()
+        records = workflow.profile() if workflow is not None else []
+        if not records:
+            self.iface.messageBar().pushMessage(
+                self.tr("DSGTools Q&A Tool Box"),
+                self.tr("there is no profiling data for current workflow."),
+                Qgis.Warning,
+                duration=3
+            )
+            return
+        headers = [
+            self.tr("Model"), self.tr("Kind"), self.tr("Name"),
+            self.tr("Wall time (s)"), self.tr("CPU time (s)"),
+            self.tr("Peak RSS growth (MB)"),
+            self.tr("Features in"), self.tr("Features out")
+        ]
+        def cellText(record, key):
+            value = record[key]
+            if value is None:
+                return "-"
+            if key in ("wallTime", "cpuTime"):
+                return "{0:.3f}".format(value)
+            if key == "peakRssDelta":
+                return "{0:.1f}".format(value / 1024 ** 2)
+            return str(value)
+        dlg = QDialog(self)
+        dlg.setWindowTitle(
+            self.tr("Profiling summary - {0}").format(workflow.displayName())
+        )
+        table = QTableWidget(len(records), len(headers), dlg)
+        table.setHorizontalHeaderLabels(headers)
+        for row, record in enumerate(records):
+            for col, key in enumerate(ProcessingProfiler.CSV_COLUMNS):
+                table.setItem(row, col, QTableWidgetItem(cellText(record, key)))
+        table.resizeColumnsToContents()
+        exportButton = QPushButton(self.tr("Export..."), dlg)
+        def export():
+            filepath, _ = QFileDialog.getSaveFileName(
+                dlg,
+                self.tr("Export profiling summary"),
+                "",
+                self.tr("JSON (*.json);;CSV (*.csv)")
+            )
+            if filepath:
+                workflow.exportProfile(filepath)
+        exportButton.clicked.connect(export)
+        layout = QVBoxLayout(dlg)
+        layout.addWidget(table)
+        layout.addWidget(exportButton)
+        dlg.resize(800, 400)
+        dlg.exec_()
+
     @pyqtSlot(bool, name="on_importPushButton_clicked")
     def importWorkflow(self):
         """
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+# the nesting tree does not depend on QGIS, hence it is loaded straight from
+# its file, so that these tests run without a QGIS instance
+_spec = importlib.util.spec_from_file_location(
+    "nestingTree",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "DsgTools", "core", "GeometricTools", "nestingTree.py"
+    )
+)
+nestingTree = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nestingTree)
+NestingTree = nestingTree.NestingTree
+
+
+class CanceledFeedback(object):
+    """Feedback that cancels after a number of progress updates."""
+    def __init__(self, steps):
+        self.steps = steps
+
+    def isCanceled(self):
+        return self.steps <= 0
+
+    def setProgress(self, progress):
+        self.steps -= 1
+
+
+class NestingTreeTest(unittest.TestCase):
+    @staticmethod
+    def squareTree(squares, useCandidates=False, feedback=None):
+        """
+        Builds the tree of a set of squares, given by (x, y, size). As
+        ContourNestingTree does, containment is tested with a point on the
+        surface of each square (its center) against candidates' interiors.
+        :return: (tuple) tree and the squares in tree's order.
+        """
+        squares = sorted(squares, key=lambda s: s[2] ** 2)
+        bboxes = [(x, y, x + size, y + size) for x, y, size in squares]
+        def contains(candId, idx):
+            xmin, ymin, xmax, ymax = bboxes[candId]
+            x, y, size = squares[idx]
+            x, y = x + size / 2, y + size / 2
+            return xmin < x < xmax and ymin < y < ymax
+        def candidates(idx):
+            return [
+                i for i, bbox in enumerate(bboxes) \
+                    if bbox[0] <= bboxes[idx][2] and bbox[2] >= bboxes[idx][0] \
+                        and bbox[1] <= bboxes[idx][3] and bbox[3] >= bboxes[idx][1]
+            ]
+        tree = NestingTree(len(squares))
+        tree.build(
+            bboxes,
+            contains,
+            candidates=candidates if useCandidates else None,
+            feedback=feedback
+        )
+        return tree, squares
+
+    def test_concentric(self):
+        """Tests a single hill: each square is nested in the next one"""
+        for useCandidates in (False, True):
+            tree, _ = self.squareTree(
+                [(i, i, 20 - 2 * i) for i in range(5)], useCandidates)
+            self.assertEqual(tree.parents, [1, 2, 3, 4, NestingTree.NO_PARENT])
+            self.assertEqual(tree.roots(), [4])
+            self.assertEqual(tree.leaves(), [0])
+            self.assertEqual(tree.ancestors(0), [1, 2, 3, 4])
+            self.assertEqual(list(tree.edges()), [(0, 1), (1, 2), (2, 3), (3, 4)])
+
+    def test_siblings(self):
+        """Tests two hills inside the same contour and a separate one"""
+        for useCandidates in (False, True):
+            tree, squares = self.squareTree([
+                (0, 0, 100),
+                (10, 10, 30), (15, 15, 10),
+                (60, 60, 20),
+                (200, 200, 5)
+            ], useCandidates)
+            position = {square: idx for idx, square in enumerate(squares)}
+            parent = lambda square: tree.parents[position[square]]
+            self.assertEqual(parent((15, 15, 10)), position[(10, 10, 30)])
+            self.assertEqual(parent((10, 10, 30)), position[(0, 0, 100)])
+            self.assertEqual(parent((60, 60, 20)), position[(0, 0, 100)])
+            self.assertEqual(parent((0, 0, 100)), NestingTree.NO_PARENT)
+            self.assertEqual(parent((200, 200, 5)), NestingTree.NO_PARENT)
+            self.assertEqual(
+                sorted(tree.roots()),
+                sorted([position[(0, 0, 100)], position[(200, 200, 5)]])
+            )
+            self.assertEqual(
+                sorted(tree.leaves()),
+                sorted([
+                    position[(15, 15, 10)], position[(60, 60, 20)],
+                    position[(200, 200, 5)]
+                ])
+            )
+            self.assertEqual(
+                sorted(tree.children[position[(0, 0, 100)]]),
+                sorted([position[(10, 10, 30)], position[(60, 60, 20)]])
+            )
+
+    def test_sharedEdges(self):
+        """
+        Tests regions that share edges with their parents or siblings (e.g.
+        contour polygons closed by the frame), whose vertices lie on their
+        parents' boundaries
+        """
+        for useCandidates in (False, True):
+            tree, squares = self.squareTree([
+                (0, 0, 10), (0, 0, 4), (0, 0, 2), (6, 3, 4), (4, 3, 2)
+            ], useCandidates)
+            position = {square: idx for idx, square in enumerate(squares)}
+            parent = lambda square: tree.parents[position[square]]
+            self.assertEqual(parent((0, 0, 2)), position[(0, 0, 4)])
+            self.assertEqual(parent((0, 0, 4)), position[(0, 0, 10)])
+            self.assertEqual(parent((6, 3, 4)), position[(0, 0, 10)])
+            # touches the edges of (0, 0, 4) and (6, 3, 4), but is outside them
+            self.assertEqual(parent((4, 3, 2)), position[(0, 0, 10)])
+            self.assertEqual(tree.roots(), [position[(0, 0, 10)]])
+
+    def test_boundingBoxOnly(self):
+        """
+        Tests that a region whose bounding box holds another one's is not its
+        parent unless it does contain it
+        """
+        bboxes = [(1, 1, 2, 2), (0, 0, 10, 10)]
+        tree = NestingTree(2)
+        tree.build(bboxes, lambda candId, idx: False)
+        self.assertEqual(tree.parents, [NestingTree.NO_PARENT] * 2)
+        self.assertEqual(list(tree.edges()), [])
+
+    def test_empty(self):
+        """Tests an empty tree"""
+        tree = NestingTree(0)
+        tree.build([], lambda candId, idx: True)
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(tree.roots(), [])
+        self.assertEqual(tree.leaves(), [])
+
+    def test_cancel(self):
+        """Tests that building stops once feedback is canceled"""
+        tree, _ = self.squareTree(
+            [(i, i, 20 - 2 * i) for i in range(5)],
+            feedback=CanceledFeedback(2)
+        )
+        self.assertEqual(tree.parents[:2], [1, 2])
+        self.assertEqual(tree.parents[2:], [NestingTree.NO_PARENT] * 3)
+
+
+def run_all(filterString=None):
+    """Default function that is called by the runner if nothing else is specified"""
+    filterString = 'test_' if filterString is None else filterString
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(NestingTreeTest, filterString))
+    unittest.TextTestRunner(verbosity=3, stream=sys.stdout).run(suite)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# the matching engine only depends on numpy, hence it is loaded straight from
+# its file, so that these tests run without a QGIS instance
+_spec = importlib.util.spec_from_file_location(
+    "pointMatchingEngine",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "DsgTools", "core", "GeometricTools", "pointMatchingEngine.py"
+    )
+)
+pointMatchingEngine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pointMatchingEngine)
+PointMatchingEngine = pointMatchingEngine.PointMatchingEngine
+
+
+class PointMatchingEngineTest(unittest.TestCase):
+    @staticmethod
+    def bruteForce(reference, coords, tolerance):
+        """Nearest reference point within tolerance (lowest index on ties)."""
+        matches = np.full(len(coords), -1, dtype=np.int64)
+        distances = np.full(len(coords), np.nan)
+        for i, point in enumerate(coords):
+            if not len(reference):
+                continue
+            d = np.sqrt(((reference - point) ** 2).sum(axis=1))
+            j = int(np.argmin(d))
+            if d[j] <= tolerance:
+                matches[i], distances[i] = j, d[j]
+        return matches, distances
+
+    def assertMatchesBruteForce(self, reference, coords, tolerance, batchSize=None):
+        engine = PointMatchingEngine(reference, tolerance, batchSize=batchSize)
+        matches, distances = engine.match(coords)
+        expectedMatches, expectedDistances = self.bruteForce(
+            np.asarray(reference, dtype=np.float64).reshape(-1, 2),
+            np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+            tolerance
+        )
+        np.testing.assert_array_equal(matches, expectedMatches)
+        np.testing.assert_allclose(distances, expectedDistances)
+
+    def test_randomPoints(self):
+        """Tests random point sets against a brute force search"""
+        rng = np.random.default_rng(42)
+        reference = rng.uniform(0, 1000, size=(500, 2))
+        coords = np.vstack([
+            reference[:300] + rng.normal(0, 2, size=(300, 2)),
+            rng.uniform(-100, 1100, size=(200, 2))
+        ])
+        for tolerance in (0.5, 5, 50):
+            self.assertMatchesBruteForce(reference, coords, tolerance)
+
+    def test_batches(self):
+        """Tests that matching in batches gives the same result"""
+        rng = np.random.default_rng(7)
+        reference = rng.uniform(0, 100, size=(200, 2))
+        coords = rng.uniform(0, 100, size=(250, 2))
+        self.assertMatchesBruteForce(reference, coords, 3, batchSize=16)
+
+    def test_ties(self):
+        """Tests that ties are broken by the reference order"""
+        reference = [(1, 0), (-1, 0), (0, 1)]
+        matches, distances = PointMatchingEngine(reference, 2).match([(0, 0)])
+        self.assertEqual(matches.tolist(), [0])
+        self.assertEqual(distances.tolist(), [1.0])
+
+    def test_exactMatch(self):
+        """Tests a null tolerance, which only matches coincident points"""
+        reference = [(10, 10), (20, 20)]
+        matches, distances = PointMatchingEngine(reference, 0).match(
+            [(20, 20), (10, 10.001)])
+        self.assertEqual(matches.tolist(), [1, -1])
+        self.assertEqual(distances[0], 0)
+        self.assertTrue(np.isnan(distances[1]))
+
+    def test_outsideGrid(self):
+        """Tests points far away from every reference point"""
+        matches, distances = PointMatchingEngine([(0, 0), (1, 1)], 1).match(
+            [(1e9, -1e9), (-5, 0)])
+        self.assertEqual(matches.tolist(), [-1, -1])
+        self.assertTrue(np.isnan(distances).all())
+
+    def test_noReference(self):
+        """Tests an engine without reference points"""
+        matches, distances = PointMatchingEngine(np.empty((0, 2)), 1).match([(0, 0)])
+        self.assertEqual(matches.tolist(), [-1])
+        self.assertTrue(np.isnan(distances).all())
+
+    def test_statistics(self):
+        """Tests accuracy statistics, ignoring unmatched points"""
+        stats = PointMatchingEngine.statistics([3, 4, np.nan], frequency=0.5)
+        self.assertEqual(stats['count'], 2)
+        self.assertAlmostEqual(stats['mean'], 3.5)
+        self.assertAlmostEqual(stats['rms'], np.sqrt(12.5))
+        self.assertAlmostEqual(stats['percentile'], 3.5)
+        self.assertEqual(
+            PointMatchingEngine.statistics([np.nan]),
+            {'count': 0, 'mean': None, 'rms': None, 'percentile': None}
+        )
+
+
+def run_all(filterString=None):
+    """Default function that is called by the runner if nothing else is specified"""
+    filterString = 'test_' if filterString is None else filterString
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(PointMatchingEngineTest, filterString))
+    unittest.TextTestRunner(verbosity=3, stream=sys.stdout).run(suite)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ DsgTools
+                                 A QGIS plugin
+ Brazilian Army Cartographic Production Tools
+                              -------------------
+        begin                : 2026-10-18
+        git sha              : $Format:%H$
+        copyright            : (C) 2026 by Philipe Borba - Cartographic Engineer @ Brazilian Army
+        email                : borba.philipe@eb.mil.br
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# the word list does not depend on QGIS, hence it is loaded straight from its
+# file, so that these tests run without a QGIS instance
+_spec = importlib.util.spec_from_file_location(
+    "sortedWordList",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "DsgTools", "core", "DSGToolsProcessingAlgs", "Algs",
+        "LayerManagementAlgs", "spellChecker", "structures", "sortedWordList.py"
+    )
+)
+sortedWordList = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sortedWordList)
+SortedWordList = sortedWordList.SortedWordList
+
+
+class SortedWordListTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filePath = os.path.join(self.folder.name, "words.dic")
+        self.wordLists = []
+
+    def tearDown(self):
+        for wordList in self.wordLists:
+            wordList.close()
+        self.folder.cleanup()
+
+    def buildAndOpen(self, words):
+        SortedWordList.build(words, self.filePath)
+        wordList = SortedWordList(self.filePath)
+        self.wordLists.append(wordList)
+        return wordList
+
+    def test_lookup(self):
+        """Tests that every word is found and that other strings are not"""
+        words = ["casa", "casaco", "cas", "árvore", "ação", "zebra", "a"]
+        wordList = self.buildAndOpen(words)
+        for word in words:
+            self.assertIn(word, wordList)
+        for word in ["", "c", "casas", "arvore", "acao", "zebras", "b"]:
+            self.assertNotIn(word, wordList)
+
+    def test_duplicates(self):
+        """Tests that duplicated words are stored once"""
+        wordList = self.buildAndOpen(["rio", "rio", "serra", "rio"])
+        self.assertEqual(len(wordList), 2)
+        self.assertIn("rio", wordList)
+
+    def test_empty(self):
+        """Tests an empty word list"""
+        wordList = self.buildAndOpen([])
+        self.assertEqual(len(wordList), 0)
+        self.assertNotIn("rio", wordList)
+
+    def test_invalidFile(self):
+        """Tests that files that are not word lists are refused"""
+        with open(self.filePath, "wb") as fp:
+            fp.write(b"NOTWORDS" + bytes(8))
+        with self.assertRaises(ValueError):
+            SortedWordList(self.filePath)
+
+    def test_concurrentBuilds(self):
+        """Tests that concurrent builds of the same file do not collide"""
+        words = ["palavra{0}".format(i) for i in range(5000)]
+        errors = []
+        def build():
+            try:
+                SortedWordList.build(words, self.filePath)
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=build) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(os.listdir(self.folder.name), ["words.dic"])
+        wordList = SortedWordList(self.filePath)
+        self.wordLists.append(wordList)
+        self.assertEqual(len(wordList), len(words))
+        self.assertIn("palavra4999", wordList)
+
+
+def run_all(filterString=None):
+    """Default function that is called by the runner if nothing else is specified"""
+    filterString = 'test_' if filterString is None else filterString
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(SortedWordListTest, filterString))
+    unittest.TextTestRunner(verbosity=3, stream=sys.stdout).run(suite)
+
+
+if __name__ == "__main__":
+    unittest.main()